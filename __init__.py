@@ -11,28 +11,37 @@ bl_info = {
 }
 
 import bpy
-from .operators import rigidbody_operators, export_operators, rig_operators, snap_operators, property_operators, hyp_operators, renamer_operators
-from .panels import main_panel, credits_panel, export_panel, hyp_panel, renamer_panel
+from .operators import rigidbody_operators, export_operators, rig_operators, snap_operators, property_operators, hyp_operators, hyp_library_operators, renamer_operators, lod_operators
+from .panels import main_panel, credits_panel, export_panel, hyp_panel, hyp_library_panel, renamer_panel, bulk_panel
 from .properties import hyperfy_properties
+from .utils import node_index, panel_cache
 
 # Collect all classes to register
 classes = (
     # Properties
+    hyperfy_properties.HypLibraryEntry,
     hyperfy_properties.HyperfyProperties,
     
     # Operators
     rigidbody_operators.OBJECT_OT_create_rigidbodies,
+    lod_operators.OBJECT_OT_generate_lods,
+    lod_operators.OBJECT_OT_calibrate_lods,
+    lod_operators.OBJECT_OT_solve_lod_budget,
     export_operators.OBJECT_OT_export_glb,
     export_operators.OBJECT_OT_export_all_glb,
+    export_operators.OBJECT_OT_export_hyp,
     rig_operators.OBJECT_OT_mixamo_to_vrm,
     rig_operators.OBJECT_OT_vrm_to_mixamo,
     rig_operators.OBJECT_OT_detect_and_convert_rig,
     snap_operators.OBJECT_OT_add_snap_point,
-    property_operators.OBJECT_OT_set_rigidbody_type,
-    property_operators.OBJECT_OT_set_mesh_property,
-    property_operators.OBJECT_OT_set_collider_property,
     property_operators.OBJECT_OT_update_rigidbody_property,
+    property_operators.OBJECT_OT_bulk_set_property,
     hyp_operators.OBJECT_OT_import_hyp,
+    hyp_operators.OBJECT_OT_import_hyp_batch,
+    hyp_library_operators.OBJECT_OT_scan_hyp_library,
+    hyp_library_operators.OBJECT_OT_search_hyp_library,
+    hyp_library_operators.OBJECT_OT_import_hyp_library_entry,
+    renamer_operators.OBJECT_OT_preview_rename,
     renamer_operators.OBJECT_OT_batch_rename,
     renamer_operators.OBJECT_OT_clean_names,
     
@@ -40,7 +49,11 @@ classes = (
     main_panel.HYPERFY_PT_main_panel,
     export_panel.HYPERFY_PT_export_panel,
     hyp_panel.HYPERFY_PT_hyp_panel,
+    hyp_library_panel.HYPERFY_UL_hyp_library,
+    hyp_library_panel.HYPERFY_PT_hyp_library_panel,
+    renamer_panel.HYPERFY_UL_rename_preview,
     renamer_panel.HYPERFY_PT_renamer_panel,
+    bulk_panel.HYPERFY_PT_bulk_edit_panel,
     credits_panel.HYPERFY_PT_credits_panel,
 )
 
@@ -56,8 +69,15 @@ def register():
     
     # Register properties
     bpy.types.Scene.hyperfy_props = bpy.props.PointerProperty(type=hyperfy_properties.HyperfyProperties)
+    
+    # Keep the node index in sync with the scene
+    node_index.register_handlers()
+    panel_cache.register_handlers()
 
 def unregister():
+    panel_cache.unregister_handlers()
+    node_index.unregister_handlers()
+    
     # Unregister properties
     del bpy.types.Scene.hyperfy_props
     
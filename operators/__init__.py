@@ -4,7 +4,9 @@ from . import rig_operators
 from . import snap_operators
 from . import property_operators
 from . import hyp_operators
+from . import hyp_library_operators
 from . import renamer_operators
+from . import lod_operators
 
 __all__ = [
     'rigidbody_operators',
@@ -13,23 +15,32 @@ __all__ = [
     'snap_operators',
     'property_operators',
     'hyp_operators',
-    'renamer_operators'
+    'hyp_library_operators',
+    'renamer_operators',
+    'lod_operators'
 ]
 
 # List all operator classes explicitly
 classes = (
     rigidbody_operators.OBJECT_OT_create_rigidbodies,
+    lod_operators.OBJECT_OT_generate_lods,
+    lod_operators.OBJECT_OT_calibrate_lods,
+    lod_operators.OBJECT_OT_solve_lod_budget,
     export_operators.OBJECT_OT_export_glb,
     export_operators.OBJECT_OT_export_all_glb,
+    export_operators.OBJECT_OT_export_hyp,
     rig_operators.OBJECT_OT_mixamo_to_vrm,
     rig_operators.OBJECT_OT_vrm_to_mixamo,
     rig_operators.OBJECT_OT_detect_and_convert_rig,
     snap_operators.OBJECT_OT_add_snap_point,
-    property_operators.OBJECT_OT_set_rigidbody_type,
-    property_operators.OBJECT_OT_set_mesh_property,
-    property_operators.OBJECT_OT_set_collider_property,
     property_operators.OBJECT_OT_update_rigidbody_property,
+    property_operators.OBJECT_OT_bulk_set_property,
     hyp_operators.OBJECT_OT_import_hyp,
+    hyp_operators.OBJECT_OT_import_hyp_batch,
+    hyp_library_operators.OBJECT_OT_scan_hyp_library,
+    hyp_library_operators.OBJECT_OT_search_hyp_library,
+    hyp_library_operators.OBJECT_OT_import_hyp_library_entry,
+    renamer_operators.OBJECT_OT_preview_rename,
     renamer_operators.OBJECT_OT_batch_rename,
     renamer_operators.OBJECT_OT_clean_names,
 )
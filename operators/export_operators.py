@@ -1,8 +1,24 @@
 import bpy
 from bpy.types import Operator
 from bpy_extras.io_utils import ExportHelper
-from bpy.props import StringProperty
+from bpy.props import StringProperty, BoolProperty, IntProperty
+import json
 import os
+import subprocess
+import tempfile
+import time
+import uuid
+from ..utils.export_utils import (
+    get_export_roots,
+    export_root_glb,
+    shared_duplicate_meshes,
+    load_manifest,
+    save_manifest,
+    split_unchanged
+)
+from ..utils.hyp_utils import hash_asset_source, staging_dir, write_hyp
+
+EXPORT_WORKER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils", "export_worker.py")
 
 class OBJECT_OT_export_glb(Operator, ExportHelper):
     """Export selected objects as GLB with custom properties"""
@@ -20,13 +36,14 @@ class OBJECT_OT_export_glb(Operator, ExportHelper):
             self.report({'ERROR'}, "No objects selected")
             return {'CANCELLED'}
         
-        # Export selected objects
-        bpy.ops.export_scene.gltf(
-            filepath=self.filepath,
-            export_format='GLB',
-            use_selection=True,
-            export_extras=True  # Enables custom properties export
-        )
+        # Export selected objects, storing identical meshes once
+        with shared_duplicate_meshes(context.selected_objects):
+            bpy.ops.export_scene.gltf(
+                filepath=self.filepath,
+                export_format='GLB',
+                use_selection=True,
+                export_extras=True  # Enables custom properties export
+            )
         
         self.report({'INFO'}, f"Exported selected objects to: {self.filepath}")
         return {'FINISHED'}
@@ -42,52 +59,222 @@ class OBJECT_OT_export_all_glb(Operator, ExportHelper):
         default=""
     )
     
+    parallel: BoolProperty(
+        name="Parallel",
+        description="Export from a snapshot in several background Blender processes",
+        default=False
+    )
+    
+    workers: IntProperty(
+        name="Workers",
+        description="Number of background Blender processes (0 uses every core)",
+        default=0,
+        min=0
+    )
+    
+    incremental: BoolProperty(
+        name="Incremental",
+        description="Skip objects whose content is unchanged since the last export to this folder",
+        default=False
+    )
+    
     def invoke(self, context, event):
         context.window_manager.fileselect_add(self)
         return {'RUNNING_MODAL'}
     
     def execute(self, context):
         export_dir = self.directory
+        roots = get_export_roots(context.scene)
         
-        # Store original selection
-        orig_selected = context.selected_objects
-        orig_active = context.active_object
+        skipped_count = 0
+        if self.incremental:
+            manifest = load_manifest(export_dir)
+            roots, unchanged, hashes = split_unchanged(roots, export_dir,
+                                                       context.evaluated_depsgraph_get(), manifest)
+            skipped_count = len(unchanged)
         
-        bpy.ops.object.select_all(action='DESELECT')
-        
-        exported_count = 0
-        for obj in context.scene.objects:
-            if not obj.parent and obj.visible_get():  # Only visible top-level objects
-                # Store original location
-                orig_location = obj.location.copy()
-                obj.location = (0, 0, 0)
-                
-                # Select object and its children
+        workers = min(self.workers or os.cpu_count() or 1, len(roots))
+        if self.parallel and workers > 1:
+            exported = self.execute_parallel(context, roots, export_dir, workers)
+        else:
+            # Store original selection
+            orig_selected = context.selected_objects
+            orig_active = context.active_object
+            
+            exported = []
+            for obj in roots:
+                export_root_glb(context, obj, export_dir)
+                exported.append(obj.name)
+            
+            # Restore original selection
+            for obj in orig_selected:
                 obj.select_set(True)
-                for child in obj.children_recursive:
-                    child.select_set(True)
-                
-                context.view_layer.objects.active = obj
+            context.view_layer.objects.active = orig_active
+        
+        if self.incremental:
+            # Only record what actually made it to disk
+            for name in exported:
+                if hashes[name] is None:
+                    manifest.pop(name, None)
+                else:
+                    manifest[name] = {'hash': hashes[name]}
+            save_manifest(export_dir, manifest)
+        
+        message = f"Exported {len(exported)} objects to GLB files"
+        if self.incremental:
+            message += f", skipped {skipped_count} unchanged"
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+    
+    def execute_parallel(self, context, roots, export_dir, workers):
+        """Export shards of the roots in background Blender processes
+
+        Returns the names of the roots that were exported.
+        """
+        with tempfile.TemporaryDirectory(prefix="hyperfy_export_") as work_dir:
+            # Workers read a snapshot, the open file is left untouched
+            snapshot = os.path.join(work_dir, "snapshot.blend")
+            bpy.ops.wm.save_as_mainfile(filepath=snapshot, copy=True, check_existing=False)
+            
+            names = [obj.name for obj in roots]
+            shards = [names[i::workers] for i in range(workers)]
+            
+            processes = []
+            for i, shard in enumerate(shards):
+                job_path = os.path.join(work_dir, f"job_{i}.json")
+                result_path = os.path.join(work_dir, f"result_{i}.json")
+                log_path = os.path.join(work_dir, f"worker_{i}.log")
+                with open(job_path, 'w', encoding='utf-8') as f:
+                    json.dump({'export_dir': export_dir, 'names': shard, 'result': result_path}, f)
                 
-                # Export GLB
-                export_path = os.path.join(export_dir, f"{obj.name}.glb")
+                # stderr goes to a file: a full pipe would block a chatty worker
+                with open(log_path, 'wb') as log:
+                    process = subprocess.Popen(
+                        [bpy.app.binary_path, "-b", snapshot, "--factory-startup",
+                         "--python-exit-code", "1", "--python", EXPORT_WORKER, "--", job_path],
+                        stdout=subprocess.DEVNULL,
+                        stderr=log
+                    )
+                processes.append((process, shard, result_path, log_path))
+            
+            # Merge results as workers finish, in whatever order that is
+            wm = context.window_manager
+            wm.progress_begin(0, len(processes))
+            exported = []
+            errors = []
+            try:
+                running = list(processes)
+                done = 0
+                while running:
+                    finished = [entry for entry in running if entry[0].poll() is not None]
+                    if not finished:
+                        time.sleep(0.1)
+                        continue
+                    for entry in finished:
+                        running.remove(entry)
+                        process, shard, result_path, log_path = entry
+                        if os.path.exists(result_path):
+                            with open(result_path, 'r', encoding='utf-8') as f:
+                                result = json.load(f)
+                            exported.extend(result['exported'])
+                            errors.extend(result['errors'])
+                        else:
+                            with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+                                message = f.read().strip().splitlines()
+                            reason = message[-1] if message else f"worker exited with code {process.returncode}"
+                            errors.extend({'name': name, 'error': reason} for name in shard)
+                        done += 1
+                        wm.progress_update(done)
+            finally:
+                wm.progress_end()
+                # Never leave workers writing into a removed folder
+                for process, _, _, _ in processes:
+                    if process.poll() is None:
+                        process.kill()
+                        process.wait()
+        
+        for error in errors:
+            self.report({'WARNING'}, f"Failed to export {error['name']}: {error['error']}")
+        
+        return exported
+
+def build_blueprint(props, name, model_url, script_url=None):
+    """Build a .hyp blueprint from the scene's Hyperfy properties"""
+    return {
+        'id': props.hyp_id or str(uuid.uuid4()),
+        'version': props.hyp_version,
+        'name': name,
+        'image': None,
+        'author': props.hyp_author or None,
+        'url': None,
+        'desc': None,
+        'model': model_url,
+        'script': script_url,
+        'props': {
+            'interact': props.hyp_interact,
+            'clickDistance': props.hyp_click_distance,
+            'collision': props.hyp_collision,
+            'visible': props.hyp_visible,
+        },
+        'preload': False,
+        'public': False,
+        'locked': False,
+        'frozen': props.hyp_frozen,
+        'unique': False,
+        'disabled': False,
+    }
+
+class OBJECT_OT_export_hyp(Operator, ExportHelper):
+    """Export selected objects and the Hyperfy script as a .hyp file"""
+    bl_idname = "object.export_hyp"
+    bl_label = "Export HYP"
+    filename_ext = ".hyp"
+    
+    filter_glob: StringProperty(
+        default="*.hyp",
+        options={'HIDDEN'}
+    )
+    
+    def execute(self, context):
+        if not context.selected_objects:
+            self.report({'ERROR'}, "No objects selected")
+            return {'CANCELLED'}
+        
+        props = context.scene.hyperfy_props
+        name = props.hyp_name or os.path.splitext(os.path.basename(self.filepath))[0]
+        
+        # The glTF exporter only writes to disk, so stage the GLB in tmpfs
+        fd, staged_glb = tempfile.mkstemp(prefix='hyperfy_', suffix='.glb', dir=staging_dir())
+        os.close(fd)
+        
+        try:
+            with shared_duplicate_meshes(context.selected_objects):
                 bpy.ops.export_scene.gltf(
-                    filepath=export_path,
-                    use_selection=True,
+                    filepath=staged_glb,
                     export_format='GLB',
-                    export_extras=True,  # Enables custom properties export
-                    export_apply=False
+                    use_selection=True,
+                    export_extras=True  # Enables custom properties export
                 )
-                
-                # Restore location and deselect
-                obj.location = orig_location
-                bpy.ops.object.select_all(action='DESELECT')
-                exported_count += 1
-        
-        # Restore original selection
-        for obj in orig_selected:
-            obj.select_set(True)
-        context.view_layer.objects.active = orig_active
+            
+            model_url = f"asset://{hash_asset_source(staged_glb)}.glb"
+            assets = [({'type': 'model', 'url': model_url, 'mime': 'model/gltf-binary'}, staged_glb)]
+            
+            # Script goes in straight from the Text datablock
+            script_url = None
+            text = bpy.data.texts.get(props.hyp_script) if props.hyp_script else None
+            if text:
+                script_data = text.as_string().encode('utf-8')
+                script_url = f"asset://{hash_asset_source(script_data)}.js"
+                assets.append(({'type': 'script', 'url': script_url, 'mime': 'application/javascript'}, script_data))
+            
+            blueprint = build_blueprint(props, name, model_url, script_url)
+            write_hyp(self.filepath, blueprint, assets)
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to write .hyp file: {str(e)}")
+            return {'CANCELLED'}
+        finally:
+            if os.path.exists(staged_glb):
+                os.remove(staged_glb)
         
-        self.report({'INFO'}, f"Exported {exported_count} objects to GLB files")
-        return {'FINISHED'} 
\ No newline at end of file
+        self.report({'INFO'}, f"Exported .hyp file to: {self.filepath}")
+        return {'FINISHED'}
\ No newline at end of file
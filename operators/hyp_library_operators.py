@@ -0,0 +1,68 @@
+import bpy
+from bpy.types import Operator
+from bpy.props import BoolProperty
+import os
+from ..utils.library_utils import open_library_index, refresh_library_results
+
+class OBJECT_OT_scan_hyp_library(Operator):
+    """Index the headers of every .hyp file in the library folder"""
+    bl_idname = "object.scan_hyp_library"
+    bl_label = "Scan HYP Library"
+    
+    recursive: BoolProperty(
+        name="Include Subfolders",
+        default=True
+    )
+    
+    def execute(self, context):
+        props = context.scene.hyperfy_props
+        root = bpy.path.abspath(props.hyp_library_path)
+        
+        if not props.hyp_library_path or not os.path.isdir(root):
+            self.report({'ERROR'}, "Choose a library folder first")
+            return {'CANCELLED'}
+        
+        # Only changed files are re-parsed, and only their headers
+        with open_library_index() as index:
+            stats = index.scan(root, recursive=self.recursive)
+        
+        refresh_library_results(props)
+        
+        message = (f"Indexed {stats['updated']} changed, {stats['unchanged']} unchanged, "
+                   f"{stats['removed']} removed .hyp files")
+        if stats['failed']:
+            self.report({'WARNING'}, f"{message} ({stats['failed']} unreadable)")
+        else:
+            self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+class OBJECT_OT_search_hyp_library(Operator):
+    """Refresh the library list from the index"""
+    bl_idname = "object.search_hyp_library"
+    bl_label = "Refresh HYP Library"
+    
+    def execute(self, context):
+        count = refresh_library_results(context.scene.hyperfy_props)
+        self.report({'INFO'}, f"Found {count} indexed .hyp files")
+        return {'FINISHED'}
+
+class OBJECT_OT_import_hyp_library_entry(Operator):
+    """Import the .hyp file selected in the library list"""
+    bl_idname = "object.import_hyp_library_entry"
+    bl_label = "Import Library HYP"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    @classmethod
+    def poll(cls, context):
+        props = context.scene.hyperfy_props
+        return 0 <= props.hyp_library_index < len(props.hyp_library_results)
+    
+    def execute(self, context):
+        props = context.scene.hyperfy_props
+        entry = props.hyp_library_results[props.hyp_library_index]
+        
+        if not os.path.exists(entry.path):
+            self.report({'ERROR'}, f"File no longer exists: {entry.path}")
+            return {'CANCELLED'}
+        
+        return bpy.ops.object.import_hyp('EXEC_DEFAULT', filepath=entry.path)
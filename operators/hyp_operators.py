@@ -1,15 +1,116 @@
 import bpy
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
-from bpy.props import StringProperty
-import json
-import struct
+from bpy.props import StringProperty, BoolProperty, IntProperty, EnumProperty, CollectionProperty
 import os
+from ..utils.hyp_utils import HypFile, HypImportJob, read_hyp_header, extract_hyp_files
+
+MODEL_ASSET_TYPES = {'model', 'avatar', 'emote'}
+IMAGE_ASSET_TYPES = {'texture', 'image', 'hdr'}
+AUDIO_ASSET_TYPES = {'audio'}
+
+def create_frozen_placeholder(context, name):
+    """Add a red Suzanne standing in for a frozen model"""
+    bpy.ops.mesh.primitive_monkey_add(size=2.0)
+    suzanne = context.active_object
+    suzanne.name = f"FROZEN_{name or 'Object'}"
+    
+    # Add a material with red color to indicate frozen state
+    mat = bpy.data.materials.new(name=f"Frozen_{suzanne.name}")
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    nodes["Principled BSDF"].inputs[0].default_value = (1, 0, 0, 1)  # Red color
+    suzanne.data.materials.append(mat)
+    return suzanne
+
+def write_script_text(script_name, content):
+    """Write script content into a Text datablock, reusing it if it exists"""
+    text = bpy.data.texts.get(script_name)
+    if text:
+        text.clear()
+    else:
+        text = bpy.data.texts.new(name=script_name)
+    text.write(content)
+    return text
+
+def frozen_script_message(base_name):
+    """Get the placeholder script shown for frozen files"""
+    return f"""// This file ({base_name}) is frozen
+// Scripts cannot be viewed or edited on frozen files
+// This is to prevent unauthorized modifications
+//
+// If you need to modify this file, please contact an administrator
+"""
+
+def apply_blueprint_props(props, blueprint):
+    """Copy a blueprint's name, flags, props and metadata into the HYP properties"""
+    props.hyp_name = blueprint.get('name', '') or ''
+    props.hyp_frozen = bool(blueprint.get('frozen', False))
+    
+    # Props object properties
+    blueprint_props = blueprint.get('props', {}) or {}
+    props.hyp_interact = bool(blueprint_props.get('interact', False))
+    props.hyp_click_distance = float(blueprint_props.get('clickDistance', 10.0))
+    props.hyp_collision = bool(blueprint_props.get('collision', True))
+    props.hyp_visible = bool(blueprint_props.get('visible', True))
+    
+    # Set metadata properties
+    props.hyp_id = blueprint.get('id', '') or ''
+    props.hyp_version = blueprint.get('version', 0) or 0
+    props.hyp_author = blueprint.get('author', '') or ''
+    props.hyp_created = blueprint.get('created', '') or ''
+    props.hyp_modified = blueprint.get('modified', '') or ''
+
+def load_hyp_script(props, blueprint, script_content, ctrl_pressed):
+    """Write a .hyp script, or the frozen notice, into a Text datablock"""
+    # Get the hyp name or use the blueprint name as fallback
+    base_name = props.hyp_name or blueprint.get('name', 'script')
+    
+    # Check if frozen and ctrl not pressed
+    if blueprint.get('frozen', False) and not ctrl_pressed:
+        # Create frozen message
+        text = write_script_text("frozen.js", frozen_script_message(base_name))
+    else:
+        # Normal script handling for unfrozen files or ctrl pressed
+        text = write_script_text(f"{base_name}.js", script_content)
+    
+    # Set the script in properties
+    props.hyp_script = text.name
+    return text
+
+def import_staged_assets(staged, base_name):
+    """Import extra .hyp assets that have already been staged as files
+
+    Runs on the main thread: models go through the glTF importer, images
+    and audio become packed image and sound datablocks, scripts become
+    Texts. Returns the number of imported assets.
+    """
+    imported = 0
+    for asset, path in staged:
+        asset_type = asset.get('type')
+        asset_name = os.path.basename(asset.get('url') or '') or f"{base_name}_{asset_type}"
+        
+        if asset_type in MODEL_ASSET_TYPES:
+            bpy.ops.import_scene.gltf(filepath=path)
+        elif asset_type in IMAGE_ASSET_TYPES:
+            image = bpy.data.images.load(path)
+            image.pack()
+            image.name = asset_name
+        elif asset_type in AUDIO_ASSET_TYPES:
+            sound = bpy.data.sounds.load(path)
+            sound.pack()
+            sound.name = asset_name
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                write_script_text(asset_name, f.read())
+        imported += 1
+    return imported
 
 class OBJECT_OT_import_hyp(Operator, ImportHelper):
     """Import a Hyperfy .hyp file"""
     bl_idname = "object.import_hyp"
     bl_label = "Import HYP"
+    bl_options = {'REGISTER', 'UNDO'}
     filename_ext = ".hyp"
     
     filter_glob: StringProperty(
@@ -17,162 +118,249 @@ class OBJECT_OT_import_hyp(Operator, ImportHelper):
         options={'HIDDEN'}
     )
     
+    mode: EnumProperty(
+        name="Mode",
+        items=[
+            ('FULL', "Full Import", "Import the model, script and properties"),
+            ('INSPECT', "Inspect", "Read only the blueprint metadata and properties"),
+            ('SCRIPT', "Script Only", "Read the blueprint and extract the script without the model")
+        ],
+        default='FULL',
+        options={'SKIP_SAVE'}
+    )
+    
+    all_assets: BoolProperty(
+        name="All Assets",
+        description="Also import every other model, image, audio and script asset in the file",
+        default=False
+    )
+    
+    _job = None
+    _timer = None
+    
     def invoke(self, context, event):
         self.ctrl_pressed = event.ctrl
+        self.interactive = True
         return ImportHelper.invoke(self, context, event)
     
     def execute(self, context):
+        ctrl_pressed = getattr(self, 'ctrl_pressed', False)
+        props = context.scene.hyperfy_props
+        
         try:
-            with open(self.filepath, 'rb') as f:
-                # 1. Read header size (4 bytes, uint32 little-endian)
-                header_size = struct.unpack('<I', f.read(4))[0]
-                print(f"Header size: {header_size}")
-                
-                # 2. Read and parse header JSON
-                header_json = f.read(header_size).decode('utf-8')
-                print(f"Header start: {header_json[:100]}...")
-                header = json.loads(header_json)
-                
-                # Extract blueprint and assets
-                blueprint = header.get('blueprint', {})
-                assets = header.get('assets', [])
-                
-                # Get properties early
-                props = context.scene.hyperfy_props
-                
-                # Find the model and script assets
-                model_asset = None
-                script_asset = None
-                
-                for asset in assets:
-                    if asset['type'] == 'model':
-                        model_asset = asset
-                    elif asset['type'] == 'script':
-                        script_asset = asset
-                
-                if not model_asset:
-                    self.report({'ERROR'}, "No model found in .hyp file")
-                    return {'CANCELLED'}
-                
-                # Check if frozen and no admin override
-                is_frozen = blueprint.get('frozen', False)
+            if self.mode == 'INSPECT':
+                # Header only, no asset bytes are touched
+                header, _, _ = read_hyp_header(self.filepath)
+                apply_blueprint_props(props, header.get('blueprint', {}) or {})
+                self.report({'INFO'}, f"Read .hyp metadata: {self.filepath}")
+                return {'FINISHED'}
+            
+            if self.mode == 'SCRIPT':
+                with HypFile(self.filepath) as hyp:
+                    apply_blueprint_props(props, hyp.blueprint)
+                    script_asset = hyp.find_blueprint_asset('script')
+                    if not script_asset or not hyp.blueprint.get('script'):
+                        self.report({'WARNING'}, "No script found in .hyp file")
+                        return {'CANCELLED'}
+                    
+                    # Seek straight to the script, the model is never read
+                    script_content = str(hyp.asset_data(script_asset), 'utf-8')
+                    load_hyp_script(props, hyp.blueprint, script_content, ctrl_pressed)
+                self.report({'INFO'}, f"Extracted script: {props.hyp_script}")
+                return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to read .hyp file: {str(e)}")
+            return {'CANCELLED'}
+        
+        extra_types = (MODEL_ASSET_TYPES | IMAGE_ASSET_TYPES | AUDIO_ASSET_TYPES | {'script'}) if self.all_assets else ()
+        self._job = HypImportJob(self.filepath, include_frozen=ctrl_pressed, extra_types=extra_types)
+        
+        if not getattr(self, 'interactive', False):
+            # Scripted calls block until done
+            self._job.run()
+            return self.finish(context)
+        
+        # File I/O runs on a worker thread, the UI stays responsive
+        self._job.start()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.progress_begin(0, 100)
+        wm.modal_handler_add(self)
+        context.workspace.status_text_set(f"Importing {os.path.basename(self.filepath)}... (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._job.cancel()
+            self.stop_modal(context)
+            self._job.cleanup()
+            self.report({'WARNING'}, "Import cancelled")
+            return {'CANCELLED'}
+        
+        if event.type == 'TIMER':
+            context.window_manager.progress_update(int(self._job.progress * 100))
+            if self._job.done:
+                self.stop_modal(context)
+                return self.finish(context)
+        
+        return {'PASS_THROUGH'}
+    
+    def stop_modal(self, context):
+        wm = context.window_manager
+        if self._timer:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+    
+    def finish(self, context):
+        """Apply a completed staging job to the scene on the main thread"""
+        job = self._job
+        ctrl_pressed = getattr(self, 'ctrl_pressed', False)
+        props = context.scene.hyperfy_props
+        
+        try:
+            if job.error:
+                raise job.error
+            
+            # Set properties early
+            apply_blueprint_props(props, job.blueprint)
+            
+            if job.frozen and not ctrl_pressed:
+                # Load Suzanne instead of the actual model
+                create_frozen_placeholder(context, props.hyp_name)
                 
-                # Set basic properties early
-                props.hyp_name = blueprint.get('name', '') or ''
-                props.hyp_frozen = is_frozen
+                self.report({'WARNING'}, "This is a frozen file. Loading placeholder model.")
+            else:
+                # Import GLB from its staged copy
+                bpy.ops.import_scene.gltf(filepath=job.model_path)
                 
-                if is_frozen and not self.ctrl_pressed:
-                    # Load Suzanne instead of the actual model
-                    bpy.ops.mesh.primitive_monkey_add(size=2.0)
-                    suzanne = context.active_object
-                    suzanne.name = f"FROZEN_{props.hyp_name or 'Object'}"
-                    
-                    # Add a material with red color to indicate frozen state
-                    mat = bpy.data.materials.new(name=f"Frozen_{suzanne.name}")
-                    mat.use_nodes = True
-                    nodes = mat.node_tree.nodes
-                    nodes["Principled BSDF"].inputs[0].default_value = (1, 0, 0, 1)  # Red color
-                    suzanne.data.materials.append(mat)
-                    
-                    self.report({'WARNING'}, "This is a frozen file. Loading placeholder model.")
-                else:
-                    # Normal model loading
-                    # Calculate total size of assets before the model
-                    offset = 0
-                    for asset in assets:
-                        if asset == model_asset:
-                            break
-                        offset += asset['size']
-                    
-                    # Skip to model data if needed
-                    if offset > 0:
-                        f.read(offset)
+                if job.frozen:
+                    self.report({'WARNING'}, "Admin Override Active")
+            
+            # Handle script based on frozen state
+            if job.has_script:
+                load_hyp_script(props, job.blueprint, job.script, ctrl_pressed)
+            
+            if job.extra or job.skipped:
+                imported = import_staged_assets(job.extra, props.hyp_name or 'hyp')
+                if job.skipped:
+                    self.report({'WARNING'}, f"Skipped unsupported assets: {', '.join(sorted(set(job.skipped)))}")
+                self.report({'INFO'}, f"Imported {imported} additional assets")
+            
+            self.report({'INFO'}, f"Successfully imported .hyp file: {self.filepath}")
+            return {'FINISHED'}
+        
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to read .hyp file: {str(e)}")
+            return {'CANCELLED'}
+        finally:
+            job.cleanup()
+
+class OBJECT_OT_import_hyp_batch(Operator, ImportHelper):
+    """Import many Hyperfy .hyp files, parsing them in parallel"""
+    bl_idname = "object.import_hyp_batch"
+    bl_label = "Batch Import HYP"
+    bl_options = {'REGISTER', 'UNDO'}
+    filename_ext = ".hyp"
+    
+    filter_glob: StringProperty(
+        default="*.hyp",
+        options={'HIDDEN'}
+    )
+    
+    files: CollectionProperty(
+        type=bpy.types.OperatorFileListElement,
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+    
+    directory: StringProperty(
+        subtype='DIR_PATH'
+    )
+    
+    recursive: BoolProperty(
+        name="Include Subfolders",
+        description="When no files are selected, import every .hyp below the folder",
+        default=False
+    )
+    
+    workers: IntProperty(
+        name="Workers",
+        description="Number of worker processes (0 uses every core)",
+        default=0,
+        min=0
+    )
+    
+    def invoke(self, context, event):
+        self.ctrl_pressed = event.ctrl
+        return ImportHelper.invoke(self, context, event)
+    
+    def get_filepaths(self):
+        """Get the selected .hyp files, or every .hyp in the chosen folder"""
+        filepaths = [os.path.join(self.directory, f.name) for f in self.files
+                     if f.name.lower().endswith('.hyp')]
+        if filepaths:
+            return filepaths
+        
+        if self.recursive:
+            for root, _, names in os.walk(self.directory):
+                filepaths.extend(os.path.join(root, name) for name in names
+                                 if name.lower().endswith('.hyp'))
+        elif os.path.isdir(self.directory):
+            filepaths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                         if name.lower().endswith('.hyp')]
+        return sorted(filepaths)
+    
+    def execute(self, context):
+        ctrl_pressed = getattr(self, 'ctrl_pressed', False)
+        filepaths = self.get_filepaths()
+        
+        if not filepaths:
+            self.report({'WARNING'}, "No .hyp files found")
+            return {'CANCELLED'}
+        
+        wm = context.window_manager
+        wm.progress_begin(0, len(filepaths))
+        
+        imported_count = 0
+        failed = []
+        try:
+            # Worker processes parse headers and stage models, only the
+            # glTF import itself runs here on the main thread
+            results = extract_hyp_files(filepaths, include_frozen=ctrl_pressed,
+                                        max_workers=self.workers or None)
+            for done, result in enumerate(results, start=1):
+                name = os.path.basename(result['filepath'])
+                model_path = result.get('model_path')
+                try:
+                    if 'error' in result:
+                        raise RuntimeError(result['error'])
                     
-                    # Read model data
-                    model_data = f.read(model_asset['size'])
+                    blueprint = result['blueprint']
+                    base_name = blueprint.get('name') or os.path.splitext(name)[0]
                     
-                    # Write temporary GLB file
-                    temp_glb = self.filepath.replace('.hyp', '.glb')
-                    with open(temp_glb, 'wb') as glb_file:
-                        glb_file.write(model_data)
+                    if model_path:
+                        bpy.ops.import_scene.gltf(filepath=model_path)
+                    else:
+                        create_frozen_placeholder(context, base_name)
                     
-                    try:
-                        # Import GLB
-                        bpy.ops.import_scene.gltf(filepath=temp_glb)
-                        
-                        if is_frozen:
-                            self.report({'WARNING'}, "Admin Override Active")
-                    finally:
-                        # Clean up temp GLB
-                        if os.path.exists(temp_glb):
-                            os.remove(temp_glb)
-                
-                # Props object properties
-                blueprint_props = blueprint.get('props', {})
-                props.hyp_interact = bool(blueprint_props.get('interact', False))
-                props.hyp_click_distance = float(blueprint_props.get('clickDistance', 10.0))
-                props.hyp_collision = bool(blueprint_props.get('collision', True))
-                props.hyp_visible = bool(blueprint_props.get('visible', True))
-                
-                # Handle script based on frozen state
-                if script_asset and blueprint.get('script'):
-                    # Get the hyp name or use the blueprint name as fallback
-                    base_name = props.hyp_name or blueprint.get('name', 'script')
+                    if result['script'] is not None:
+                        write_script_text(f"{base_name}.js", result['script'])
                     
-                    # Check if frozen and ctrl not pressed
-                    if is_frozen and not self.ctrl_pressed:
-                        # Create frozen message
-                        script_name = "frozen.js"
-                        text = bpy.data.texts.get(script_name)
-                        if text:
-                            text.clear()
-                        else:
-                            text = bpy.data.texts.new(name=script_name)
-                        
-                        frozen_message = f"""// This file ({base_name}) is frozen
-// Scripts cannot be viewed or edited on frozen files
-// This is to prevent unauthorized modifications
-//
-// If you need to modify this file, please contact an administrator
-"""
-                        text.write(frozen_message)
-                        props.hyp_script = text.name
-                    else:
-                        # Normal script handling for unfrozen files or ctrl pressed
-                        script_name = f"{base_name}.js"
-                        text = bpy.data.texts.get(script_name)
-                        if text:
-                            text.clear()
-                        else:
-                            text = bpy.data.texts.new(name=script_name)
-                        
-                        # Calculate script position
-                        script_offset = 0
-                        for asset in assets:
-                            if asset == script_asset:
-                                break
-                            script_offset += asset['size']
-                        
-                        # Seek to start of file + header + script offset
-                        f.seek(4 + header_size + script_offset)
-                        
-                        # Read script content
-                        script_content = f.read(script_asset['size']).decode('utf-8')
-                        text.write(script_content)
-                        
-                        # Set the script in properties
-                        props.hyp_script = text.name
+                    imported_count += 1
+                except Exception as e:
+                    failed.append(name)
+                    self.report({'WARNING'}, f"Failed to import {name}: {str(e)}")
+                finally:
+                    if model_path and os.path.exists(model_path):
+                        os.remove(model_path)
                 
-                # Set metadata properties
-                props.hyp_id = blueprint.get('id', '')
-                props.hyp_version = blueprint.get('version', 0)
-                props.hyp_author = blueprint.get('author', '')
-                props.hyp_created = blueprint.get('created', '')
-                props.hyp_modified = blueprint.get('modified', '')
-                
-                self.report({'INFO'}, f"Successfully imported .hyp file: {self.filepath}")
-                return {'FINISHED'}
-                
-        except Exception as e:
-            self.report({'ERROR'}, f"Failed to read .hyp file: {str(e)}")
-            return {'CANCELLED'} 
\ No newline at end of file
+                wm.progress_update(done)
+        finally:
+            wm.progress_end()
+        
+        if failed:
+            self.report({'WARNING'}, f"Imported {imported_count} .hyp files, {len(failed)} failed")
+        else:
+            self.report({'INFO'}, f"Imported {imported_count} .hyp files")
+        return {'FINISHED'} if imported_count else {'CANCELLED'}
\ No newline at end of file
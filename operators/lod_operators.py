@@ -0,0 +1,218 @@
+from bpy.types import Operator
+from bpy.props import BoolProperty
+from ..utils.budget_utils import (
+    BUDGET_RATIOS,
+    REPORT_NAME,
+    apply_budget_ratios,
+    budget_distance,
+    budget_source,
+    count_draw_calls,
+    error_curves,
+    solve_budget,
+    write_budget_report
+)
+from ..utils.lod_utils import (
+    base_key,
+    calibrate_lod_distances,
+    classify_name,
+    generate_lod_meshes,
+    lod_sort_key,
+    parse_lod_targets,
+    triangle_count
+)
+from ..utils.node_index import child_node, child_nodes, invalidate_node_index, nodes_of_type, rigidbody_of
+
+def get_lod_meshes(rigidbody):
+    """Get the LOD mesh objects of a rigidbody, LOD0 first"""
+    lod_empty = child_node(rigidbody, "lod")
+    if lod_empty is None:
+        return []
+    return sorted(child_nodes(lod_empty, "Mesh"), key=lod_sort_key)
+
+class OBJECT_OT_generate_lods(Operator):
+    """Generate decimated LOD1..LODn variants for the selected meshes"""
+    bl_idname = "object.generate_lods"
+    bl_label = "Generate LODs"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        props = context.scene.hyperfy_props
+        
+        try:
+            targets = parse_lod_targets(props.lod_targets)
+        except ValueError as e:
+            self.report({'ERROR'}, f"Invalid LOD targets: {str(e)}")
+            return {'CANCELLED'}
+        
+        if not targets:
+            self.report({'WARNING'}, "No LOD targets set")
+            return {'CANCELLED'}
+        
+        # Names that already have LOD1 or higher variants are left alone
+        has_lods = set()
+        for obj in context.scene.objects:
+            _, kind, index = classify_name(obj.name)
+            if kind == 'lod' and index:
+                has_lods.add(base_key(obj.name))
+        
+        sources = []
+        skipped = 0
+        for obj in context.selected_objects:
+            if obj.type != 'MESH' or not obj.data.polygons:
+                continue
+            _, kind, index = classify_name(obj.name)
+            if kind == 'col' or (kind == 'lod' and index) or base_key(obj.name) in has_lods:
+                skipped += 1
+                continue
+            sources.append(obj)
+        
+        if not sources:
+            self.report({'WARNING'}, "No meshes without LODs selected")
+            return {'CANCELLED'}
+        
+        source_triangles = [triangle_count(obj.data) for obj in sources]
+        results = generate_lod_meshes(sources, targets, context)
+        
+        level_triangles = [0] * len(targets)
+        for obj, levels in zip(sources, results):
+            # The source becomes LOD0
+            base = classify_name(obj.name)[0]
+            if classify_name(obj.name)[1] != 'lod':
+                obj.name = f"{base}_LOD0"
+            
+            for i, (mesh, _) in enumerate(levels):
+                lod = obj.copy()
+                lod.data = mesh
+                lod.name = f"{base}_LOD{i + 1}"
+                for collection in obj.users_collection:
+                    collection.objects.link(lod)
+                level_triangles[i] += triangle_count(mesh)
+        
+        # Sources were renamed to LOD0
+        invalidate_node_index()
+        
+        # Report the reduction achieved per level over all meshes
+        total = sum(source_triangles)
+        levels = ", ".join(
+            f"LOD{i + 1} {count} ({count / max(total, 1):.0%})"
+            for i, count in enumerate(level_triangles)
+        )
+        message = f"Generated LODs for {len(sources)} meshes from {total} triangles: {levels}"
+        if skipped:
+            message += f", skipped {skipped} already with LODs"
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+class OBJECT_OT_calibrate_lods(Operator):
+    """Set LOD distances of the selected rigidbodies (or all) from measured LOD error"""
+    bl_idname = "object.calibrate_lods"
+    bl_label = "Calibrate LOD Distances"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        props = context.scene.hyperfy_props
+        
+        # Rigidbodies of the selection, or every rigidbody in the scene
+        rigidbodies = {}
+        for obj in context.selected_objects:
+            rigidbody = rigidbody_of(obj)
+            if rigidbody:
+                rigidbodies[rigidbody.name] = rigidbody
+        if not rigidbodies:
+            rigidbodies = {obj.name: obj for obj in nodes_of_type(context.scene, "rigidbody")}
+        
+        memo = {}
+        calibrated = 0
+        for rigidbody in rigidbodies.values():
+            if calibrate_lod_distances(get_lod_meshes(rigidbody), props, memo):
+                calibrated += 1
+        
+        if not calibrated:
+            self.report({'WARNING'}, "No rigidbodies with LOD meshes found")
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Calibrated LOD distances of {calibrated} rigidbodies")
+        return {'FINISHED'}
+
+class OBJECT_OT_solve_lod_budget(Operator):
+    """Pick decimation ratios for all rigidbodies to fit the scene triangle budget"""
+    bl_idname = "object.solve_lod_budget"
+    bl_label = "Solve LOD Budget"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    apply: BoolProperty(
+        name="Apply",
+        description="Decimate every LOD level from its original mesh to the chosen ratios and recalibrate LOD distances",
+        default=False
+    )
+    
+    def execute(self, context):
+        props = context.scene.hyperfy_props
+        
+        # Every rigidbody with a mesh LOD0 takes part
+        entries = []
+        for obj in nodes_of_type(context.scene, "rigidbody"):
+            lod_meshes = get_lod_meshes(obj)
+            if lod_meshes and lod_meshes[0].type == 'MESH' and lod_meshes[0].data.polygons:
+                entries.append((obj, lod_meshes))
+        
+        if not entries:
+            self.report({'WARNING'}, "No rigidbodies with LOD meshes found")
+            return {'CANCELLED'}
+        
+        # Error curves per unique mesh, scaled to world units per object
+        curves = error_curves([lod_meshes[0] for _, lod_meshes in entries], context)
+        items = []
+        for _, lod_meshes in entries:
+            scale = max(lod_meshes[0].matrix_world.to_scale())
+            items.append([(triangles, error * scale)
+                          for triangles, error in curves[budget_source(lod_meshes[0]).as_pointer()]])
+        
+        levels, total = solve_budget(items, props.triangle_budget)
+        draw_calls = sum(count_draw_calls(lod_meshes) for _, lod_meshes in entries)
+        
+        rows = []
+        choices = {}
+        decimated = 0
+        for (rigidbody, lod_meshes), curve, level in zip(entries, items, levels):
+            triangles, error = curve[level]
+            rows.append({
+                'name': rigidbody.name,
+                'ratio': BUDGET_RATIOS[level],
+                'triangles': triangles,
+                'source': curve[0][0],
+                'error': error,
+                'distance': budget_distance(error, props),
+            })
+            if level:
+                decimated += 1
+            # Every level shrinks by the same ratio so LOD1+ stays coarser
+            # than LOD0; a ratio of 1 restores previously decimated levels
+            for lod_mesh in lod_meshes:
+                if lod_mesh.type == 'MESH':
+                    choices[lod_mesh] = BUDGET_RATIOS[level]
+        
+        if self.apply:
+            before = {lod_mesh: lod_mesh.data for lod_mesh in choices}
+            apply_budget_ratios(choices, context)
+            memo = {}
+            for _, lod_meshes in entries:
+                if any(lod_mesh.data != before.get(lod_mesh, lod_mesh.data) for lod_mesh in lod_meshes):
+                    calibrate_lod_distances(lod_meshes, props, memo)
+        
+        source_total = sum(curve[0][0] for curve in items)
+        summary = [
+            f"Rigidbodies: {len(entries)}",
+            f"Triangles at LOD0: {total} of {props.triangle_budget} budget ({source_total} before solving)",
+            f"Draw calls at LOD0: {draw_calls}",
+            f"Decimated: {decimated}" + (" (applied)" if self.apply else " (not applied)"),
+        ]
+        write_budget_report(rows, summary)
+        
+        if total > props.triangle_budget:
+            self.report({'WARNING'}, f"Over budget: {total} triangles, {draw_calls} draw calls, "
+                                     f"see the '{REPORT_NAME}' text")
+        else:
+            self.report({'INFO'}, f"{total} triangles, {draw_calls} draw calls, "
+                                  f"{decimated} rigidbodies decimated, see the '{REPORT_NAME}' text")
+        return {'FINISHED'}
@@ -1,61 +1,14 @@
 import bpy
 from bpy.types import Operator
-
-class OBJECT_OT_set_rigidbody_type(Operator):
-    """Set type for multiple rigidbodies"""
-    bl_idname = "object.set_rigidbody_type"
-    bl_label = "Set Rigidbody Type"
-    bl_options = {'REGISTER', 'UNDO'}
-    
-    type: bpy.props.StringProperty()
-    target_objects: bpy.props.StringProperty()
-    
-    def execute(self, context):
-        props = context.scene.hyperfy_props
-        objects = self.target_objects.split(',')
-        for obj_name in objects:
-            obj = bpy.data.objects.get(obj_name)
-            if obj:
-                obj["type"] = self.type
-        return {'FINISHED'}
-
-class OBJECT_OT_set_mesh_property(Operator):
-    """Set property for multiple mesh objects"""
-    bl_idname = "object.set_mesh_property"
-    bl_label = "Set Mesh Property"
-    bl_options = {'REGISTER', 'UNDO'}
-    
-    property_name: bpy.props.StringProperty()
-    target_objects: bpy.props.StringProperty()
-    
-    def execute(self, context):
-        props = context.scene.hyperfy_props
-        objects = self.target_objects.split(',')
-        for obj_name in objects:
-            obj = bpy.data.objects.get(obj_name)
-            if obj:
-                # Toggle the property
-                obj[self.property_name] = not obj.get(self.property_name, True)
-        return {'FINISHED'}
-
-class OBJECT_OT_set_collider_property(Operator):
-    """Set property for multiple collider objects"""
-    bl_idname = "object.set_collider_property"
-    bl_label = "Set Collider Property"
-    bl_options = {'REGISTER', 'UNDO'}
-    
-    property_name: bpy.props.StringProperty()
-    target_objects: bpy.props.StringProperty()
-    
-    def execute(self, context):
-        props = context.scene.hyperfy_props
-        objects = self.target_objects.split(',')
-        for obj_name in objects:
-            obj = bpy.data.objects.get(obj_name)
-            if obj:
-                # Toggle the property
-                obj[self.property_name] = not obj.get(self.property_name, True)
-        return {'FINISHED'}
+from bpy.props import BoolProperty, EnumProperty, FloatProperty
+from ..utils.bulk_utils import (
+    BULK_MODE_ITEMS,
+    BULK_PROPERTIES,
+    BULK_PROPERTY_ITEMS,
+    BULK_SOURCE_ITEMS,
+    bulk_apply,
+    bulk_targets
+)
 
 class OBJECT_OT_update_rigidbody_property(Operator):
     """Update rigidbody properties"""
@@ -76,4 +29,73 @@ class OBJECT_OT_update_rigidbody_property(Operator):
             if self.property_name == "type":
                 context.scene.hyperfy_props.physics_type = self.property_value
                 
-        return {'FINISHED'} 
\ No newline at end of file
+        return {'FINISHED'}
+
+class OBJECT_OT_bulk_set_property(Operator):
+    """Set or toggle a Hyperfy property on every matching node in one undo step"""
+    bl_idname = "object.bulk_set_property"
+    bl_label = "Bulk Set Property"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    property_name: EnumProperty(
+        name="Property",
+        items=BULK_PROPERTY_ITEMS,
+        default='castShadow'
+    )
+    
+    source: EnumProperty(
+        name="Targets",
+        items=BULK_SOURCE_ITEMS,
+        default='SELECTED'
+    )
+    
+    mode: EnumProperty(
+        name="Mode",
+        items=BULK_MODE_ITEMS,
+        default='SET'
+    )
+    
+    bool_value: BoolProperty(
+        name="Value",
+        default=True
+    )
+    
+    mass_value: FloatProperty(
+        name="Mass",
+        default=1.0,
+        min=0.0
+    )
+    
+    type_value: EnumProperty(
+        name="Type",
+        items=[
+            ('dynamic', 'Dynamic', 'Object is affected by physics'),
+            ('static', 'Static', 'Object is immovable'),
+            ('kinematic', 'Kinematic', 'Object is controlled by animation')
+        ],
+        default='dynamic'
+    )
+    
+    dry_run: BoolProperty(
+        name="Dry Run",
+        description="Only count the objects that would change",
+        default=False
+    )
+    
+    def execute(self, context):
+        kind = BULK_PROPERTIES[self.property_name][1]
+        if self.mode == 'TOGGLE' and kind != 'BOOL':
+            self.report({'WARNING'}, f"{self.property_name} can only be set, not toggled")
+            return {'CANCELLED'}
+        
+        value = {'BOOL': self.bool_value, 'FLOAT': self.mass_value, 'TYPE': self.type_value}[kind]
+        targets = bulk_targets(context, self.property_name, self.source)
+        changed = bulk_apply(targets, self.property_name, self.mode, value, dry_run=self.dry_run)
+        
+        if self.dry_run:
+            # Nothing was written, so skip the undo step
+            self.report({'INFO'}, f"{self.property_name}: {changed} of {len(targets)} objects would change")
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"{self.property_name}: changed {changed} of {len(targets)} objects")
+        return {'FINISHED'}
@@ -1,9 +1,128 @@
 import bpy
-import re
+from bpy.app.handlers import persistent
 from bpy.props import (StringProperty, 
                        BoolProperty,
                        IntProperty,
-                       EnumProperty)
+                       EnumProperty,
+                       CollectionProperty)
+from ..utils.rename_utils import (
+    CONFLICT_LABELS,
+    RenamePlan,
+    apply_renames,
+    clean_name,
+    drop_conflicts,
+    find_conflicts,
+    plan_renames
+)
+
+class HyperfyRenamePreviewItem(bpy.types.PropertyGroup):
+    """One planned rename shown in the renamer preview"""
+    old_name: StringProperty(name="Old Name")
+    new_name: StringProperty(name="New Name")
+    conflict: StringProperty(name="Conflict")
+
+# Scene properties a rename plan is compiled from
+RENAME_SETTINGS = (
+    'use_find_replace', 'find_mode', 'find_text', 'replace_text', 'rename_template',
+    'use_prefix', 'prefix_operation', 'prefix_text',
+    'use_suffix', 'suffix_operation', 'suffix_text',
+    'use_case_conversion', 'case_conversion',
+    'use_numbering', 'numbering_position', 'numbering_base',
+    'numbering_increment', 'numbering_padding', 'numbering_separator',
+)
+
+# (settings, selected names) the current preview was computed for
+_preview_key = None
+
+def fill_rename_preview(scene, renames, conflicts):
+    """Store the changed entries of a rename plan for the preview list
+
+    Existing items are reused and only rewritten where they differ, so a
+    preview that changes by a few names stays cheap to refresh.
+    """
+    preview = scene.rename_preview
+    changed = [(old, new, CONFLICT_LABELS.get(conflicts.get(i), ""))
+               for i, (_, old, new) in enumerate(renames) if old != new]
+    
+    while len(preview) > len(changed):
+        preview.remove(len(preview) - 1)
+    for _ in range(len(changed) - len(preview)):
+        preview.add()
+    
+    for item, (old, new, conflict) in zip(preview, changed):
+        if item.old_name != old:
+            item.old_name = old
+        if item.new_name != new:
+            item.new_name = new
+        if item.conflict != conflict:
+            item.conflict = conflict
+    
+    if scene.rename_preview_index >= len(changed):
+        scene.rename_preview_index = 0
+    scene.rename_preview_conflicts = len(conflicts)
+
+def refresh_rename_preview(scene, objects, force=False):
+    """Recompute the preview unless settings and selection are unchanged"""
+    global _preview_key
+    key = (tuple(getattr(scene, name) for name in RENAME_SETTINGS), frozenset(obj.name for obj in objects))
+    if key == _preview_key and not force:
+        return
+    _preview_key = key
+    
+    try:
+        renames = plan_renames(objects, RenamePlan(scene))
+    except ValueError as e:
+        scene.rename_preview.clear()
+        scene.rename_preview_conflicts = 0
+        scene.rename_preview_error = str(e)
+        return
+    
+    if scene.rename_preview_error:
+        scene.rename_preview_error = ""
+    fill_rename_preview(scene, renames, find_conflicts(renames, bpy.data.objects.keys()))
+
+def update_rename_preview(self, context):
+    if self.rename_live_preview:
+        refresh_rename_preview(self, context.selected_objects)
+
+# Toggles of the rename steps; with none enabled there is nothing to preview
+RENAME_STEPS = ('use_find_replace', 'use_prefix', 'use_suffix', 'use_case_conversion', 'use_numbering')
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    # Selection changes arrive as scene updates
+    if not getattr(scene, "rename_live_preview", False):
+        return
+    if not any(getattr(scene, name) for name in RENAME_STEPS):
+        return
+    if any(isinstance(update.id, bpy.types.Scene) for update in depsgraph.updates):
+        view_layer = bpy.context.view_layer
+        refresh_rename_preview(scene, [obj for obj in view_layer.objects if obj.select_get(view_layer=view_layer)])
+
+@persistent
+def _on_reset(*args):
+    # Undo and file loads restore previews the key no longer describes
+    global _preview_key
+    _preview_key = None
+
+class OBJECT_OT_preview_rename(bpy.types.Operator):
+    """Compute the new names of the selected objects without renaming them"""
+    bl_idname = "object.preview_rename"
+    bl_label = "Preview Rename"
+    bl_options = {'REGISTER'}
+    
+    def execute(self, context):
+        scene = context.scene
+        refresh_rename_preview(scene, context.selected_objects, force=True)
+        
+        if scene.rename_preview_error:
+            self.report({'ERROR'}, scene.rename_preview_error)
+            return {'CANCELLED'}
+        if scene.rename_preview_conflicts:
+            self.report({'WARNING'}, f"{scene.rename_preview_conflicts} of {len(scene.rename_preview)} new names conflict")
+        else:
+            self.report({'INFO'}, f"{len(scene.rename_preview)} objects would be renamed")
+        return {'FINISHED'}
 
 class OBJECT_OT_batch_rename(bpy.types.Operator):
     """Batch rename selected objects with various options"""
@@ -20,55 +139,25 @@ class OBJECT_OT_batch_rename(bpy.types.Operator):
             self.report({'WARNING'}, "No objects selected")
             return {'CANCELLED'}
         
-        # Apply operations based on user selection
-        for obj in selected_objects:
-            new_name = obj.name
-            
-            # 1. Find and replace
-            if scene.use_find_replace:
-                if scene.find_text in new_name:
-                    new_name = new_name.replace(scene.find_text, scene.replace_text)
-            
-            # 2. Add/remove prefix
-            if scene.use_prefix:
-                if scene.prefix_operation == 'ADD':
-                    new_name = scene.prefix_text + new_name
-                elif scene.prefix_operation == 'REMOVE':
-                    prefix_len = len(scene.prefix_text)
-                    if new_name.startswith(scene.prefix_text):
-                        new_name = new_name[prefix_len:]
-            
-            # 3. Add/remove suffix
-            if scene.use_suffix:
-                if scene.suffix_operation == 'ADD':
-                    new_name = new_name + scene.suffix_text
-                elif scene.suffix_operation == 'REMOVE':
-                    suffix_len = len(scene.suffix_text)
-                    if new_name.endswith(scene.suffix_text):
-                        new_name = new_name[:-suffix_len]
-            
-            # 4. Case conversion
-            if scene.use_case_conversion:
-                if scene.case_conversion == 'UPPER':
-                    new_name = new_name.upper()
-                elif scene.case_conversion == 'LOWER':
-                    new_name = new_name.lower()
-                elif scene.case_conversion == 'TITLE':
-                    new_name = new_name.title()
-            
-            # 5. Numbering
-            if scene.use_numbering:
-                # Get the base name without existing numbering
-                base_name = re.sub(r'[0-9]+$', '', new_name).rstrip('._- ')
-                
-                if scene.numbering_position == 'PREFIX':
-                    new_name = f"{scene.numbering_base + scene.numbering_increment * selected_objects.index(obj):0{scene.numbering_padding}d}{scene.numbering_separator}{base_name}"
-                else:  # SUFFIX
-                    new_name = f"{base_name}{scene.numbering_separator}{scene.numbering_base + scene.numbering_increment * selected_objects.index(obj):0{scene.numbering_padding}d}"
-            
-            # Apply new name
-            obj.name = new_name
+        # Compute every final name first, in name order
+        try:
+            renames = plan_renames(selected_objects, RenamePlan(scene))
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        conflicts = find_conflicts(renames, bpy.data.objects.keys())
         
+        # Refuse rather than let Blender append .001 suffixes
+        if conflicts:
+            fill_rename_preview(scene, renames, conflicts)
+            self.report({'ERROR'}, f"{len(conflicts)} new names conflict, nothing renamed (see preview)")
+            return {'CANCELLED'}
+        
+        renamed = apply_renames(renames)
+        scene.rename_preview.clear()
+        scene.rename_preview_conflicts = 0
+        
+        self.report({'INFO'}, f"Renamed {renamed} objects")
         return {'FINISHED'}
 
 
@@ -85,38 +174,88 @@ class OBJECT_OT_clean_names(bpy.types.Operator):
             self.report({'WARNING'}, "No objects selected")
             return {'CANCELLED'}
         
-        for obj in selected_objects:
-            # Replace special characters with underscores
-            new_name = re.sub(r'[^\w\s]', '_', obj.name)
-            # Remove multiple consecutive underscores
-            new_name = re.sub(r'_+', '_', new_name)
-            # Strip leading/trailing underscores
-            new_name = new_name.strip('_')
-            
-            obj.name = new_name
+        renames = []
+        for obj in sorted(selected_objects, key=lambda obj: obj.name):
+            # Special characters to single underscores, with precompiled patterns
+            renames.append((obj, obj.name, clean_name(obj.name)))
         
+        # Names that would clash keep their old name instead of getting a suffix
+        renames, skipped = drop_conflicts(renames, bpy.data.objects.keys())
+        renamed = apply_renames(renames)
+        
+        if skipped:
+            self.report({'WARNING'}, f"Cleaned {renamed} names, {skipped} skipped because they would clash")
+        else:
+            self.report({'INFO'}, f"Cleaned {renamed} names")
         return {'FINISHED'}
 
 # Register renamer properties
 def register_renamer_properties():
+    # Preview list of planned renames
+    bpy.utils.register_class(HyperfyRenamePreviewItem)
+    bpy.types.Scene.rename_preview = CollectionProperty(
+        type=HyperfyRenamePreviewItem
+    )
+    bpy.types.Scene.rename_preview_index = IntProperty(
+        name="Preview Index",
+        default=0
+    )
+    bpy.types.Scene.rename_preview_conflicts = IntProperty(
+        name="Conflicts",
+        default=0
+    )
+    bpy.types.Scene.rename_preview_error = StringProperty(
+        name="Preview Error",
+        default=""
+    )
+    bpy.types.Scene.rename_live_preview = BoolProperty(
+        name="Live Preview",
+        description="Update the preview while typing and when the selection changes",
+        default=True,
+        update=update_rename_preview
+    )
+    
     # Find and replace
     bpy.types.Scene.use_find_replace = BoolProperty(
         name="Use Find & Replace",
-        default=False
+        default=False,
+        update=update_rename_preview
+    )
+    bpy.types.Scene.find_mode = EnumProperty(
+        name="Mode",
+        items=[
+            ('TEXT', "Text", "Replace literal text"),
+            ('REGEX', "Regex", "Replace a regular expression; use \\1 or \\g<name> for capture groups"),
+            ('TEMPLATE', "Template", "Build the name from tokens: {name} {base} {collection} {node} {lod} {tag} {index}")
+        ],
+        default='TEXT',
+        update=update_rename_preview
     )
     bpy.types.Scene.find_text = StringProperty(
         name="Find",
-        default=""
+        default="",
+        options={'TEXTEDIT_UPDATE'},
+        update=update_rename_preview
     )
     bpy.types.Scene.replace_text = StringProperty(
         name="Replace",
-        default=""
+        default="",
+        options={'TEXTEDIT_UPDATE'},
+        update=update_rename_preview
+    )
+    bpy.types.Scene.rename_template = StringProperty(
+        name="Template",
+        description="{tag} is LOD# for meshes and LOD variants and COL for collision meshes",
+        default="{base}{tag}",
+        options={'TEXTEDIT_UPDATE'},
+        update=update_rename_preview
     )
     
     # Prefix
     bpy.types.Scene.use_prefix = BoolProperty(
         name="Use Prefix",
-        default=False
+        default=False,
+        update=update_rename_preview
     )
     bpy.types.Scene.prefix_operation = EnumProperty(
         name="Prefix Operation",
@@ -124,17 +263,20 @@ def register_renamer_properties():
             ('ADD', "Add", "Add prefix to name"),
             ('REMOVE', "Remove", "Remove prefix from name")
         ],
-        default='ADD'
+        default='ADD',
+        update=update_rename_preview
     )
     bpy.types.Scene.prefix_text = StringProperty(
         name="Prefix Text",
-        default=""
+        default="",
+        update=update_rename_preview
     )
     
     # Suffix
     bpy.types.Scene.use_suffix = BoolProperty(
         name="Use Suffix",
-        default=False
+        default=False,
+        update=update_rename_preview
     )
     bpy.types.Scene.suffix_operation = EnumProperty(
         name="Suffix Operation",
@@ -142,17 +284,20 @@ def register_renamer_properties():
             ('ADD', "Add", "Add suffix to name"),
             ('REMOVE', "Remove", "Remove suffix from name")
         ],
-        default='ADD'
+        default='ADD',
+        update=update_rename_preview
     )
     bpy.types.Scene.suffix_text = StringProperty(
         name="Suffix Text",
-        default=""
+        default="",
+        update=update_rename_preview
     )
     
     # Case conversion
     bpy.types.Scene.use_case_conversion = BoolProperty(
         name="Use Case Conversion",
-        default=False
+        default=False,
+        update=update_rename_preview
     )
     bpy.types.Scene.case_conversion = EnumProperty(
         name="Case",
@@ -161,13 +306,15 @@ def register_renamer_properties():
             ('LOWER', "lowercase", "Convert to lowercase"),
             ('TITLE', "Title Case", "Convert to title case")
         ],
-        default='UPPER'
+        default='UPPER',
+        update=update_rename_preview
     )
     
     # Numbering
     bpy.types.Scene.use_numbering = BoolProperty(
         name="Use Numbering",
-        default=False
+        default=False,
+        update=update_rename_preview
     )
     bpy.types.Scene.numbering_position = EnumProperty(
         name="Position",
@@ -175,34 +322,52 @@ def register_renamer_properties():
             ('PREFIX', "Before Name", "Add number before name"),
             ('SUFFIX', "After Name", "Add number after name")
         ],
-        default='SUFFIX'
+        default='SUFFIX',
+        update=update_rename_preview
     )
     bpy.types.Scene.numbering_base = IntProperty(
         name="Start At",
         default=1,
-        min=0
+        min=0,
+        update=update_rename_preview
     )
     bpy.types.Scene.numbering_increment = IntProperty(
         name="Step",
         default=1,
-        min=1
+        min=1,
+        update=update_rename_preview
     )
     bpy.types.Scene.numbering_padding = IntProperty(
         name="Padding",
         default=2,
         min=1,
         max=10,
-        description="Number of digits in the numbering"
+        description="Number of digits in the numbering",
+        update=update_rename_preview
     )
     bpy.types.Scene.numbering_separator = StringProperty(
         name="Separator",
         default="_",
-        description="Character between number and name"
+        description="Character between number and name",
+        update=update_rename_preview
     )
+    
+    # Live preview on selection changes
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(_on_reset)
 
 # Unregister renamer properties
 def unregister_renamer_properties():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _on_reset in handlers:
+            handlers.remove(_on_reset)
+    
     del bpy.types.Scene.use_find_replace
+    del bpy.types.Scene.find_mode
+    del bpy.types.Scene.rename_template
     del bpy.types.Scene.find_text
     del bpy.types.Scene.replace_text
     del bpy.types.Scene.use_prefix
@@ -218,4 +383,10 @@ def unregister_renamer_properties():
     del bpy.types.Scene.numbering_base
     del bpy.types.Scene.numbering_increment
     del bpy.types.Scene.numbering_padding
-    del bpy.types.Scene.numbering_separator 
\ No newline at end of file
+    del bpy.types.Scene.numbering_separator
+    del bpy.types.Scene.rename_preview
+    del bpy.types.Scene.rename_preview_index
+    del bpy.types.Scene.rename_preview_conflicts
+    del bpy.types.Scene.rename_preview_error
+    del bpy.types.Scene.rename_live_preview
+    bpy.utils.unregister_class(HyperfyRenamePreviewItem)
@@ -1,5 +1,6 @@
 import bpy
 from bpy.types import Operator
+from ..utils.panel_cache import classify_rig
 
 class OBJECT_OT_mixamo_to_vrm(Operator):
     """Convert Mixamo rig to VRM rig"""
@@ -153,22 +154,13 @@ class OBJECT_OT_detect_and_convert_rig(Operator):
             return {'CANCELLED'}
         
         # Detect rig type
-        is_mixamo = False
-        is_vrm = False
-        
-        for bone in active_obj.data.bones:
-            if "mixamo" in bone.name.lower():
-                is_mixamo = True
-                break
-            elif any(key in bone.name.lower() for key in ["hips", "spine", "chest", "neck", "head"]):
-                is_vrm = True
-                break
+        detected = classify_rig(active_obj.data)
         
         # Convert based on detected type
-        if is_mixamo:
+        if detected == 'MIXAMO':
             bpy.ops.object.mixamo_to_vrm()
             self.report({'INFO'}, "Converted Mixamo rig to VRM")
-        elif is_vrm:
+        elif detected == 'VRM':
             bpy.ops.object.vrm_to_mixamo()
             self.report({'INFO'}, "Converted VRM rig to Mixamo")
         else:
@@ -1,52 +1,17 @@
 import bpy
 from bpy.types import Operator
-from ..utils.rigidbody_utils import process_rigidbody_hierarchy
+from ..utils.rigidbody_utils import (
+    apply_rigidbody_plan,
+    plan_rigidbodies,
+    process_rigidbody_hierarchy
+)
 from ..utils.collider_utils import (
     create_box_collider,
     create_sphere_collider,
     create_simple_collider,
     setup_collider
 )
-from ..utils.lod_utils import find_col_object
-
-def get_lod_groups(objects):
-    """Group objects by their base names (for LOD processing)"""
-    lod_groups = {}
-    
-    for obj in objects:
-        base_name = obj.name.lower()
-        # Strip LOD and COL suffixes to get base name
-        if 'lod' in base_name:
-            base_name = base_name.split('lod')[0]
-        elif 'col' in base_name:
-            base_name = base_name.replace('col', '')
-        base_name = base_name.strip()
-        
-        # Find existing group or create new one
-        found_group = None
-        for key in lod_groups.keys():
-            key_base = key.name.lower()
-            if 'lod' in key_base:
-                key_base = key_base.split('lod')[0]
-            elif 'col' in key_base:
-                key_base = key_base.replace('col', '')
-            key_base = key_base.strip()
-            
-            if key_base == base_name:
-                found_group = key
-                break
-        
-        if found_group:
-            lod_groups[found_group].append(obj)
-        else:
-            # For new groups, prefer non-COL object as key
-            if not obj.name.lower().endswith('col'):
-                lod_groups[obj] = [obj]
-            else:
-                # If only COL object found so far, use it as key
-                lod_groups[obj] = [obj]
-    
-    return lod_groups
+from ..utils.lod_utils import get_lod_groups
 
 class OBJECT_OT_create_rigidbody(Operator):
     """Create a new Rigidbody object"""
@@ -64,6 +29,7 @@ class OBJECT_OT_create_rigidbody(Operator):
             mesh_obj = context.active_object
             mesh_obj.name = "Mesh"
             collider = create_box_collider(context)
+            context.scene.collection.objects.link(collider)
             
             # Create empty parent
             empty = bpy.data.objects.new("Rigidbody", None)
@@ -90,17 +56,15 @@ class OBJECT_OT_create_rigidbody(Operator):
             
         else:
             # Process hierarchy and get processed objects
-            processed_objects = process_rigidbody_hierarchy(context, selected_obj)
+            processed_objects, _ = process_rigidbody_hierarchy(context, selected_obj)
             
             if not processed_objects:
                 self.report({'WARNING'}, "No valid objects to process")
                 return {'CANCELLED'}
             
             # Delete all processed original objects
-            bpy.ops.object.select_all(action='DESELECT')
             for obj in processed_objects:
-                obj.select_set(True)
-            bpy.ops.object.delete()
+                bpy.data.objects.remove(obj, do_unlink=True)
         
         return {'FINISHED'}
 
@@ -111,48 +75,28 @@ class OBJECT_OT_create_rigidbodies(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        # Get selected mesh objects
-        selected_meshes = [obj for obj in context.selected_objects 
+        # Get selected mesh objects whose parent is not selected too
+        selected_objects = context.selected_objects
+        selected = set(selected_objects)
+        selected_meshes = [obj for obj in selected_objects
                          if obj.type == 'MESH' and 
-                         (not obj.parent or obj.parent not in context.selected_objects)]
+                         (not obj.parent or obj.parent not in selected)]
         
         if not selected_meshes:
             self.report({'WARNING'}, "No valid objects selected")
             return {'CANCELLED'}
         
-        # Group objects by LOD
-        lod_groups = get_lod_groups(selected_meshes)
-        
-        # Process each group
-        all_processed_objects = []
-        created_rigidbodies = []  # Store created rigidbody empties
-        created_count = 0
-        
-        for main_obj, lod_variants in lod_groups.items():
-            # Process the group with all its LOD variants
-            processed = process_rigidbody_hierarchy(context, main_obj, lod_variants=lod_variants)
-            if processed:
-                all_processed_objects.extend(processed)
-                # Find and store the created rigidbody empty
-                for obj in context.scene.objects:
-                    if (obj.get("node") == "rigidbody" and 
-                        obj.name.startswith(main_obj.name.split('LOD')[0].replace('COL', ''))):
-                        created_rigidbodies.append(obj)
-                created_count += 1
-        
-        # Delete all processed original objects
-        if all_processed_objects:
-            bpy.ops.object.select_all(action='DESELECT')
-            for obj in all_processed_objects:
-                if isinstance(obj, bpy.types.Object):
-                    obj.select_set(True)
-            bpy.ops.object.delete()
+        # Plan all groups first, then create everything in one pass
+        plan = plan_rigidbodies(get_lod_groups(selected_meshes).values())
+        created = apply_rigidbody_plan(context, plan)
         
         # Select the created rigidbodies
-        bpy.ops.object.select_all(action='DESELECT')
-        for rb in created_rigidbodies:
-            rb.select_set(True)
-            context.view_layer.objects.active = rb  # Make the last one active
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        for nodes in created:
+            nodes['rigidbody'].select_set(True)
+        if created:
+            context.view_layer.objects.active = created[-1]['rigidbody']  # Make the last one active
         
-        self.report({'INFO'}, f"Created {created_count} rigidbodies")
+        self.report({'INFO'}, f"Created {len(created)} rigidbodies")
         return {'FINISHED'} 
\ No newline at end of file
@@ -1,15 +1,7 @@
 import bpy
 from bpy.types import Operator
 import math
-
-def get_rigidbody_parent(obj):
-    """Get the rigidbody parent of an object in the hierarchy"""
-    current = obj
-    while current:
-        if current.get("node") == "rigidbody":
-            return current
-        current = current.parent
-    return None
+from ..utils.node_index import rigidbody_of
 
 class OBJECT_OT_add_snap_point(Operator):
     """Add a snap point empty object"""
@@ -24,12 +16,7 @@ class OBJECT_OT_add_snap_point(Operator):
         locations = [(0, 0, 0)]  # Default location
         
         # Find rigidbody parent
-        rigidbody_obj = None
-        if active_obj:
-            if active_obj.get("node") == "rigidbody":
-                rigidbody_obj = active_obj
-            else:
-                rigidbody_obj = get_rigidbody_parent(active_obj)
+        rigidbody_obj = rigidbody_of(active_obj)
         
         if not rigidbody_obj:
             self.report({'WARNING'}, "No rigidbody object selected")
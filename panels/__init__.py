@@ -2,9 +2,11 @@ from . import main_panel
 from . import credits_panel
 from . import export_panel
 from . import hyp_panel
+from . import hyp_library_panel
 from . import renamer_panel
+from . import bulk_panel
 
-__all__ = ['main_panel', 'credits_panel', 'export_panel', 'hyp_panel', 'renamer_panel']
+__all__ = ['main_panel', 'credits_panel', 'export_panel', 'hyp_panel', 'hyp_library_panel', 'renamer_panel', 'bulk_panel']
 
 def register():
     for module in modules:
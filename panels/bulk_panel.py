@@ -0,0 +1,45 @@
+from bpy.types import Panel
+from ..utils.bulk_utils import BULK_PROPERTIES
+
+class HYPERFY_PT_bulk_edit_panel(Panel):
+    """Bulk Edit Panel for setting node properties on many objects"""
+    bl_label = "Bulk Edit"
+    bl_idname = "HYPERFY_PT_bulk_edit"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Hyperfy'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.hyperfy_props
+        kind = BULK_PROPERTIES[props.bulk_property][1]
+
+        box = layout.box()
+        box.label(text="Bulk Edit Properties:", icon='PROPERTIES')
+        col = box.column(align=True)
+        col.prop(props, "bulk_property", text="Property")
+        col.prop(props, "bulk_source", text="Targets")
+
+        # Only flags can be toggled
+        if kind == 'BOOL':
+            row = col.row(align=True)
+            row.prop(props, "bulk_mode", expand=True)
+
+        if kind == 'FLOAT':
+            col.prop(props, "bulk_mass", text="Mass")
+        elif kind == 'TYPE':
+            col.prop(props, "bulk_type", text="Type")
+        elif props.bulk_mode == 'SET':
+            col.prop(props, "bulk_value", text="Value")
+
+        row = box.row(align=True)
+        for dry_run, text, icon in ((True, "Count", 'VIEWZOOM'), (False, "Apply", 'CHECKMARK')):
+            op = row.operator("object.bulk_set_property", text=text, icon=icon)
+            op.property_name = props.bulk_property
+            op.source = props.bulk_source
+            op.mode = props.bulk_mode if kind == 'BOOL' else 'SET'
+            op.bool_value = props.bulk_value
+            op.mass_value = props.bulk_mass
+            op.type_value = props.bulk_type
+            op.dry_run = dry_run
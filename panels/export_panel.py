@@ -1,14 +1,6 @@
 import bpy
 from bpy.types import Panel
-
-def get_rigidbody_parent(obj):
-    """Get the rigidbody parent of an object in the hierarchy"""
-    current = obj
-    while current:
-        if current.get("node") == "rigidbody":
-            return current
-        current = current.parent
-    return None
+from ..utils.node_index import rigidbody_of
 
 class HYPERFY_PT_export_panel(Panel):
     """Export Panel for GLB files"""
@@ -21,12 +13,7 @@ class HYPERFY_PT_export_panel(Panel):
     @classmethod
     def poll(cls, context):
         # Only show when a rigidbody or its child is selected
-        active_obj = context.active_object
-        if active_obj:
-            if active_obj.get("node") == "rigidbody":
-                return True
-            return get_rigidbody_parent(active_obj) is not None
-        return False
+        return rigidbody_of(context.active_object) is not None
     
     def draw(self, context):
         layout = self.layout
@@ -54,4 +41,14 @@ class HYPERFY_PT_export_panel(Panel):
         col = info.column(align=True)
         col.scale_y = 0.8
         col.label(text="Export selected or all visible objects", icon='INFO')
-        col.label(text="Preserves hierarchy and properties", icon='BLANK1') 
\ No newline at end of file
+        col.label(text="Preserves hierarchy and properties", icon='BLANK1')
+        
+        # Scene budget section
+        props = context.scene.hyperfy_props
+        budget_box = layout.box()
+        budget_box.label(text="Scene Budget:", icon='MOD_DECIM')
+        col = budget_box.column(align=True)
+        col.prop(props, "triangle_budget", text="Triangles")
+        row = budget_box.row(align=True)
+        row.operator("object.solve_lod_budget", text="Report", icon='TEXT').apply = False
+        row.operator("object.solve_lod_budget", text="Apply", icon='CHECKMARK').apply = True 
\ No newline at end of file
@@ -0,0 +1,61 @@
+from bpy.types import Panel, UIList
+
+class HYPERFY_UL_hyp_library(UIList):
+    """List of indexed .hyp files"""
+    
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        if item.error:
+            row.alert = True
+            row.label(text=item.name, icon='ERROR')
+            return
+        
+        row.label(text=item.name, icon='FREEZE' if item.frozen else 'FILE_BLEND')
+        sub = row.row(align=True)
+        sub.alignment = 'RIGHT'
+        if item.author:
+            sub.label(text=item.author)
+        sub.label(text=f"v{item.version}")
+
+class HYPERFY_PT_hyp_library_panel(Panel):
+    """Browse .hyp files from the metadata index without importing them"""
+    bl_label = "HYP Library"
+    bl_idname = "HYPERFY_PT_hyp_library"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Hyperfy'
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.hyperfy_props
+        
+        # Library folder and scan
+        box = layout.box()
+        col = box.column(align=True)
+        col.prop(props, "hyp_library_path", text="")
+        row = col.row(align=True)
+        row.operator("object.scan_hyp_library", text="SCAN", icon='FILE_REFRESH')
+        row.operator("object.search_hyp_library", text="", icon='VIEWZOOM')
+        
+        # Search and results
+        box = layout.box()
+        box.prop(props, "hyp_library_search", text="", icon='VIEWZOOM')
+        box.template_list("HYPERFY_UL_hyp_library", "", props, "hyp_library_results",
+                          props, "hyp_library_index", rows=6)
+        
+        # Details of the selected entry, straight from the index
+        if 0 <= props.hyp_library_index < len(props.hyp_library_results):
+            entry = props.hyp_library_results[props.hyp_library_index]
+            details = box.column(align=True)
+            details.scale_y = 0.8
+            if entry.error:
+                details.label(text=entry.error, icon='ERROR')
+            else:
+                details.label(text=f"{entry.asset_count} assets, {entry.size_mb:.1f} MB", icon='INFO')
+                if entry.frozen:
+                    details.label(text="Frozen", icon='FREEZE')
+            
+            row = box.row(align=True)
+            row.scale_y = 1.5
+            row.operator("object.import_hyp_library_entry", text="IMPORT", icon='IMPORT')
@@ -1,15 +1,6 @@
 import bpy
 from bpy.types import Panel
 
-def get_rigidbody_parent(obj):
-    """Get the rigidbody parent of an object in the hierarchy"""
-    current = obj
-    while current:
-        if current.get("node") == "rigidbody":
-            return current
-        current = current.parent
-    return None
-
 class HYPERFY_PT_hyp_panel(Panel):
     """HYP File Panel for Hyperfy Tools"""
     bl_label = "HYP Files"
@@ -30,6 +21,15 @@ class HYPERFY_PT_hyp_panel(Panel):
         row = box.row(align=True)
         row.scale_y = 1.5
         row.operator("object.import_hyp", text="IMPORT HYP", icon='IMPORT')
+        row.operator("object.import_hyp_batch", text="", icon='FILE_FOLDER')
+        
+        row = box.row(align=True)
+        row.operator("object.import_hyp", text="Inspect", icon='VIEWZOOM').mode = 'INSPECT'
+        row.operator("object.import_hyp", text="Script Only", icon='TEXT').mode = 'SCRIPT'
+        
+        row = box.row(align=True)
+        row.scale_y = 1.5
+        row.operator("object.export_hyp", text="EXPORT HYP", icon='EXPORT')
         
         # Metadata section
         meta_box = layout.box()
@@ -1,14 +1,7 @@
 import bpy
 from bpy.types import Panel
-
-def get_rigidbody_parent(obj):
-    """Get the rigidbody parent of an object in the hierarchy"""
-    current = obj
-    while current:
-        if current.get("node") == "rigidbody":
-            return current
-        current = current.parent
-    return None
+from ..utils.node_index import rigidbody_of
+from ..utils.panel_cache import rig_type, rigidbody_summary
 
 class HYPERFY_PT_main_panel(Panel):
     """Main Panel for Hyperfy Tools"""
@@ -35,22 +28,12 @@ class HYPERFY_PT_main_panel(Panel):
             row = col.row(align=True)
             row.scale_y = 1.5
             
-            # Detect rig type and show appropriate conversion
-            is_mixamo = False
-            is_vrm = False
-            
-            if active_obj and active_obj.type == 'ARMATURE':
-                for bone in active_obj.data.bones:
-                    if "mixamo" in bone.name.lower():
-                        is_mixamo = True
-                        break
-                    elif any(key in bone.name.lower() for key in ["hips", "spine", "chest", "neck", "head"]):
-                        is_vrm = True
-                        break
+            # Detect rig type (cached until the armature changes) and show appropriate conversion
+            detected = rig_type(active_obj)
             
-            if is_mixamo:
+            if detected == 'MIXAMO':
                 row.operator("object.mixamo_to_vrm", text="Convert to VRM", icon='POSE_HLT')
-            elif is_vrm:
+            elif detected == 'VRM':
                 row.operator("object.vrm_to_mixamo", text="Convert to Mixamo", icon='POSE_HLT')
             else:
                 row.operator("object.detect_and_convert_rig", text="Convert Rig", icon='POSE_HLT')
@@ -64,12 +47,7 @@ class HYPERFY_PT_main_panel(Panel):
             return
         
         # Get rigidbody object (either selected or parent)
-        rigidbody_obj = None
-        if active_obj:
-            if active_obj.get("node") == "rigidbody":
-                rigidbody_obj = active_obj
-            else:
-                rigidbody_obj = get_rigidbody_parent(active_obj)
+        rigidbody_obj = rigidbody_of(active_obj)
         
         # Draw rigidbody details if found
         if rigidbody_obj:
@@ -92,12 +70,8 @@ class HYPERFY_PT_main_panel(Panel):
                 row = col.row(align=True)
                 row.prop(rigidbody_obj, '["mass"]', text="Mass")
             
-            # Find collider in children
-            collider_obj = None
-            for child in rigidbody_obj.children:
-                if child.get("node") == "collider":
-                    collider_obj = child
-                    break
+            # Collider and LOD meshes in LOD order, cached until the hierarchy changes
+            collider_obj, lod_empty, lod_meshes = rigidbody_summary(rigidbody_obj, context.scene)
             
             # Show collider properties if found
             if collider_obj:
@@ -108,17 +82,6 @@ class HYPERFY_PT_main_panel(Panel):
                 row.prop(collider_obj, '["convex"]', text="Convex")
                 row.prop(collider_obj, '["trigger"]', text="Trigger")
             
-            # Find LOD empty and meshes
-            lod_empty = None
-            lod_meshes = []
-            for child in rigidbody_obj.children:
-                if child.get("node") == "lod":
-                    lod_empty = child
-                    # Get LOD meshes sorted by name
-                    lod_meshes = sorted([mesh for mesh in child.children if mesh.get("node") == "Mesh"],
-                                      key=lambda x: x.name)
-                    break
-            
             # Show LOD properties if found
             if lod_meshes:
                 lod_box = rb_box.box()
@@ -129,6 +92,12 @@ class HYPERFY_PT_main_panel(Panel):
                     row = col.row(align=True)
                     row.label(text=mesh.name)
                     row.prop(mesh, '["maxDistance"]', text="Distance")
+                
+                # Error based distances
+                row = lod_box.row(align=True)
+                row.prop(props, "lod_screen_error", text="Error px")
+                row.prop(props, "lod_fov", text="FOV")
+                lod_box.operator("object.calibrate_lods", text="Calibrate Distances", icon='DRIVER_DISTANCE')
             
             # Snap Points section
             snap_box = rb_box.box()
@@ -171,17 +140,28 @@ class HYPERFY_PT_main_panel(Panel):
             # Collider type
             col.prop(props, "collider_type", text="Type")
             
+            # Fitted or fixed size
+            if props.collider_type in {'box', 'sphere'}:
+                col.prop(props, "fit_collider", text="Fit to Mesh")
+            
             # Box dimensions
-            if props.collider_type == 'box':
+            if props.collider_type == 'box' and not props.fit_collider:
                 box_col = col.column(align=True)
                 box_col.prop(props, "box_width", text="Width")
                 box_col.prop(props, "box_height", text="Height")
                 box_col.prop(props, "box_depth", text="Depth")
             
             # Sphere radius
-            elif props.collider_type == 'sphere':
+            elif props.collider_type == 'sphere' and not props.fit_collider:
                 col.prop(props, "sphere_radius", text="Radius")
             
+            # Convex decomposition budgets
+            elif props.collider_type == 'convex':
+                decomp_col = col.column(align=True)
+                decomp_col.prop(props, "decomposition_max_hulls", text="Max Hulls")
+                decomp_col.prop(props, "decomposition_max_vertices", text="Max Vertices")
+                decomp_col.prop(props, "decomposition_resolution", text="Resolution")
+            
             # Collider properties
             prop_col = col.column(align=True)
             row = prop_col.row(align=True)
@@ -195,6 +175,18 @@ class HYPERFY_PT_main_panel(Panel):
             row = col.row(align=True)
             row.prop(props, "cast_shadow", text="Cast Shadow")
             row.prop(props, "receive_shadow", text="Receive Shadow")
+            col.prop(props, "share_mesh_data", text="Share Mesh Data")
+            
+            # LOD generation
+            lod_row = mesh_box.row(align=True)
+            lod_row.prop(props, "lod_targets", text="LODs")
+            lod_row.operator("object.generate_lods", text="", icon='MOD_DECIM')
+            col = mesh_box.column(align=True)
+            col.prop(props, "lod_error_distances", text="Error Based Distances")
+            if props.lod_error_distances:
+                row = col.row(align=True)
+                row.prop(props, "lod_screen_error", text="Error px")
+                row.prop(props, "lod_fov", text="FOV")
             
             # Create button
             create_row = main_box.row(align=True)
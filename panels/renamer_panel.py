@@ -1,5 +1,16 @@
 import bpy
 
+class HYPERFY_UL_rename_preview(bpy.types.UIList):
+    """Planned renames, drawn only for the visible rows"""
+    
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.alert = bool(item.conflict)
+        row.label(text=item.old_name)
+        row.label(text=item.new_name, icon='ERROR' if item.conflict else 'FORWARD')
+        if item.conflict:
+            row.label(text=item.conflict)
+
 class HYPERFY_PT_renamer_panel(bpy.types.Panel):
     """Object Renamer Panel"""
     bl_label = "Renamer"
@@ -24,9 +35,20 @@ class HYPERFY_PT_renamer_panel(bpy.types.Panel):
         
         if scene.use_find_replace:
             row = box.row()
-            row.prop(scene, "find_text", text="Find")
-            row = box.row()
-            row.prop(scene, "replace_text", text="Replace")
+            row.prop(scene, "find_mode", expand=True)
+            
+            if scene.find_mode == 'TEMPLATE':
+                row = box.row()
+                row.prop(scene, "rename_template", text="Template")
+                col = box.column(align=True)
+                col.scale_y = 0.8
+                col.label(text="{name} {base} {collection} {node}", icon='INFO')
+                col.label(text="{lod} {tag} {index}", icon='BLANK1')
+            else:
+                row = box.row()
+                row.prop(scene, "find_text", text="Pattern" if scene.find_mode == 'REGEX' else "Find")
+                row = box.row()
+                row.prop(scene, "replace_text", text="Replace")
         
         # Prefix
         box = layout.box()
@@ -76,6 +98,23 @@ class HYPERFY_PT_renamer_panel(bpy.types.Panel):
             row.prop(scene, "numbering_padding", text="Padding")
             row.prop(scene, "numbering_separator", text="Separator")
         
+        # Preview of the planned names
+        box = layout.box()
+        row = box.row(align=True)
+        row.operator("object.preview_rename", icon='VIEWZOOM')
+        row.prop(scene, "rename_live_preview", text="", icon='FILE_REFRESH')
+        if scene.rename_preview_error:
+            row = box.row()
+            row.alert = True
+            row.label(text=scene.rename_preview_error, icon='ERROR')
+        elif scene.rename_preview:
+            if scene.rename_preview_conflicts:
+                row = box.row()
+                row.alert = True
+                row.label(text=f"{scene.rename_preview_conflicts} conflicts", icon='ERROR')
+            box.template_list("HYPERFY_UL_rename_preview", "", scene, "rename_preview",
+                              scene, "rename_preview_index", rows=6)
+        
         # Execute buttons
         box = layout.box()
         row = box.row()
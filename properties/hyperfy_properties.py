@@ -1,4 +1,5 @@
 import bpy
+import math
 from bpy.types import PropertyGroup
 from bpy.props import (
     EnumProperty, 
@@ -9,27 +10,55 @@ from bpy.props import (
     StringProperty,
     FloatVectorProperty
 )
+from ..utils.bulk_utils import BULK_MODE_ITEMS, BULK_PROPERTY_ITEMS, BULK_SOURCE_ITEMS
+from ..utils.library_utils import refresh_library_results
+from ..utils.node_index import rigidbody_of
 
 def update_rigidbody_type(self, context):
-    active_obj = context.active_object
-    if active_obj:
-        # If we're looking at a rigidbody object directly
-        if active_obj.get("node") == "rigidbody":
-            active_obj["type"] = self.physics_type
-        else:
-            # Check if we're looking at a child of a rigidbody
-            current = active_obj
-            while current:
-                if current.get("node") == "rigidbody":
-                    current["type"] = self.physics_type
-                    break
-                current = current.parent
+    # The active object or the rigidbody it belongs to
+    rigidbody = rigidbody_of(context.active_object)
+    if rigidbody:
+        rigidbody["type"] = self.physics_type
 
 def update_rigidbody_mass(self, context):
     active_obj = context.active_object
     if active_obj and active_obj.get("node") == "rigidbody":
         active_obj["mass"] = self.mass
 
+def update_library_search(self, context):
+    refresh_library_results(self)
+
+class HypLibraryEntry(PropertyGroup):
+    """A .hyp file listed from the library index"""
+    path: StringProperty(
+        name="Path",
+        subtype='FILE_PATH'
+    )
+    
+    author: StringProperty(
+        name="Author"
+    )
+    
+    version: IntProperty(
+        name="Version"
+    )
+    
+    frozen: BoolProperty(
+        name="Frozen"
+    )
+    
+    asset_count: IntProperty(
+        name="Assets"
+    )
+    
+    size_mb: FloatProperty(
+        name="Size (MB)"
+    )
+    
+    error: StringProperty(
+        name="Error"
+    )
+
 class HyperfyProperties(PropertyGroup):
     physics_type: EnumProperty(
         items=[
@@ -69,17 +98,114 @@ class HyperfyProperties(PropertyGroup):
         default=True
     )
     
+    # Bulk edit settings, passed to object.bulk_set_property by the panel
+    bulk_property: EnumProperty(
+        name="Property",
+        items=BULK_PROPERTY_ITEMS,
+        default='castShadow'
+    )
+    
+    bulk_source: EnumProperty(
+        name="Targets",
+        items=BULK_SOURCE_ITEMS,
+        default='SELECTED'
+    )
+    
+    bulk_mode: EnumProperty(
+        name="Mode",
+        items=BULK_MODE_ITEMS,
+        default='SET'
+    )
+    
+    bulk_value: BoolProperty(
+        name="Value",
+        default=True
+    )
+    
+    bulk_mass: FloatProperty(
+        name="Mass",
+        default=1.0,
+        min=0.0
+    )
+    
+    bulk_type: EnumProperty(
+        items=[
+            ('dynamic', 'Dynamic', 'Object is affected by physics'),
+            ('static', 'Static', 'Object is immovable'),
+            ('kinematic', 'Kinematic', 'Object is controlled by animation')
+        ],
+        default='dynamic',
+        name="Type"
+    )
+    
+    lod_targets: StringProperty(
+        name="LOD Targets",
+        description="Comma separated targets for generated LOD1..LODn: ratios up to 1, or triangle counts above 1",
+        default="0.5, 0.25, 0.1"
+    )
+    
+    lod_error_distances: BoolProperty(
+        name="Error Based Distances",
+        description="Set LOD maxDistance from each LOD's measured deviation and the object size instead of 25m steps",
+        default=False
+    )
+    
+    lod_screen_error: FloatProperty(
+        name="Screen Error",
+        description="Largest LOD deviation allowed on screen, in pixels",
+        default=2.0,
+        min=0.1,
+        soft_max=20.0
+    )
+    
+    lod_fov: FloatProperty(
+        name="Field of View",
+        description="Vertical camera field of view used to project LOD errors",
+        subtype='ANGLE',
+        default=math.radians(70.0),
+        min=math.radians(10.0),
+        max=math.radians(170.0)
+    )
+    
+    lod_viewport_height: IntProperty(
+        name="Viewport Height",
+        description="Vertical screen resolution used to project LOD errors, in pixels",
+        default=1080,
+        min=240
+    )
+    
+    triangle_budget: IntProperty(
+        name="Triangle Budget",
+        description="Triangles allowed for all rigidbodies at their finest LOD",
+        default=500000,
+        min=1
+    )
+    
+    share_mesh_data: BoolProperty(
+        name="Share Mesh Data",
+        description="Link the original meshes for LOD meshes and geometry colliders instead of copying them",
+        default=False
+    )
+    
     collider_type: EnumProperty(
         items=[
             ('box', 'Box', 'Box collider'),
             ('sphere', 'Sphere', 'Sphere collider'),
+            ('auto', 'Auto Fit', 'Box, oriented box or sphere fitted to the mesh, whichever wastes the least volume'),
             ('simple', 'Simple', 'Simplified mesh collider'),
+            ('convex', 'Convex Parts', 'Several convex hulls approximating the mesh'),
             ('geometry', 'Geometry', 'Full geometry collider')
         ],
         default='geometry',
         name="Collider Type"
     )
     
+    fit_collider: BoolProperty(
+        name="Fit to Mesh",
+        description="Size box and sphere colliders from the mesh vertices instead of the values below",
+        default=False
+    )
+    
     box_width: FloatProperty(
         name="Width",
         default=1.0,
@@ -104,6 +230,30 @@ class HyperfyProperties(PropertyGroup):
         min=0.0
     )
     
+    decomposition_max_hulls: IntProperty(
+        name="Max Hulls",
+        description="Maximum number of convex colliders per object",
+        default=8,
+        min=1,
+        max=64
+    )
+    
+    decomposition_max_vertices: IntProperty(
+        name="Max Vertices",
+        description="Maximum number of vertices per convex collider",
+        default=32,
+        min=4,
+        max=255
+    )
+    
+    decomposition_resolution: IntProperty(
+        name="Resolution",
+        description="Voxels along the longest side of the mesh, higher follows the shape closer but is slower",
+        default=32,
+        min=8,
+        max=128
+    )
+    
     # Hyperfy .hyp file properties
     hyp_name: StringProperty(
         name="Name",
@@ -178,4 +328,30 @@ class HyperfyProperties(PropertyGroup):
         name="Modified",
         description="Last modified date",
         default=""
-    ) 
\ No newline at end of file
+    )
+    
+    # .hyp library index
+    hyp_library_path: StringProperty(
+        name="Library",
+        description="Folder of .hyp files to index",
+        default="",
+        subtype='DIR_PATH',
+        update=update_library_search
+    )
+    
+    hyp_library_search: StringProperty(
+        name="Search",
+        description="Filter indexed .hyp files by name, author or ID",
+        default="",
+        options={'TEXTEDIT_UPDATE'},
+        update=update_library_search
+    )
+    
+    hyp_library_results: CollectionProperty(
+        type=HypLibraryEntry
+    )
+    
+    hyp_library_index: IntProperty(
+        name="Selected",
+        default=0
+    )
@@ -1,9 +1,33 @@
 from . import rigidbody_utils
 from . import collider_utils
 from . import lod_utils
+from . import hyp_utils
+from . import hyp_index
+from . import library_utils
+from . import export_utils
+from . import fit_utils
+from . import decomposition_utils
+from . import mesh_cache
+from . import budget_utils
+from . import node_index
+from . import panel_cache
+from . import bulk_utils
+from . import rename_utils
 
 __all__ = [
     'rigidbody_utils',
     'collider_utils',
-    'lod_utils'
+    'lod_utils',
+    'hyp_utils',
+    'hyp_index',
+    'library_utils',
+    'export_utils',
+    'fit_utils',
+    'decomposition_utils',
+    'mesh_cache',
+    'budget_utils',
+    'node_index',
+    'panel_cache',
+    'bulk_utils',
+    'rename_utils'
 ] 
\ No newline at end of file
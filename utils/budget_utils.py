@@ -0,0 +1,205 @@
+import heapq
+from contextlib import contextmanager
+import bpy
+from .lod_utils import generate_lod_meshes, lod_deviation, switch_distance, triangle_count
+from .mesh_cache import mesh_hash
+
+# Decimation ratios the solver chooses from, finest first
+BUDGET_RATIOS = (1.0, 0.5, 0.25, 0.125, 0.0625)
+
+# Custom property holding a mesh's cached error curve
+CURVE_PROPERTY = "hyperfy_error_curve"
+
+# Custom property pointing a decimated object at its original mesh
+SOURCE_PROPERTY = "hyperfy_budget_source"
+
+REPORT_NAME = "Hyperfy LOD Budget"
+
+def budget_source(obj):
+    """Get the mesh an object had before any budget was applied to it"""
+    source = obj.get(SOURCE_PROPERTY)
+    return source if isinstance(source, bpy.types.Mesh) else obj.data
+
+@contextmanager
+def _source_meshes(objects):
+    """Temporarily point objects at their original meshes"""
+    swapped = []
+    try:
+        for obj in objects:
+            source = budget_source(obj)
+            if source != obj.data:
+                swapped.append((obj, obj.data))
+                obj.data = source
+        yield
+    finally:
+        for obj, mesh in swapped:
+            obj.data = mesh
+
+def _cached_curve(mesh):
+    """Get the cached error curve of a mesh if it is still valid"""
+    curve = mesh.get(CURVE_PROPERTY)
+    if curve is None:
+        return None
+    curve = curve.to_dict()
+    if list(curve.get('ratios', ())) != list(BUDGET_RATIOS) or curve.get('hash') != mesh_hash(mesh):
+        return None
+    return list(zip(curve['triangles'], curve['errors']))
+
+def error_curves(objects, context):
+    """Get (triangles, error) per BUDGET_RATIOS step for each object's mesh
+
+    Curves describe the original mesh (budget_source), so they do not
+    change once a budget was applied. They are computed once per unique
+    mesh, by decimating it to every ratio and measuring the deviation, and
+    cached on the mesh in a custom property together with its hash, so
+    later runs only pay for new or edited meshes. Returns a dict keyed by
+    original mesh pointer.
+    """
+    curves = {}
+    missing = {}
+    for obj in objects:
+        source = budget_source(obj)
+        key = source.as_pointer()
+        if key in curves or key in missing:
+            continue
+        curve = _cached_curve(source)
+        if curve is None:
+            missing[key] = obj
+        else:
+            curves[key] = curve
+
+    if missing:
+        objects = list(missing.values())
+        with _source_meshes(objects):
+            results = generate_lod_meshes(objects, BUDGET_RATIOS[1:], context)
+        for obj, levels in zip(objects, results):
+            source = budget_source(obj)
+            triangles = [triangle_count(source)]
+            errors = [0.0]
+            for mesh, _ in levels:
+                triangles.append(triangle_count(mesh))
+                errors.append(lod_deviation(mesh, source))
+                bpy.data.meshes.remove(mesh)
+
+            source[CURVE_PROPERTY] = {
+                'hash': mesh_hash(source),
+                'ratios': list(BUDGET_RATIOS),
+                'triangles': triangles,
+                'errors': errors,
+            }
+            curves[source.as_pointer()] = list(zip(triangles, errors))
+
+    return curves
+
+def solve_budget(curves, budget):
+    """Pick one level per item so the total triangles fit the budget
+
+    curves is a list of [(triangles, error), ...] per item, finest level
+    first. Every item starts at its coarsest level; then the upgrade with
+    the largest error reduction per added triangle is taken until nothing
+    more fits. Returns (levels, total_triangles).
+    """
+    levels = [len(curve) - 1 for curve in curves]
+    total = sum(curve[-1][0] for curve in curves)
+
+    def push_upgrade(heap, item):
+        level = levels[item]
+        if level == 0:
+            return
+        curve = curves[item]
+        added = curve[level - 1][0] - curve[level][0]
+        gain = curve[level][1] - curve[level - 1][1]
+        # Free upgrades go first
+        benefit = gain / added if added > 0 else float('inf')
+        heapq.heappush(heap, (-benefit, item, level, max(added, 0)))
+
+    heap = []
+    for item in range(len(curves)):
+        push_upgrade(heap, item)
+
+    while heap:
+        _, item, level, added = heapq.heappop(heap)
+        if levels[item] != level or total + added > budget:
+            continue
+        levels[item] = level - 1
+        total += added
+        push_upgrade(heap, item)
+
+    return levels, total
+
+def count_draw_calls(lod_meshes):
+    """Count draw calls of the finest LOD, one per material slot"""
+    if not lod_meshes:
+        return 0
+    return max(1, len(lod_meshes[0].material_slots))
+
+def write_budget_report(rows, summary):
+    """Write the solver result to the report Text datablock
+
+    rows are dicts with name, ratio, triangles, source, error and distance.
+    """
+    text = bpy.data.texts.get(REPORT_NAME) or bpy.data.texts.new(REPORT_NAME)
+    lines = summary + [
+        "",
+        f"{'Rigidbody':<40} {'Ratio':>7} {'Tris':>10} {'Source':>10} {'Error m':>10} {'Invisible at':>13}",
+    ]
+    for row in sorted(rows, key=lambda row: row['error'], reverse=True):
+        lines.append(
+            f"{row['name'][:40]:<40} {row['ratio']:>7.4g} {row['triangles']:>10} "
+            f"{row['source']:>10} {row['error']:>10.4f} {row['distance']:>12.1f}m"
+        )
+    text.from_string("\n".join(lines) + "\n")
+    return text
+
+def apply_budget_ratios(choices, context):
+    """Point the chosen objects at decimated copies of their original meshes
+
+    choices maps LOD mesh objects to ratios. Decimation always starts from
+    the original mesh, which stays referenced from the object's
+    SOURCE_PROPERTY, so applying again never decimates twice and a ratio of
+    1 restores the original. Each unique mesh is decimated once per ratio,
+    in one depsgraph update per ratio, and objects sharing a mesh share the
+    decimated mesh as well. Returns the number of changed objects.
+    """
+    changed = 0
+    groups = {}
+    for obj, ratio in choices.items():
+        source = budget_source(obj)
+        if ratio >= 1.0:
+            if source != obj.data:
+                obj.data = source
+                changed += 1
+            if SOURCE_PROPERTY in obj:
+                del obj[SOURCE_PROPERTY]
+            continue
+        groups.setdefault(ratio, {}).setdefault(source.as_pointer(), []).append(obj)
+
+    for ratio, meshes in groups.items():
+        users = list(meshes.values())
+        sources = [objects[0] for objects in users]
+        with _source_meshes(sources):
+            results = generate_lod_meshes(sources, [ratio], context)
+        for objects, levels in zip(users, results):
+            mesh = levels[0][0]
+            for obj in objects:
+                source = budget_source(obj)
+                obj[SOURCE_PROPERTY] = source
+                obj.data = mesh
+                changed += 1
+    return changed
+
+def budget_distance(error, props):
+    """Distance beyond which an object's simplification error is invisible"""
+    return switch_distance(error, props.lod_screen_error, props.lod_fov, props.lod_viewport_height)
+
+__all__ = [
+    'BUDGET_RATIOS',
+    'budget_source',
+    'REPORT_NAME',
+    'error_curves',
+    'solve_budget',
+    'count_draw_calls',
+    'write_budget_report',
+    'apply_budget_ratios',
+    'budget_distance'
+]
@@ -0,0 +1,79 @@
+from .node_index import nodes_of_type, rigidbody_of
+
+# Editable custom property -> (node type it lives on, value kind, default when unset)
+BULK_PROPERTIES = {
+    'mass': ('rigidbody', 'FLOAT', 1.0),
+    'type': ('rigidbody', 'TYPE', 'dynamic'),
+    'convex': ('collider', 'BOOL', False),
+    'trigger': ('collider', 'BOOL', False),
+    'castShadow': ('Mesh', 'BOOL', True),
+    'receiveShadow': ('Mesh', 'BOOL', True),
+}
+
+BULK_PROPERTY_ITEMS = [
+    ('mass', 'Mass', 'Rigidbody mass'),
+    ('type', 'Type', 'Rigidbody physics type'),
+    ('convex', 'Convex', 'Collider convex flag'),
+    ('trigger', 'Trigger', 'Collider trigger flag'),
+    ('castShadow', 'Cast Shadow', 'LOD mesh casts shadows'),
+    ('receiveShadow', 'Receive Shadow', 'LOD mesh receives shadows'),
+]
+
+BULK_SOURCE_ITEMS = [
+    ('SELECTED', 'Selected', 'Selected nodes and the nodes of selected rigidbodies'),
+    ('COLLECTION', 'Collection', 'Nodes in the active collection and its children'),
+    ('SCENE', 'Scene', 'Every node in the scene'),
+]
+
+BULK_MODE_ITEMS = [
+    ('SET', 'Set', 'Set the property to the given value'),
+    ('TOGGLE', 'Toggle', 'Invert the property on every target'),
+]
+
+
+def bulk_targets(context, property_name, source):
+    """Get the objects a bulk edit of property_name applies to
+
+    Targets are the nodes of the property's node type, found through the
+    node index, filtered by source.
+    """
+    node_type = BULK_PROPERTIES[property_name][0]
+    nodes = nodes_of_type(context.scene, node_type)
+    if source == 'SCENE':
+        return nodes
+
+    if source == 'COLLECTION':
+        names = {obj.name for obj in context.collection.all_objects}
+        return [obj for obj in nodes if obj.name in names]
+
+    selected = set(context.selected_objects)
+    rigidbodies = {rigidbody_of(obj, context.scene) for obj in selected} - {None}
+    return [obj for obj in nodes if obj in selected or rigidbody_of(obj, context.scene) in rigidbodies]
+
+
+def bulk_apply(objects, property_name, mode, value=None, dry_run=False):
+    """Set or toggle a custom property on objects, returning how many change
+
+    With dry_run nothing is written, so callers can preview the count.
+    """
+    default = BULK_PROPERTIES[property_name][2]
+    changed = 0
+    for obj in objects:
+        current = obj.get(property_name, default)
+        new = (not current) if mode == 'TOGGLE' else value
+        if current == new and property_name in obj:
+            continue
+        changed += 1
+        if not dry_run:
+            obj[property_name] = new
+    return changed
+
+
+__all__ = [
+    'BULK_PROPERTIES',
+    'BULK_PROPERTY_ITEMS',
+    'BULK_SOURCE_ITEMS',
+    'BULK_MODE_ITEMS',
+    'bulk_targets',
+    'bulk_apply'
+]
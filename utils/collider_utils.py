@@ -1,4 +1,15 @@
 import bpy
+import bmesh
+import numpy as np
+from mathutils import Matrix, Vector
+from .fit_utils import fit_collider_shape, mesh_points
+from .decomposition_utils import decompose, mesh_triangles
+
+# Flat convex parts are padded to this thickness so their hull is a solid, in meters
+MIN_HULL_THICKNESS = 0.01
+
+# Parts narrower than this in their second direction are lines or points
+MIN_HULL_WIDTH = 1e-6
 
 def setup_collider(obj, context):
     """Setup common collider properties"""
@@ -8,8 +19,9 @@ def setup_collider(obj, context):
     obj.name = "Collider"
     obj.display_type = 'WIRE'
     
-    # Only clear materials if object is mesh
-    if obj.type == 'MESH':
+    # Only clear materials if object is mesh and the mesh is not shared
+    # with visible LOD meshes
+    if obj.type == 'MESH' and obj.data.users <= 1:
         obj.data.materials.clear()
     
     # Add only essential collider properties
@@ -28,12 +40,24 @@ def is_collider(obj):
     """Check if object is already a collider"""
     return obj.get("node") == "collider" and obj.display_type == 'WIRE'
 
+def _new_primitive_collider(name, build):
+    """Create an unlinked collider object from a bmesh builder"""
+    bm = bmesh.new()
+    build(bm)
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return bpy.data.objects.new(name, mesh)
+
 def create_box_collider(context):
-    """Create a box collider"""
+    """Create a box collider
+    
+    The object is not linked to any collection, the caller links it.
+    """
     props = context.scene.hyperfy_props
     
-    bpy.ops.mesh.primitive_cube_add(size=2.0, location=(0, 0, 0))
-    collider = context.active_object
+    collider = _new_primitive_collider(
+        "Collider", lambda bm: bmesh.ops.create_cube(bm, size=2.0))
     setup_collider(collider, context)
     
     # Set box size using props
@@ -44,50 +68,187 @@ def create_box_collider(context):
     return collider
 
 def create_sphere_collider(context):
-    """Create a sphere collider"""
+    """Create a sphere collider
+    
+    The object is not linked to any collection, the caller links it.
+    """
     props = context.scene.hyperfy_props
     
-    bpy.ops.mesh.primitive_uv_sphere_add(
-        radius=props.sphere_radius,
-        segments=32,
-        ring_count=16,
-        location=(0, 0, 0)
-    )
-    collider = context.active_object
+    collider = _new_primitive_collider(
+        "Collider", lambda bm: bmesh.ops.create_uvsphere(
+            bm, u_segments=32, v_segments=16, radius=props.sphere_radius))
     setup_collider(collider, context)
     return collider
 
-def create_simple_collider(obj, context):
-    """Create a simplified collision mesh"""
-    collider = obj.copy()
-    collider.data = obj.data.copy()
-    context.scene.collection.objects.link(collider)
-    collider.location = (0, 0, 0)
+def create_fitted_collider(obj, context, shape='auto'):
+    """Create a box, oriented box or sphere collider fitted to a mesh
+    
+    Vertex positions are read with foreach_get and fitted with NumPy, see
+    fit_utils.fit_collider_shape. The primitive is baked into the mesh in
+    the object's local space. Falls back to the sized primitives for meshes
+    without vertices. The object is not linked to any collection.
+    """
+    if obj.type != 'MESH' or not len(obj.data.vertices):
+        if shape == 'sphere':
+            return create_sphere_collider(context)
+        return create_box_collider(context)
+    
+    fit = fit_collider_shape(mesh_points(obj.data), shape)
+    center = Vector(fit['center'])
+    
+    if fit['shape'] == 'sphere':
+        matrix = Matrix.Translation(center)
+        build = lambda bm: bmesh.ops.create_uvsphere(
+            bm, u_segments=32, v_segments=16, radius=fit['radius'], matrix=matrix)
+    else:
+        rotation = Matrix([list(row) for row in fit['rotation']]).to_4x4()
+        scale = Matrix.Diagonal(Vector(fit['half_extents']).to_4d())
+        matrix = Matrix.Translation(center) @ rotation @ scale
+        build = lambda bm: bmesh.ops.create_cube(bm, size=2.0, matrix=matrix)
+    
+    collider = _new_primitive_collider("Collider", build)
     setup_collider(collider, context)
+    return collider
+
+def solid_hull_points(points, thickness=MIN_HULL_THICKNESS):
+    """Make sure the convex hull of points encloses a volume
     
-    # First use voxel remesh to create a solid mesh
-    remesh = collider.modifiers.new(name="Remesh", type='REMESH')
-    remesh.mode = 'VOXEL'
-    remesh.voxel_size = max(collider.dimensions) / 4
+    Flat point sets (planes, decals, thin slabs) are copied to both sides
+    of their plane so the hull is at least thickness deep. Returns None
+    for points on a line or a single point, which have no usable hull.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 3:
+        return None
+    centered = points - points.mean(axis=0)
+    axes = np.linalg.svd(centered, full_matrices=False)[2]
+    if np.ptp(centered @ axes[1]) <= MIN_HULL_WIDTH:
+        return None
+    depth = np.ptp(centered @ axes[2])
+    if len(points) >= 4 and depth >= thickness:
+        return points
+    offset = axes[2] * (thickness / 2)
+    return np.vstack((points + offset, points - offset))
+
+def create_convex_colliders(obj, context):
+    """Create several convex colliders approximating a concave mesh
     
-    # Apply remesh
-    context.view_layer.objects.active = collider
-    bpy.ops.object.modifier_apply(modifier="Remesh")
+    The mesh is decomposed with decomposition_utils.decompose using the
+    hull count, vertex count and resolution budgets from the scene props;
+    each part becomes a convex hull built with bmesh.ops.convex_hull.
+    Flat parts are padded with solid_hull_points and parts without any
+    area are skipped. The colliders are flagged convex and not linked to
+    any collection.
+    """
+    props = context.scene.hyperfy_props
+    points, triangles = mesh_triangles(obj.data)
+    parts = decompose(
+        points,
+        triangles,
+        max_hulls=props.decomposition_max_hulls,
+        max_vertices=props.decomposition_max_vertices,
+        resolution=props.decomposition_resolution
+    )
     
-    # Add decimate modifier
-    decimate = collider.modifiers.new(name="Decimate", type='DECIMATE')
-    decimate.decimate_type = 'DISSOLVE'
-    decimate.angle_limit = 0.5
+    colliders = []
+    for part in parts:
+        part = solid_hull_points(part)
+        if part is None:
+            continue
+        bm = bmesh.new()
+        for co in part.tolist():
+            bm.verts.new(co)
+        result = bmesh.ops.convex_hull(bm, input=bm.verts[:])
+        bmesh.ops.delete(bm, geom=result['geom_interior'] + result['geom_unused'], context='VERTS')
+        if len(bm.faces) < 4:
+            # Degenerate despite the padding
+            bm.free()
+            continue
+        mesh = bpy.data.meshes.new(f"{obj.data.name}_hull")
+        bm.to_mesh(mesh)
+        bm.free()
+        
+        collider = bpy.data.objects.new("Collider", mesh)
+        setup_collider(collider, context)
+        collider["convex"] = True
+        colliders.append(collider)
+    
+    return colliders
+
+def _clean_collider_mesh(mesh):
+    """Merge, dissolve and strip loose geometry from a collider mesh"""
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
     
-    # Apply decimate
-    bpy.ops.object.modifier_apply(modifier="Decimate")
+    bmesh.ops.dissolve_limit(bm, angle_limit=0.5, verts=bm.verts[:], edges=bm.edges[:])
+    bmesh.ops.remove_doubles(bm, verts=bm.verts[:], dist=0.05)
+    bmesh.ops.dissolve_degenerate(bm, dist=0.0001, edges=bm.edges[:])
+    
+    # Delete loose edges, then loose verts
+    loose_edges = [e for e in bm.edges if not e.link_faces]
+    if loose_edges:
+        bmesh.ops.delete(bm, geom=loose_edges, context='EDGES')
+    loose_verts = [v for v in bm.verts if not v.link_edges]
+    if loose_verts:
+        bmesh.ops.delete(bm, geom=loose_verts, context='VERTS')
+    
+    bm.to_mesh(mesh)
+    bm.free()
+
+def simple_voxel_size(obj):
+    """Voxel size of a simple collider, from the unscaled extents of obj
     
-    # Clean up mesh
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.mesh.remove_doubles(threshold=0.05)
-    bpy.ops.mesh.dissolve_degenerate()
-    bpy.ops.mesh.delete_loose()
-    bpy.ops.object.mode_set(mode='OBJECT')
+    The remesh runs in mesh space, so object scale must not enter the size.
+    """
+    if obj.type == 'MESH' and len(obj.data.vertices):
+        points = mesh_points(obj.data)
+        extent = float((points.max(axis=0) - points.min(axis=0)).max())
+    else:
+        extent = max((d / abs(s) if s else 0.0) for d, s in zip(obj.dimensions, obj.scale))
+    return max(extent / 4, 0.0001)
+
+def create_simple_colliders(objects, context):
+    """Create simplified collision meshes for many objects at once
+    
+    Each object gets a temporary copy with a voxel remesh that is evaluated
+    through the depsgraph, so there is no modifier_apply, edit mode or
+    dependency on the active object. All copies are evaluated in one
+    depsgraph update. Returns unlinked colliders in the order of objects.
+    """
+    collection = context.scene.collection
+    temps = []
+    for obj in objects:
+        # Share the mesh, only the remesh modifier is evaluated
+        temp = obj.copy()
+        temp.modifiers.clear()
+        temp.parent = None
+        remesh = temp.modifiers.new(name="Remesh", type='REMESH')
+        remesh.mode = 'VOXEL'
+        remesh.voxel_size = simple_voxel_size(obj)
+        collection.objects.link(temp)
+        temps.append(temp)
+    
+    colliders = []
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        for obj, temp in zip(objects, temps):
+            mesh = bpy.data.meshes.new_from_object(temp.evaluated_get(depsgraph), depsgraph=depsgraph)
+            mesh.name = f"{obj.data.name}_collider"
+            _clean_collider_mesh(mesh)
+            
+            collider = bpy.data.objects.new("Collider", mesh)
+            setup_collider(collider, context)
+            colliders.append(collider)
+    finally:
+        for temp in temps:
+            bpy.data.objects.remove(temp, do_unlink=True)
+    
+    return colliders
+
+def create_simple_collider(obj, context):
+    """Create a simplified collision mesh
     
-    return collider 
\ No newline at end of file
+    The object is not linked to any collection, the caller links it.
+    """
+    return create_simple_colliders([obj], context)[0]
@@ -0,0 +1,230 @@
+import heapq
+import numpy as np
+
+# Parts whose voxels fill at least this share of their bounding box are not split
+CONCAVITY_THRESHOLD = 0.1
+
+# Cap on barycentric samples per triangle edge when voxelizing the surface
+MAX_EDGE_SAMPLES = 64
+
+NEIGHBOR_AXES = (0, 1, 2)
+
+
+def mesh_triangles(mesh):
+    """Read vertex positions and loop triangles of a mesh into arrays
+
+    Returns (points (n, 3) float64, triangles (m, 3) int).
+    """
+    points = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', points)
+    mesh.calc_loop_triangles()
+    triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', triangles)
+    return points.reshape(-1, 3).astype(np.float64), triangles.reshape(-1, 3)
+
+
+def _sample_surface(points, triangles, step):
+    """Sample triangle surfaces at roughly step spacing"""
+    v0 = points[triangles[:, 0]]
+    e1 = points[triangles[:, 1]] - v0
+    e2 = points[triangles[:, 2]] - v0
+    longest = np.maximum(np.linalg.norm(e1, axis=1),
+                         np.maximum(np.linalg.norm(e2, axis=1), np.linalg.norm(e2 - e1, axis=1)))
+    steps = np.clip(np.ceil(longest / step), 1, MAX_EDGE_SAMPLES).astype(np.int64)
+
+    samples = [points]
+    # Triangles are bucketed by sample count so each bucket is one vectorized pass
+    for n in np.unique(steps):
+        mask = steps == n
+        i, j = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing='ij')
+        keep = i + j <= n
+        a = (i[keep] / n)[None, :, None]
+        b = (j[keep] / n)[None, :, None]
+        samples.append((v0[mask][:, None] + a * e1[mask][:, None] + b * e2[mask][:, None]).reshape(-1, 3))
+    return np.concatenate(samples)
+
+
+def voxelize(points, triangles, resolution=32):
+    """Voxelize a closed triangle mesh into a solid grid
+
+    The surface is sampled into voxels, then the outside is flood filled
+    from the padded border; everything not reached is solid. Open meshes
+    leak and come back as their surface shell only. Returns (solid,
+    origin, voxel_size) where voxel index i covers
+    origin + (i - 1) * voxel_size, the grid having one empty voxel of
+    padding on each side.
+    """
+    low = points.min(axis=0)
+    high = points.max(axis=0)
+    voxel_size = max(float((high - low).max()) / resolution, 1e-6)
+    shape = tuple(int(n) + 3 for n in np.floor((high - low) / voxel_size))
+
+    surface = np.zeros(shape, dtype=bool)
+    if len(triangles):
+        samples = _sample_surface(points, triangles, voxel_size / 2)
+    else:
+        samples = points
+    index = np.floor((samples - low) / voxel_size).astype(np.int64) + 1
+    index = np.minimum(index, np.array(shape) - 2)
+    surface[index[:, 0], index[:, 1], index[:, 2]] = True
+
+    # Flood fill the outside, one voxel layer per pass
+    outside = np.zeros(shape, dtype=bool)
+    outside[0, :, :] = outside[-1, :, :] = True
+    outside[:, 0, :] = outside[:, -1, :] = True
+    outside[:, :, 0] = outside[:, :, -1] = True
+    while True:
+        grown = outside.copy()
+        for axis in NEIGHBOR_AXES:
+            grown[(slice(None),) * axis + (slice(1, None),)] |= outside[(slice(None),) * axis + (slice(None, -1),)]
+            grown[(slice(None),) * axis + (slice(None, -1),)] |= outside[(slice(None),) * axis + (slice(1, None),)]
+        grown &= ~surface
+        if np.array_equal(grown, outside):
+            break
+        outside = grown
+
+    return ~outside, low, voxel_size
+
+
+def _waste(coords):
+    """Empty voxels in the bounding box of a part"""
+    extent = coords.max(axis=0) - coords.min(axis=0) + 1
+    return int(np.prod(extent)) - len(coords)
+
+
+def _best_split(coords):
+    """Find the axis plane that leaves the least empty space in both halves
+
+    Every voxel layer along every axis is scored at once with prefix and
+    suffix bounds; equal scores prefer balanced cuts across long axes.
+    Returns (left, right) or None if the part cannot be split.
+    """
+    best = None
+    total = len(coords)
+    for axis in NEIGHBOR_AXES:
+        layer = coords[:, axis] - coords[:, axis].min()
+        count = int(layer.max()) + 1
+        if count < 2:
+            continue
+        others = [a for a in NEIGHBOR_AXES if a != axis]
+        counts = np.bincount(layer, minlength=count)
+
+        # Per layer bounds of the other two axes, empty layers stay at +-inf
+        lows = np.full((count, 2), np.inf)
+        highs = np.full((count, 2), -np.inf)
+        for k, other in enumerate(others):
+            np.minimum.at(lows[:, k], layer, coords[:, other])
+            np.maximum.at(highs[:, k], layer, coords[:, other])
+
+        index = np.arange(count)
+        filled = counts > 0
+        last = np.maximum.accumulate(np.where(filled, index, -1))
+        first = np.minimum.accumulate(np.where(filled, index, count)[::-1])[::-1]
+        prefix = (np.maximum.accumulate(highs) - np.minimum.accumulate(lows) + 1).prod(axis=1)
+        suffix = (np.maximum.accumulate(highs[::-1])[::-1]
+                  - np.minimum.accumulate(lows[::-1])[::-1] + 1).prod(axis=1)
+
+        # Split after layer k, for k in 0 .. count - 2
+        left_count = np.cumsum(counts)[:-1]
+        right_count = total - left_count
+        with np.errstate(invalid='ignore'):
+            left_box = (last[:-1] + 1) * prefix[:-1]
+            right_box = (count - first[1:]) * suffix[1:]
+            waste = left_box - left_count + right_box - right_count
+        waste[(left_count == 0) | (right_count == 0)] = np.inf
+
+        # Ties go to the most balanced cut, then to the longest axis
+        imbalance = np.abs(left_count - right_count)
+        k = int(np.lexsort((imbalance, waste))[0])
+        score = (waste[k], -count, imbalance[k])
+        if np.isfinite(waste[k]) and (best is None or score < best[0]):
+            best = (score, k, layer)
+
+    if best is None:
+        return None
+    _, k, layer = best
+    mask = layer <= k
+    return coords[mask], coords[~mask]
+
+
+def split_voxels(solid, max_hulls=8, concavity=CONCAVITY_THRESHOLD):
+    """Split solid voxels into at most max_hulls roughly convex parts
+
+    The part with the most empty space in its bounding box is split first,
+    until the budget is used or every part fills at least 1 - concavity of
+    its box. Returns a list of (n, 3) voxel index arrays.
+    """
+    coords = np.argwhere(solid)
+    if not len(coords):
+        return []
+
+    heap = [(-_waste(coords), 0, coords)]
+    done = []
+    counter = 1
+    while heap and len(heap) + len(done) < max_hulls:
+        waste, _, part = heapq.heappop(heap)
+        box = -waste + len(part)
+        if -waste <= concavity * box:
+            done.append(part)
+            continue
+        halves = _best_split(part)
+        if halves is None:
+            done.append(part)
+            continue
+        for half in halves:
+            heapq.heappush(heap, (-_waste(half), counter, half))
+            counter += 1
+
+    return done + [part for _, _, part in heap]
+
+
+def _directions(count):
+    """Spread count unit vectors evenly over the sphere"""
+    index = np.arange(count) + 0.5
+    z = 1 - 2 * index / count
+    radius = np.sqrt(1 - z * z)
+    angle = np.pi * (1 + 5 ** 0.5) * index
+    return np.column_stack((radius * np.cos(angle), radius * np.sin(angle), z))
+
+
+def hull_points(coords, origin, voxel_size, max_vertices=32, bounds=None):
+    """Pick at most max_vertices extreme corner points of a voxel part
+
+    The corners are projected onto max_vertices spread out directions and
+    only the farthest point along each is kept, so the convex hull of the
+    result stays within the vertex budget. Points are clamped to bounds
+    (low, high) when given.
+    """
+    offsets = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)])
+    corners = np.unique((coords[:, None, :] - 1 + offsets[None]).reshape(-1, 3), axis=0)
+    points = origin + corners * voxel_size
+    if bounds is not None:
+        points = np.clip(points, bounds[0], bounds[1])
+    if len(points) <= max_vertices:
+        return points
+    extreme = np.argmax(points @ _directions(max_vertices).T, axis=0)
+    return points[np.unique(extreme)]
+
+
+def decompose(points, triangles, max_hulls=8, max_vertices=32, resolution=32):
+    """Approximate convex decomposition of a triangle mesh
+
+    Voxelizes the mesh, splits the voxels with axis planes into at most
+    max_hulls parts and returns one point set per part whose convex hull
+    has at most max_vertices vertices.
+    """
+    if not len(points):
+        return []
+    solid, origin, voxel_size = voxelize(points, triangles, resolution)
+    bounds = (points.min(axis=0), points.max(axis=0))
+    return [hull_points(part, origin, voxel_size, max_vertices, bounds)
+            for part in split_voxels(solid, max_hulls)]
+
+
+__all__ = [
+    'mesh_triangles',
+    'voxelize',
+    'split_voxels',
+    'hull_points',
+    'decompose'
+]
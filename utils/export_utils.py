@@ -0,0 +1,294 @@
+import bpy
+import hashlib
+from contextlib import contextmanager
+import json
+import numpy as np
+import os
+
+# Kept free of relative imports: background export workers load this
+# module directly from its folder.
+
+MANIFEST_NAME = "hyperfy_export_manifest.json"
+MANIFEST_VERSION = 2
+
+def get_export_roots(scene):
+    """Get the visible top-level objects that Export All writes out"""
+    return [obj for obj in scene.objects if not obj.parent and obj.visible_get()]
+
+def export_root_glb(context, obj, export_dir):
+    """Export a top-level object and its children as <name>.glb at the origin"""
+    bpy.ops.object.select_all(action='DESELECT')
+    
+    # Store original location
+    orig_location = obj.location.copy()
+    obj.location = (0, 0, 0)
+    
+    try:
+        # Select object and its children
+        obj.select_set(True)
+        for child in obj.children_recursive:
+            child.select_set(True)
+        
+        context.view_layer.objects.active = obj
+        
+        # Export GLB, storing identical meshes once
+        export_path = os.path.join(export_dir, f"{obj.name}.glb")
+        with shared_duplicate_meshes([obj] + list(obj.children_recursive)):
+            bpy.ops.export_scene.gltf(
+                filepath=export_path,
+                use_selection=True,
+                export_format='GLB',
+                export_extras=True,  # Enables custom properties export
+                export_apply=False
+            )
+    finally:
+        # Restore location and deselect
+        obj.location = orig_location
+        bpy.ops.object.select_all(action='DESELECT')
+    
+    return export_path
+
+def _property_value(value):
+    """Turn an ID property value into something json can serialize"""
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    if hasattr(value, 'to_list'):
+        return value.to_list()
+    return value
+
+# foreach_get field, width and dtype for each attribute data type
+ATTRIBUTE_FIELDS = {
+    'FLOAT': ('value', 1, np.float32),
+    'INT': ('value', 1, np.int32),
+    'FLOAT_VECTOR': ('vector', 3, np.float32),
+    'FLOAT_COLOR': ('color', 4, np.float32),
+    'BYTE_COLOR': ('color', 4, np.float32),
+    'BOOLEAN': ('value', 1, bool),
+    'FLOAT2': ('vector', 2, np.float32),
+    'INT8': ('value', 1, np.int32),
+    'INT32_2D': ('value', 2, np.int32),
+    'QUATERNION': ('value', 4, np.float32),
+    'FLOAT4X4': ('value', 16, np.float32),
+}
+
+# Object types the glTF exporter converts to meshes
+CONVERTIBLE_TYPES = {'CURVE', 'FONT', 'SURFACE', 'META'}
+
+def _hash_buffer(digest, collection, attribute, dtype, width=1):
+    buffer = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attribute, buffer)
+    digest.update(buffer.tobytes())
+
+def _hash_mesh(digest, mesh, vertex_groups=()):
+    """Feed a mesh's topology, attributes, normals and weights into a hash
+
+    Every public attribute is included (positions, UV maps, color
+    attributes, material indices, sharp_face and custom ones), plus custom
+    normals and, for the given vertex group names, the deform weights.
+    Raises ValueError for attribute types that cannot be read.
+    """
+    _hash_buffer(digest, mesh.edges, "vertices", np.int32, 2)
+    _hash_buffer(digest, mesh.loops, "vertex_index", np.int32)
+    _hash_buffer(digest, mesh.polygons, "loop_total", np.int32)
+    
+    for attribute in sorted(mesh.attributes, key=lambda attribute: attribute.name):
+        # Internal topology, selection and UV editing layers
+        if attribute.name.startswith('.'):
+            continue
+        digest.update(f"{attribute.name}|{attribute.domain}|{attribute.data_type}".encode('utf-8'))
+        if attribute.data_type == 'STRING':
+            digest.update(repr([item.value for item in attribute.data]).encode('utf-8'))
+            continue
+        field = ATTRIBUTE_FIELDS.get(attribute.data_type)
+        if field is None:
+            raise ValueError(f"Cannot hash {attribute.data_type} attribute {attribute.name}")
+        name, width, dtype = field
+        _hash_buffer(digest, attribute.data, name, dtype, width)
+    
+    if mesh.has_custom_normals:
+        _hash_buffer(digest, mesh.corner_normals, "vector", np.float32, 3)
+    
+    if vertex_groups:
+        digest.update("|".join(vertex_groups).encode('utf-8'))
+        weights = [(vertex.index, group.group, group.weight)
+                   for vertex in mesh.vertices for group in vertex.groups]
+        digest.update(np.array(weights, dtype=np.float64).tobytes())
+
+def _hash_shape_keys(digest, key):
+    """Feed the shape keys of a mesh into a hash"""
+    if key is None:
+        return
+    for block in key.key_blocks:
+        relative = block.relative_key.name if block.relative_key else ""
+        digest.update(f"{block.name}|{block.value}|{block.mute}|{relative}|{block.vertex_group}|"
+                      f"{block.slider_min}|{block.slider_max}".encode('utf-8'))
+        _hash_buffer(digest, block.data, "co", np.float32, 3)
+
+def _hash_armature(digest, obj):
+    """Feed the rest and pose transforms of an armature into a hash"""
+    for bone in obj.data.bones:
+        parent = bone.parent.name if bone.parent else ""
+        digest.update(f"{bone.name}|{parent}".encode('utf-8'))
+        digest.update(np.array(bone.matrix_local, dtype=np.float32).tobytes())
+    for pose_bone in obj.pose.bones:
+        digest.update(np.array(pose_bone.matrix_basis, dtype=np.float32).tobytes())
+
+def mesh_content_hash(mesh, vertex_groups=()):
+    """Get a hash of everything that makes two meshes render the same
+
+    Topology, every attribute, custom normals, deform weights for the given
+    vertex group names, shape keys and material names. Raises ValueError
+    for attribute types that cannot be read.
+    """
+    digest = hashlib.sha256()
+    _hash_mesh(digest, mesh, vertex_groups)
+    _hash_shape_keys(digest, mesh.shape_keys)
+    materials = [material.name if material else "" for material in mesh.materials]
+    digest.update("|".join(materials).encode('utf-8'))
+    return digest.hexdigest()
+
+def _is_animated(data):
+    """Check if an ID has an action, NLA tracks or drivers"""
+    animation = getattr(data, 'animation_data', None)
+    if animation is None:
+        return False
+    return bool(animation.action or len(animation.nla_tracks) or len(animation.drivers))
+
+@contextmanager
+def shared_duplicate_meshes(objects):
+    """Temporarily point objects with identical meshes at one mesh datablock
+
+    The glTF exporter writes one mesh per datablock, so deep copies of the
+    same mesh would otherwise be stored once per object. Meshes are compared
+    by topology, every attribute, custom normals, deform weights, shape keys
+    and materials. The original meshes are restored on exit.
+    """
+    swapped = []
+    shared = {}
+    digests = {}
+    try:
+        for obj in objects:
+            mesh = obj.data
+            if obj.type != 'MESH':
+                continue
+            key = digests.get(mesh.as_pointer())
+            if key is None:
+                try:
+                    # Vertex group names live on the mesh, so any user's list will do
+                    key = mesh_content_hash(mesh, [group.name for group in obj.vertex_groups])
+                except ValueError:
+                    continue
+                digests[mesh.as_pointer()] = key
+            target = shared.setdefault(key, mesh)
+            if target != mesh:
+                swapped.append((obj, mesh))
+                obj.data = target
+        yield len(swapped)
+    finally:
+        for obj, mesh in swapped:
+            obj.data = mesh
+
+def hash_root(obj, depsgraph):
+    """Get a content hash of a top-level object and its children
+
+    Covers the evaluated geometry of meshes and of curves, text, surfaces
+    and metaballs, shape keys, deform weights, armature rest and pose,
+    transforms, material assignments and custom properties (node, mass,
+    type, maxDistance, ...) of every object in the hierarchy. The root's own
+    location is left out because Export All exports every root at the
+    origin. Returns None when the hierarchy cannot be hashed reliably, for
+    example when anything in it is animated, so it is always exported.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{MANIFEST_VERSION}".encode('utf-8'))
+    
+    for item in [obj] + sorted(obj.children_recursive, key=lambda o: o.name):
+        data = item.data
+        if any(_is_animated(data_block) for data_block in
+               (item, data, getattr(data, 'shape_keys', None))):
+            return None
+        
+        parent_name = item.parent.name if item.parent and item is not obj else ""
+        digest.update(f"{item.name}|{item.type}|{parent_name}|{item.parent_bone}".encode('utf-8'))
+        
+        matrix = item.matrix_world.copy() if item is obj else item.matrix_local.copy()
+        if item is obj:
+            matrix.translation = (0, 0, 0)
+        digest.update(np.array(matrix, dtype=np.float32).tobytes())
+        
+        props = {key: _property_value(value) for key, value in item.items()}
+        digest.update(json.dumps(props, sort_keys=True, default=str).encode('utf-8'))
+        
+        materials = [slot.material.name if slot.material else "" for slot in item.material_slots]
+        digest.update("|".join(materials).encode('utf-8'))
+        
+        try:
+            if item.type == 'MESH':
+                groups = [group.name for group in item.vertex_groups]
+                _hash_mesh(digest, item.evaluated_get(depsgraph).data, groups)
+                _hash_shape_keys(digest, data.shape_keys)
+            elif item.type in CONVERTIBLE_TYPES:
+                evaluated = item.evaluated_get(depsgraph)
+                mesh = evaluated.to_mesh()
+                try:
+                    if mesh is not None:
+                        _hash_mesh(digest, mesh)
+                finally:
+                    evaluated.to_mesh_clear()
+            elif item.type == 'ARMATURE':
+                _hash_armature(digest, item)
+        except ValueError:
+            return None
+    
+    return digest.hexdigest()
+
+def load_manifest(export_dir):
+    """Load the export manifest of a folder, mapping root names to hashes"""
+    path = os.path.join(export_dir, MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('objects', {})
+
+def save_manifest(export_dir, objects):
+    """Write the export manifest of a folder"""
+    path = os.path.join(export_dir, MANIFEST_NAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'objects': objects}, f, indent=1, sort_keys=True)
+
+def split_unchanged(roots, export_dir, depsgraph, manifest):
+    """Split roots into those that need exporting and those that do not
+
+    Returns (changed, unchanged, hashes) where hashes maps every root name
+    to its current content hash, or None if it has none. A root is
+    unchanged when its hash matches the manifest and its GLB is still on
+    disk.
+    """
+    changed = []
+    unchanged = []
+    hashes = {}
+    for obj in roots:
+        digest = hash_root(obj, depsgraph)
+        hashes[obj.name] = digest
+        entry = manifest.get(obj.name)
+        if (digest is not None and entry and entry.get('hash') == digest
+                and os.path.exists(os.path.join(export_dir, f"{obj.name}.glb"))):
+            unchanged.append(obj)
+        else:
+            changed.append(obj)
+    return changed, unchanged, hashes
+
+__all__ = [
+    'get_export_roots',
+    'export_root_glb',
+    'shared_duplicate_meshes',
+    'mesh_content_hash',
+    'hash_root',
+    'load_manifest',
+    'save_manifest',
+    'split_unchanged'
+]
@@ -0,0 +1,43 @@
+"""Background worker for parallel Export All GLBs
+
+Started by OBJECT_OT_export_all_glb as
+
+    blender -b snapshot.blend --python export_worker.py -- job.json
+
+job.json holds the export folder, the names of the top-level objects in
+this worker's shard and the path to write the result to. The result lists
+the exported names and a {name, error} entry for every failure.
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+from export_utils import export_root_glb
+
+def main():
+    job_path = sys.argv[sys.argv.index('--') + 1]
+    with open(job_path, 'r', encoding='utf-8') as f:
+        job = json.load(f)
+    
+    context = bpy.context
+    exported = []
+    errors = []
+    for name in job['names']:
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            errors.append({'name': name, 'error': "Object not found in snapshot"})
+            continue
+        try:
+            export_root_glb(context, obj, job['export_dir'])
+            exported.append(name)
+        except Exception as e:
+            errors.append({'name': name, 'error': str(e)})
+    
+    with open(job['result'], 'w', encoding='utf-8') as f:
+        json.dump({'exported': exported, 'errors': errors}, f)
+
+if __name__ == "__main__":
+    main()
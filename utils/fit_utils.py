@@ -0,0 +1,106 @@
+import numpy as np
+
+# Smallest half extent or radius, keeps flat meshes from collapsing the collider
+MIN_EXTENT = 1e-4
+
+FIT_SHAPES = ('box', 'obb', 'sphere')
+
+
+def mesh_points(mesh):
+    """Read the vertex positions of a mesh into an (n, 3) float array"""
+    points = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', points)
+    return points.reshape(-1, 3).astype(np.float64)
+
+
+def fit_aabb(points):
+    """Axis aligned bounding box as (center, half_extents, rotation)"""
+    low = points.min(axis=0)
+    high = points.max(axis=0)
+    half = np.maximum((high - low) / 2, MIN_EXTENT)
+    return (low + high) / 2, half, np.identity(3)
+
+
+def fit_obb(points):
+    """Oriented bounding box along the principal axes of the points
+
+    Returns (center, half_extents, rotation) where the columns of rotation
+    are the box axes.
+    """
+    if len(points) < 4:
+        return fit_aabb(points)
+    mean = points.mean(axis=0)
+    _, axes = np.linalg.eigh(np.cov(points - mean, rowvar=False))
+    # Keep a right handed basis so the matrix is a rotation
+    if np.linalg.det(axes) < 0:
+        axes[:, 0] = -axes[:, 0]
+    local = (points - mean) @ axes
+    low = local.min(axis=0)
+    high = local.max(axis=0)
+    half = np.maximum((high - low) / 2, MIN_EXTENT)
+    return mean + axes @ ((low + high) / 2), half, axes
+
+
+def fit_sphere(points, iterations=16):
+    """Approximate minimal bounding sphere as (center, radius)
+
+    Ritter's algorithm, vectorized: start from the two far apart points and
+    grow towards the farthest outside point until everything is enclosed.
+    """
+    first = points[0]
+    a = points[np.argmax(((points - first) ** 2).sum(axis=1))]
+    b = points[np.argmax(((points - a) ** 2).sum(axis=1))]
+    center = (a + b) / 2
+    radius = np.linalg.norm(b - a) / 2
+
+    for _ in range(iterations):
+        distances = np.sqrt(((points - center) ** 2).sum(axis=1))
+        far = np.argmax(distances)
+        if distances[far] <= radius:
+            break
+        # Move the sphere just enough to reach the outside point
+        new_radius = (radius + distances[far]) / 2
+        center = center + (points[far] - center) * ((new_radius - radius) / distances[far])
+        radius = new_radius
+    else:
+        radius = np.sqrt(((points - center) ** 2).sum(axis=1)).max()
+
+    return center, max(radius, MIN_EXTENT)
+
+
+def fit_collider_shape(points, shape='auto'):
+    """Fit a collider primitive to points
+
+    shape is 'box', 'obb', 'sphere' or 'auto'; auto fits all of them and
+    keeps the one with the least volume, which is the one wasting the least
+    space around the mesh. Returns a dict with the chosen shape, center,
+    volume and either half_extents and rotation, or radius.
+    """
+    fits = {}
+    if shape in ('box', 'auto'):
+        center, half, rotation = fit_aabb(points)
+        fits['box'] = {'center': center, 'half_extents': half, 'rotation': rotation,
+                       'volume': float(np.prod(half * 2))}
+    if shape in ('obb', 'auto'):
+        center, half, rotation = fit_obb(points)
+        fits['obb'] = {'center': center, 'half_extents': half, 'rotation': rotation,
+                       'volume': float(np.prod(half * 2))}
+    if shape in ('sphere', 'auto'):
+        center, radius = fit_sphere(points)
+        fits['sphere'] = {'center': center, 'radius': radius,
+                          'volume': float(4 / 3 * np.pi * radius ** 3)}
+    if not fits:
+        raise ValueError(f"Unknown collider shape: {shape}")
+
+    best = min(fits, key=lambda name: fits[name]['volume'])
+    return dict(fits[best], shape=best)
+
+
+__all__ = [
+    'FIT_SHAPES',
+    'mesh_points',
+    'fit_aabb',
+    'fit_obb',
+    'fit_sphere',
+    'fit_collider_shape'
+]
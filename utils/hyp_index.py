@@ -0,0 +1,220 @@
+import json
+import os
+import sqlite3
+from .hyp_utils import read_hyp_header
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    id TEXT,
+    name TEXT,
+    version INTEGER,
+    author TEXT,
+    created TEXT,
+    modified TEXT,
+    frozen INTEGER,
+    props TEXT,
+    blueprint TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS assets (
+    path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT,
+    url TEXT,
+    offset INTEGER,
+    size INTEGER,
+    PRIMARY KEY (path, position)
+);
+CREATE INDEX IF NOT EXISTS files_name ON files (name COLLATE NOCASE);
+"""
+
+FILE_COLUMNS = ('path', 'mtime_ns', 'size', 'id', 'name', 'version', 'author',
+                'created', 'modified', 'frozen', 'props', 'blueprint', 'error')
+
+
+def _walk_hyp_files(root, recursive=True):
+    """Yield (path, stat) for every .hyp file below root"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    stack.append(entry.path)
+            elif entry.name.lower().endswith('.hyp'):
+                try:
+                    yield os.path.abspath(entry.path), entry.stat()
+                except OSError:
+                    continue
+
+
+def _as_int(value):
+    """Coerce a header field to int, 0 if it is not a whole number"""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _as_text(value):
+    """Coerce a header field to str, empty if it is not text"""
+    return value if isinstance(value, str) else ''
+
+
+def _file_row(path, stat):
+    """Parse a .hyp header into a files row and its asset rows
+
+    Unreadable or malformed headers become an error row instead of
+    aborting the scan.
+    """
+    try:
+        header, data_offset, _ = read_hyp_header(path)
+        if not isinstance(header, dict):
+            raise ValueError("Header is not a JSON object")
+        blueprint = header.get('blueprint') or {}
+        if not isinstance(blueprint, dict):
+            raise ValueError("Blueprint is not a JSON object")
+
+        props = blueprint.get('props') or {}
+        row = (
+            path,
+            stat.st_mtime_ns,
+            stat.st_size,
+            _as_text(blueprint.get('id')),
+            _as_text(blueprint.get('name')) or os.path.splitext(os.path.basename(path))[0],
+            _as_int(blueprint.get('version')),
+            _as_text(blueprint.get('author')),
+            _as_text(blueprint.get('created')),
+            _as_text(blueprint.get('modified')),
+            int(bool(blueprint.get('frozen', False))),
+            json.dumps(props if isinstance(props, dict) else {}),
+            json.dumps(blueprint),
+            None,
+        )
+
+        asset_rows = []
+        offset = data_offset
+        for position, asset in enumerate(header.get('assets') or []):
+            if not isinstance(asset, dict):
+                raise ValueError(f"Asset {position} is not a JSON object")
+            size = int(asset.get('size', 0))
+            asset_rows.append((path, position, asset.get('type'), asset.get('url'), offset, size))
+            offset += size
+    except Exception as e:
+        return (path, stat.st_mtime_ns, stat.st_size, None, os.path.basename(path),
+                None, None, None, None, 0, None, None, str(e)), []
+    return row, asset_rows
+
+
+class HypIndex:
+    """Persistent SQLite index of .hyp headers
+
+    Files are keyed by absolute path and re-parsed only when their mtime or
+    size changes, so rescanning a large library only costs a directory
+    walk. Only headers are read, never asset payloads.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def scan(self, root, recursive=True):
+        """Bring the index up to date with the .hyp files below root
+
+        Returns a dict with the number of updated, unchanged, removed and
+        failed files.
+        """
+        root = os.path.abspath(root)
+        prefix = os.path.join(root, '')
+        known = {
+            row['path']: (row['mtime_ns'], row['size'])
+            for row in self.connection.execute(
+                "SELECT path, mtime_ns, size FROM files WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix))
+        }
+
+        file_rows = []
+        asset_rows = []
+        seen = set()
+        unchanged = 0
+        for path, stat in _walk_hyp_files(root, recursive):
+            seen.add(path)
+            if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                unchanged += 1
+                continue
+            row, assets = _file_row(path, stat)
+            file_rows.append(row)
+            asset_rows.extend(assets)
+
+        removed = [(path,) for path in known
+                   if path not in seen and (recursive or os.path.dirname(path) == root)]
+
+        with self.connection:
+            stale = [(row[0],) for row in file_rows] + removed
+            self.connection.executemany("DELETE FROM assets WHERE path = ?", stale)
+            self.connection.executemany("DELETE FROM files WHERE path = ?", removed)
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO files ({', '.join(FILE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(FILE_COLUMNS))})",
+                file_rows)
+            self.connection.executemany(
+                "INSERT INTO assets (path, position, type, url, offset, size) VALUES (?, ?, ?, ?, ?, ?)",
+                asset_rows)
+
+        return {
+            'updated': len(file_rows),
+            'unchanged': unchanged,
+            'removed': len(removed),
+            'failed': sum(1 for row in file_rows if row[-1]),
+        }
+
+    def search(self, text='', root=None, limit=500):
+        """Find indexed files by name, author or id, ordered by name"""
+        query = ("SELECT f.*, (SELECT COUNT(*) FROM assets a WHERE a.path = f.path) AS asset_count "
+                 "FROM files f WHERE 1 = 1")
+        params = []
+        if root:
+            prefix = os.path.join(os.path.abspath(root), '')
+            query += " AND substr(f.path, 1, ?) = ?"
+            params += [len(prefix), prefix]
+        if text:
+            pattern = f"%{text}%"
+            query += " AND (f.name LIKE ? OR f.author LIKE ? OR f.id LIKE ?)"
+            params += [pattern, pattern, pattern]
+        query += " ORDER BY f.name COLLATE NOCASE LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def get(self, path):
+        """Get the indexed entry and asset table for a file, or None"""
+        row = self.connection.execute("SELECT * FROM files WHERE path = ?",
+                                      (os.path.abspath(path),)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry['assets'] = [dict(asset) for asset in self.connection.execute(
+            "SELECT * FROM assets WHERE path = ? ORDER BY position", (entry['path'],))]
+        return entry
+
+
+__all__ = ['HypIndex']
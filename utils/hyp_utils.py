@@ -0,0 +1,604 @@
+import hashlib
+import importlib.util
+import json
+import mmap
+import multiprocessing
+import os
+import site
+import struct
+import sys
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+HEADER_SIZE_FORMAT = '<I'
+HEADER_SIZE_BYTES = struct.calcsize(HEADER_SIZE_FORMAT)
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+SHM_DIR = '/dev/shm'
+
+# Fallback file extensions for assets whose url has none
+ASSET_SUFFIXES = {
+    'model': '.glb',
+    'avatar': '.vrm',
+    'emote': '.glb',
+    'script': '.js',
+    'hdr': '.hdr',
+}
+MIME_SUFFIXES = {
+    'model/gltf-binary': '.glb',
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/webp': '.webp',
+    'audio/mpeg': '.mp3',
+    'audio/ogg': '.ogg',
+    'audio/wav': '.wav',
+    'video/mp4': '.mp4',
+    'application/javascript': '.js',
+}
+
+
+class HypFile:
+    """Memory-mapped reader for Hyperfy .hyp files
+
+    A .hyp file is a 4 byte little-endian header length, a JSON header
+    holding the blueprint and the asset table, and the asset payloads
+    packed back to back in asset table order. The file is mapped once and
+    every asset is handed out as a zero-copy memoryview into the mapping,
+    so nothing is read from disk until the bytes are actually used.
+
+    Views returned by asset_data() are released when the file is closed,
+    so copy anything that has to outlive the with block. If a caller still
+    holds a view derived from one (a slice, a NumPy array), closing leaves
+    the mapping to be unmapped once that view is gone instead of raising.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        self._mmap = None
+        self._view = None
+        self._asset_views = []
+
+        try:
+            file_size = os.fstat(self._file.fileno()).st_size
+            if file_size < HEADER_SIZE_BYTES:
+                raise ValueError("File is too small to be a .hyp file")
+
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+
+            # 1. Header size (uint32 little-endian)
+            self.header_size = struct.unpack_from(HEADER_SIZE_FORMAT, self._mmap, 0)[0]
+            self.data_offset = HEADER_SIZE_BYTES + self.header_size
+            if self.data_offset > file_size:
+                raise ValueError(f"Header size {self.header_size} exceeds file size {file_size}")
+
+            # 2. Header JSON
+            header_bytes = self._view[HEADER_SIZE_BYTES:self.data_offset]
+            try:
+                self.header = json.loads(str(header_bytes, 'utf-8'))
+            finally:
+                header_bytes.release()
+
+            self.blueprint = self.header.get('blueprint', {}) or {}
+            self.assets = self.header.get('assets', []) or []
+
+            # 3. Offset table, built once
+            self.offsets = []
+            offset = self.data_offset
+            for asset in self.assets:
+                self.offsets.append(offset)
+                offset += int(asset.get('size', 0))
+            if offset > file_size:
+                raise ValueError(f"Asset table describes {offset} bytes but file has {file_size}")
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release all asset views and unmap the file
+
+        Never raises BufferError, so it cannot mask an exception raised
+        inside a with block.
+        """
+        views = self._asset_views + ([self._view] if self._view is not None else [])
+        self._asset_views = []
+        self._view = None
+        for view in views:
+            try:
+                view.release()
+            except BufferError:
+                pass
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Still exported; the mapping is unmapped when the last view goes away
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def index_of(self, asset):
+        """Get the position of an asset in the asset table"""
+        for i, candidate in enumerate(self.assets):
+            if candidate is asset:
+                return i
+        return self.assets.index(asset)
+
+    def asset_offset(self, asset):
+        """Get the absolute file offset of an asset's payload"""
+        return self.offsets[self.index_of(asset)]
+
+    def asset_data(self, asset):
+        """Get a zero-copy memoryview of an asset's payload"""
+        start = self.asset_offset(asset)
+        view = self._view[start:start + int(asset.get('size', 0))]
+        self._asset_views.append(view)
+        return view
+
+    def copy_asset(self, asset, out, chunk_size=COPY_CHUNK_SIZE, progress=None):
+        """Copy an asset's payload into a binary file object
+
+        Uses os.sendfile where available so the bytes go from the .hyp to
+        the target file inside the kernel, otherwise writes slices of the
+        mapping without an intermediate bytes copy. progress, if given, is
+        called with the byte count of every chunk and may raise to abort.
+        """
+        start = self.asset_offset(asset)
+        size = int(asset.get('size', 0))
+
+        if hasattr(os, 'sendfile') and hasattr(out, 'fileno'):
+            out.flush()
+            try:
+                copied = 0
+                while copied < size:
+                    sent = os.sendfile(out.fileno(), self._file.fileno(),
+                                       start + copied, min(chunk_size, size - copied))
+                    if sent == 0:
+                        break
+                    copied += sent
+                    if progress:
+                        progress(sent)
+                if copied == size:
+                    os.lseek(out.fileno(), 0, os.SEEK_END)
+                    return size
+            except OSError:
+                pass
+            # Fall back to plain writes, starting over from the beginning
+            if progress and copied:
+                progress(-copied)
+            out.seek(0)
+            out.truncate()
+
+        for chunk_start in range(start, start + size, chunk_size):
+            with self._view[chunk_start:min(chunk_start + chunk_size, start + size)] as chunk:
+                out.write(chunk)
+                if progress:
+                    progress(len(chunk))
+        return size
+
+    def find_blueprint_asset(self, asset_type):
+        """Get the asset the blueprint points at for a type, e.g. 'model'
+
+        Matches the blueprint's url for that type against the asset table
+        and falls back to the last asset of the type.
+        """
+        url = self.blueprint.get(asset_type)
+        if url:
+            for asset in self.assets:
+                if asset.get('url') == url:
+                    return asset
+        return self.find_asset(asset_type)
+
+    def find_assets(self, asset_type):
+        """Get all assets of the given type, in file order"""
+        return [asset for asset in self.assets if asset.get('type') == asset_type]
+
+    def find_asset(self, asset_type):
+        """Get the last asset of the given type, or None"""
+        matches = self.find_assets(asset_type)
+        return matches[-1] if matches else None
+
+    @property
+    def is_frozen(self):
+        return bool(self.blueprint.get('frozen', False))
+
+
+def read_hyp_header(filepath):
+    """Read only the JSON header of a .hyp file
+
+    Returns (header, data_offset, file_size) without touching any asset
+    bytes, which is all that indexing and inspection need.
+    """
+    with open(filepath, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        size_bytes = f.read(HEADER_SIZE_BYTES)
+        if len(size_bytes) < HEADER_SIZE_BYTES:
+            raise ValueError("File is too small to be a .hyp file")
+        header_size = struct.unpack(HEADER_SIZE_FORMAT, size_bytes)[0]
+        data_offset = HEADER_SIZE_BYTES + header_size
+        if data_offset > file_size:
+            raise ValueError(f"Header size {header_size} exceeds file size {file_size}")
+        header = json.loads(f.read(header_size).decode('utf-8'))
+    return header, data_offset, file_size
+
+
+def staging_dir():
+    """Get the directory used to stage assets for file-based importers
+
+    Prefers tmpfs (/dev/shm) so staged files never touch a disk, and falls
+    back to the system temp directory. The .hyp's own folder is never used,
+    so read-only asset shares work and parallel imports cannot collide.
+    """
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+        return SHM_DIR
+    return tempfile.gettempdir()
+
+
+def stage_asset(hyp, asset, suffix='', directory=None, progress=None):
+    """Stage an asset as a uniquely named temporary file and return its path
+
+    The caller owns the file and must remove it.
+    """
+    fd, path = tempfile.mkstemp(prefix='hyperfy_', suffix=suffix,
+                                dir=directory or staging_dir())
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            hyp.copy_asset(asset, out, progress=progress)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def asset_suffix(asset):
+    """Get a file extension for an asset from its url, mime or type"""
+    suffix = os.path.splitext(asset.get('url') or '')[1]
+    if suffix:
+        return suffix.lower()
+    return MIME_SUFFIXES.get(asset.get('mime'), ASSET_SUFFIXES.get(asset.get('type'), ''))
+
+
+def stage_assets(hyp, assets, directory=None, max_workers=None, progress=None):
+    """Stage several assets in parallel threads
+
+    Returns the staged paths in the order of assets. Copying releases the
+    GIL, so independent assets are written concurrently. The caller owns
+    the files and must remove them.
+    """
+    directory = directory or staging_dir()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(stage_asset, hyp, asset, asset_suffix(asset), directory, progress)
+                   for asset in assets]
+        paths = []
+        errors = []
+        for future in futures:
+            try:
+                paths.append(future.result())
+            except Exception as e:
+                errors.append(e)
+
+    if errors:
+        for path in paths:
+            os.remove(path)
+        raise errors[0]
+    return paths
+
+
+@contextmanager
+def staged_asset(hyp, asset, suffix='', directory=None):
+    """Stage an asset as a uniquely named temporary file and yield its path"""
+    path = stage_asset(hyp, asset, suffix, directory)
+    try:
+        yield path
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class StagingCancelled(Exception):
+    """Raised inside a staging job once it has been cancelled"""
+
+
+class HypImportJob:
+    """Stage the assets of a .hyp on a background thread
+
+    The thread only does file I/O: it parses the header, reads the script
+    and stages the model, plus any extra assets of extra_types, as files.
+    The owner polls progress and done from the main thread, which is the
+    only place bpy may be used, and must call cleanup() once finished.
+    """
+
+    def __init__(self, filepath, include_frozen=False, extra_types=(), directory=None):
+        self.filepath = filepath
+        self.include_frozen = include_frozen
+        self.extra_types = set(extra_types)
+        self.directory = directory or staging_dir()
+
+        self.blueprint = {}
+        self.frozen = False
+        self.has_script = False
+        self.script = None
+        self.model_path = None
+        self.extra = []
+        self.skipped = []
+        self.error = None
+        self.done = False
+
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def progress(self):
+        """Fraction of the staged bytes written so far"""
+        if self.bytes_total:
+            return min(self.bytes_done / self.bytes_total, 1.0)
+        return 1.0 if self.done else 0.0
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="hyp-import", daemon=True)
+        self._thread.start()
+
+    def cancel(self, wait=True):
+        self._cancel.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def run(self):
+        try:
+            self._stage()
+        except StagingCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def _advance(self, nbytes):
+        if self._cancel.is_set():
+            raise StagingCancelled()
+        with self._lock:
+            self.bytes_done += nbytes
+
+    def _stage(self):
+        with HypFile(self.filepath) as hyp:
+            self.blueprint = hyp.blueprint
+            self.frozen = hyp.is_frozen
+            model_asset = hyp.find_blueprint_asset('model')
+            script_asset = hyp.find_blueprint_asset('script')
+
+            if not model_asset:
+                raise ValueError("No model found in .hyp file")
+
+            self.has_script = bool(script_asset and self.blueprint.get('script'))
+            if self.frozen and not self.include_frozen:
+                return
+
+            if self.has_script:
+                self.script = str(hyp.asset_data(script_asset), 'utf-8')
+
+            extra = []
+            if self.extra_types:
+                for asset in hyp.assets:
+                    if asset is model_asset or asset is script_asset:
+                        continue
+                    if asset.get('type') in self.extra_types:
+                        extra.append(asset)
+                    else:
+                        self.skipped.append(asset.get('type', '?'))
+
+            self.bytes_total = sum(int(asset.get('size', 0)) for asset in [model_asset] + extra)
+            self.model_path = stage_asset(hyp, model_asset, '.glb', self.directory, self._advance)
+            paths = stage_assets(hyp, extra, self.directory, progress=self._advance)
+            self.extra = list(zip(extra, paths))
+
+    def cleanup(self):
+        """Remove every file this job staged"""
+        paths = [self.model_path] + [path for _, path in self.extra]
+        for path in paths:
+            if path and os.path.exists(path):
+                os.remove(path)
+        self.model_path = None
+        self.extra = []
+
+
+def extract_hyp(filepath, directory=None, include_frozen=False):
+    """Parse a .hyp, stage its model and read its script
+
+    Returns a plain dict so it can travel back from a worker process:
+    filepath, blueprint, frozen, model_path (a staged .glb the caller must
+    remove, or None) and script (the script source, or None). Frozen
+    models and scripts are only extracted when include_frozen is set.
+    """
+    with HypFile(filepath) as hyp:
+        blueprint = hyp.blueprint
+        frozen = hyp.is_frozen
+        model_asset = hyp.find_blueprint_asset('model')
+        script_asset = hyp.find_blueprint_asset('script')
+
+        if not model_asset:
+            raise ValueError("No model found in .hyp file")
+
+        result = {
+            'filepath': filepath,
+            'blueprint': blueprint,
+            'frozen': frozen,
+            'model_path': None,
+            'script': None,
+        }
+        if frozen and not include_frozen:
+            return result
+
+        if script_asset and blueprint.get('script'):
+            result['script'] = str(hyp.asset_data(script_asset), 'utf-8')
+        result['model_path'] = stage_asset(hyp, model_asset, suffix='.glb', directory=directory)
+        return result
+
+
+def _extract_hyp_worker(filepath, directory, include_frozen):
+    try:
+        return extract_hyp(filepath, directory, include_frozen)
+    except Exception as e:
+        return {'filepath': filepath, 'error': str(e)}
+
+
+def _worker_module():
+    """Get this module under a top-level name that worker processes can import
+
+    The add-on package imports bpy, which a plain Python worker cannot, so
+    workers put this folder on their path and import this file on its own.
+    """
+    name = os.path.splitext(os.path.basename(__file__))[0]
+    module = sys.modules.get(name)
+    if module is None or os.path.abspath(getattr(module, '__file__', '')) != os.path.abspath(__file__):
+        spec = importlib.util.spec_from_file_location(name, __file__)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def extract_hyp_files(filepaths, directory=None, include_frozen=False, max_workers=None):
+    """Extract many .hyp files in parallel worker processes
+
+    Yields extract_hyp() results as they complete. Failed files yield
+    {'filepath': ..., 'error': ...} instead of raising. If the process pool
+    cannot be started, the remaining files are extracted in this process.
+    Only about two files per worker are in flight at a time, so staged
+    models never pile up in /dev/shm faster than the caller imports them.
+    """
+    directory = directory or staging_dir()
+    pending = list(filepaths)
+    worker = _worker_module()._extract_hyp_worker
+    window = 2 * (max_workers or os.cpu_count() or 1)
+
+    futures = {}
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=site.addsitedir,
+                                 initargs=(os.path.dirname(os.path.abspath(__file__)),)) as pool:
+            queued = iter(list(pending))
+            for path in queued:
+                futures[pool.submit(worker, path, directory, include_frozen)] = path
+                if len(futures) >= window:
+                    break
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = futures.pop(future)
+                    result = future.result()
+                    pending.remove(path)
+                    # Refill the window before handing the result over
+                    for next_path in queued:
+                        futures[pool.submit(worker, next_path, directory, include_frozen)] = next_path
+                        break
+                    yield result
+    except BrokenProcessPool:
+        pass
+    finally:
+        # Stopped early: drop queued work and models nobody will import
+        for future in futures:
+            if not future.cancel() and future.done() and not future.exception():
+                model_path = future.result().get('model_path')
+                if model_path and os.path.exists(model_path):
+                    os.remove(model_path)
+
+    for path in pending:
+        yield _extract_hyp_worker(path, directory, include_frozen)
+
+
+def hash_asset_source(source, chunk_size=COPY_CHUNK_SIZE):
+    """Get the sha256 hex digest of a file path or bytes-like asset source"""
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    else:
+        digest.update(source)
+    return digest.hexdigest()
+
+
+def _source_size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    return len(source)
+
+
+def write_hyp(filepath, blueprint, assets, chunk_size=COPY_CHUNK_SIZE):
+    """Stream a blueprint and its assets into a .hyp file
+
+    assets is a list of (entry, source) pairs, where entry is the asset
+    table dict (type, url, mime, ...) and source is a file path or a
+    bytes-like object. Sizes are taken from the sources, the size-prefixed
+    header is written first and file sources are then copied across in
+    chunks, so no asset is ever fully held in memory. The file is written
+    next to the target and moved into place once complete.
+    """
+    entries = []
+    for entry, source in assets:
+        entry = dict(entry)
+        entry['size'] = _source_size(source)
+        entries.append(entry)
+
+    header = json.dumps({'blueprint': blueprint, 'assets': entries}).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(prefix='.hyperfy_', suffix='.hyp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(struct.pack(HEADER_SIZE_FORMAT, len(header)))
+            out.write(header)
+            for entry, (_, source) in zip(entries, assets):
+                if isinstance(source, (str, os.PathLike)):
+                    with open(source, 'rb') as f:
+                        written = 0
+                        for chunk in iter(lambda: f.read(chunk_size), b''):
+                            out.write(chunk)
+                            written += len(chunk)
+                    if written != entry['size']:
+                        raise IOError(f"Asset {source} changed size while being written")
+                else:
+                    out.write(source)
+        os.replace(temp_path, filepath)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return entries
+
+
+__all__ = [
+    'HypFile',
+    'read_hyp_header',
+    'staging_dir',
+    'asset_suffix',
+    'stage_asset',
+    'stage_assets',
+    'staged_asset',
+    'StagingCancelled',
+    'HypImportJob',
+    'extract_hyp',
+    'extract_hyp_files',
+    'hash_asset_source',
+    'write_hyp'
+]
@@ -0,0 +1,47 @@
+import bpy
+import os
+from .hyp_index import HypIndex
+
+INDEX_FILENAME = "hyp_library.sqlite"
+MAX_RESULTS = 500
+
+def _addon_package():
+    return __package__.rpartition('.')[0]
+
+def library_index_path():
+    """Get the path of the .hyp library index in the user's data folder"""
+    try:
+        directory = bpy.utils.extension_path_user(_addon_package(), create=True)
+    except (AttributeError, ValueError):
+        # Installed as a legacy add-on rather than an extension
+        directory = bpy.utils.user_resource('CONFIG', path="hyperfy_tools", create=True)
+    return os.path.join(directory, INDEX_FILENAME)
+
+def open_library_index():
+    """Open the persistent .hyp library index"""
+    return HypIndex(library_index_path())
+
+def refresh_library_results(props):
+    """Fill the library result list from the index using the current search"""
+    results = props.hyp_library_results
+    results.clear()
+    
+    root = bpy.path.abspath(props.hyp_library_path) if props.hyp_library_path else None
+    with open_library_index() as index:
+        rows = index.search(props.hyp_library_search, root=root, limit=MAX_RESULTS)
+    
+    for row in rows:
+        entry = results.add()
+        entry.path = row['path']
+        entry.name = row['name'] or os.path.basename(row['path'])
+        entry.author = row['author'] or ""
+        entry.version = row['version'] or 0
+        entry.frozen = bool(row['frozen'])
+        entry.asset_count = row['asset_count']
+        entry.size_mb = row['size'] / (1024 * 1024)
+        entry.error = row['error'] or ""
+    
+    props.hyp_library_index = min(props.hyp_library_index, max(len(results) - 1, 0))
+    return len(rows)
+
+__all__ = ['library_index_path', 'open_library_index', 'refresh_library_results']
@@ -1,72 +1,299 @@
 import bpy
+import math
+import numpy as np
+import re
+from mathutils.bvhtree import BVHTree
+from .decomposition_utils import mesh_triangles
+from .fit_utils import fit_sphere
+
+# Base name, then an optional LOD<n> or COL tag (Blender's .001 duplicate
+# suffix allowed after the tag). Separators between base and tag are dropped.
+NAME_PATTERN = re.compile(
+    r'^(?P<base>.*?)[\s._-]*(?:(?:(?P<lod>lod)[\s._-]*(?P<index>\d*)|(?P<col>col))(?:\.\d{3,})?)?$',
+    re.IGNORECASE | re.DOTALL
+)
+
+def classify_name(name):
+    """Split an object name into (base, kind, lod_index)
+
+    kind is 'lod', 'col' or None. lod_index is the LOD number, or None if
+    the name has no LOD tag or the tag has no number.
+    """
+    match = NAME_PATTERN.match(name)
+    base = match.group('base') or name
+    if match.group('lod'):
+        index = match.group('index')
+        return base, 'lod', int(index) if index else None
+    if match.group('col'):
+        return base, 'col', None
+    return base, None, None
+
+def base_key(name):
+    """Get the case-insensitive grouping key of an object name"""
+    return classify_name(name)[0].strip().lower()
+
+def is_col_name(name):
+    """Check if a name carries the COL collision tag"""
+    return classify_name(name)[1] == 'col'
+
+def lod_sort_key(obj):
+    """Sort key putting LOD variants in LOD order, untagged names last"""
+    index = classify_name(obj.name)[2]
+    return index if index is not None else float('inf')
 
 def find_col_object(obj_name, objects):
     """Find a matching collision object (with COL suffix) for the given object name"""
-    base_name = obj_name.lower().replace('lod', '').replace('.', '').rstrip('0123456789')
-    
+    key = base_key(obj_name)
     for obj in objects:
-        if obj.name.lower().endswith('col') and obj.name.lower().replace('col', '') == base_name:
+        base, kind, _ = classify_name(obj.name)
+        if kind == 'col' and base.strip().lower() == key:
             return obj
     return None
 
 def is_lod_variant(name1, name2):
     """Check if two names represent LOD variants of the same object"""
-    # Remove common LOD suffixes
-    base1 = name1.lower().replace('lod', '').replace('.', '').rstrip('0123456789')
-    base2 = name2.lower().replace('lod', '').replace('.', '').rstrip('0123456789')
-    return base1 == base2
+    return base_key(name1) == base_key(name2)
 
 def get_lod_groups(objects):
-    """Group objects by their base names (for LOD processing)"""
+    """Group objects by their base names (for LOD processing)
+
+    Single pass: returns a dict mapping each lowercased base name to its
+    objects in input order.
+    """
     lod_groups = {}
-    
     for obj in objects:
-        base_name = obj.name.lower()
-        # Strip LOD and COL suffixes to get base name
-        if 'lod' in base_name:
-            base_name = base_name.split('lod')[0]
-        elif 'col' in base_name:
-            base_name = base_name.replace('col', '')
-        base_name = base_name.strip()
-        
-        # Find existing group or create new one
-        found_group = None
-        for key in lod_groups.keys():
-            key_base = key.name.lower()
-            if 'lod' in key_base:
-                key_base = key_base.split('lod')[0]
-            elif 'col' in key_base:
-                key_base = key_base.replace('col', '')
-            key_base = key_base.strip()
-            
-            if key_base == base_name:
-                found_group = key
-                break
-        
-        if found_group:
-            lod_groups[found_group].append(obj)
-        else:
-            # For new groups, prefer non-COL object as key
-            if not obj.name.lower().endswith('col'):
-                lod_groups[obj] = [obj]
-            else:
-                # If only COL object found so far, use it as key
-                lod_groups[obj] = [obj]
-    
+        lod_groups.setdefault(base_key(obj.name), []).append(obj)
     return lod_groups
 
+def group_main_object(group):
+    """Get the object a LOD group is named after, preferring non-COL objects"""
+    for obj in group:
+        if not is_col_name(obj.name):
+            return obj
+    return group[0]
+
 def get_lod_variants(obj, objects):
     """Get all LOD variants for a given object"""
-    variants = []
-    base_name = obj.name.split('LOD')[0].replace('COL', '')
+    key = base_key(obj.name)
+    return [other for other in objects if other != obj and base_key(other.name) == key]
+
+# Decimation keeps vertices of this group (border and seam vertices) in place
+LOD_PROTECT_GROUP = "hyperfy_lod_protect"
+LOD_PROTECT_FACTOR = 100.0
+
+def parse_lod_targets(text):
+    """Parse comma separated LOD targets
+
+    Values up to 1 are ratios of the source triangle count, larger values
+    are absolute triangle budgets. Raises ValueError on invalid input.
+    """
+    targets = []
+    for part in re.split(r'[\s,;]+', text.strip()):
+        if not part:
+            continue
+        value = float(part)
+        if value <= 0:
+            raise ValueError(f"LOD target must be positive: {part}")
+        targets.append(value)
+    return targets
+
+def triangle_count(mesh):
+    """Count the triangles of a mesh without triangulating it"""
+    totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', totals)
+    return int(totals.sum()) - 2 * len(totals)
+
+def target_ratio(target, triangles):
+    """Turn a LOD target into a decimation ratio for a mesh"""
+    if target <= 1:
+        return target
+    return min(1.0, target / max(triangles, 1))
+
+def protected_vertices(mesh):
+    """Get a boolean mask of vertices on open borders or UV seams"""
+    edge_vertices = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get('vertices', edge_vertices)
+    seams = np.empty(len(mesh.edges), dtype=bool)
+    mesh.edges.foreach_get('use_seam', seams)
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('edge_index', loop_edges)
+    
+    borders = np.bincount(loop_edges, minlength=len(mesh.edges)) == 1
+    protected = np.zeros(len(mesh.vertices), dtype=bool)
+    protected[edge_vertices.reshape(-1, 2)[seams | borders].ravel()] = True
+    return protected
+
+def _remove_protect_group(mesh):
+    """Drop the decimation protect group from a generated mesh"""
+    # Vertex groups can only be removed through an object
+    holder = bpy.data.objects.new("_lod_strip", mesh)
+    try:
+        group = holder.vertex_groups.get(LOD_PROTECT_GROUP)
+        if group is not None:
+            holder.vertex_groups.remove(group)
+    finally:
+        bpy.data.objects.remove(holder)
+
+def generate_lod_meshes(objects, targets, context):
+    """Decimate objects into one new mesh per LOD target
+    
+    Each object gets a temporary copy with a collapse decimate modifier
+    per level, weighted by a vertex group that keeps border and seam
+    vertices in place. All levels of all objects are evaluated in one
+    depsgraph update, with no operators or mode switches. Returns a list
+    per object of (mesh, ratio) pairs.
+    """
+    collection = context.scene.collection
+    temps = []
+    try:
+        for obj in objects:
+            temp_mesh = obj.data.copy()
+            triangles = triangle_count(obj.data)
+            protected = protected_vertices(obj.data)
+            levels = []
+            temps.append((temp_mesh, levels))
+            
+            for target in targets:
+                ratio = target_ratio(target, triangles)
+                temp = bpy.data.objects.new(f"{obj.name}_decimate", temp_mesh)
+                # Group names and weights live on the shared mesh, so the
+                # source groups are already there and protect is added once
+                if not levels:
+                    protect = temp.vertex_groups.get(LOD_PROTECT_GROUP) or temp.vertex_groups.new(name=LOD_PROTECT_GROUP)
+                    protect.add(np.flatnonzero(~protected).tolist(), 1.0, 'REPLACE')
+                    protect.add(np.flatnonzero(protected).tolist(), 0.0, 'REPLACE')
+                
+                decimate = temp.modifiers.new(name="Decimate", type='DECIMATE')
+                decimate.decimate_type = 'COLLAPSE'
+                decimate.ratio = ratio
+                decimate.use_collapse_triangulate = True
+                decimate.vertex_group = LOD_PROTECT_GROUP
+                decimate.vertex_group_factor = LOD_PROTECT_FACTOR
+                collection.objects.link(temp)
+                levels.append((temp, ratio))
+        
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        results = []
+        for obj, (_, levels) in zip(objects, temps):
+            meshes = []
+            for i, (temp, ratio) in enumerate(levels):
+                mesh = bpy.data.meshes.new_from_object(temp.evaluated_get(depsgraph), depsgraph=depsgraph)
+                mesh.name = f"{obj.data.name}_LOD{i + 1}"
+                _remove_protect_group(mesh)
+                meshes.append((mesh, ratio))
+            results.append(meshes)
+    finally:
+        for temp_mesh, levels in temps:
+            for temp, _ in levels:
+                bpy.data.objects.remove(temp, do_unlink=True)
+            bpy.data.meshes.remove(temp_mesh)
+    
+    return results
+
+# Query points per direction when estimating LOD deviation
+LOD_ERROR_SAMPLES = 2000
+
+# LOD distances never go below this, in meters
+MIN_LOD_DISTANCE = 1.0
+
+def _sample_points(points, count):
+    """Pick at most count evenly spread rows of points"""
+    if len(points) <= count:
+        return points
+    return points[np.linspace(0, len(points) - 1, count).astype(np.int64)]
+
+def _max_surface_distance(points, tree):
+    """Largest distance from any of points to the surface in tree"""
+    worst = 0.0
+    for co in points.tolist():
+        distance = tree.find_nearest(co)[3]
+        if distance is not None and distance > worst:
+            worst = distance
+    return worst
+
+def lod_deviation(lod_mesh, base_mesh, samples=LOD_ERROR_SAMPLES):
+    """Estimate the Hausdorff distance between a LOD mesh and LOD0
     
-    for other in objects:
-        if other != obj:
-            other_base = other.name.split('LOD')[0].replace('COL', '')
-            if other_base == base_name:
-                variants.append(other)
+    Sampled vertices of each mesh are measured against the surface of the
+    other with BVH trees, in both directions, and the largest distance is
+    returned in mesh units.
+    """
+    lod_points, lod_triangles = mesh_triangles(lod_mesh)
+    base_points, base_triangles = mesh_triangles(base_mesh)
+    if not len(lod_triangles) or not len(base_triangles):
+        return 0.0
     
-    return variants
+    lod_tree = BVHTree.FromPolygons(lod_points.tolist(), lod_triangles.tolist(), all_triangles=True)
+    base_tree = BVHTree.FromPolygons(base_points.tolist(), base_triangles.tolist(), all_triangles=True)
+    return max(
+        _max_surface_distance(_sample_points(lod_points, samples), base_tree),
+        _max_surface_distance(_sample_points(base_points, samples), lod_tree)
+    )
+
+def switch_distance(error, screen_error, fov, viewport_height):
+    """Distance beyond which error projects to at most screen_error pixels
+    
+    fov is the vertical field of view in radians, viewport_height the
+    vertical resolution in pixels.
+    """
+    return error * viewport_height / (2 * math.tan(fov / 2) * max(screen_error, 1e-6))
+
+def error_distances(errors, radius, screen_error, fov, viewport_height):
+    """Compute maxDistance for each LOD from its deviation from LOD0
+    
+    errors holds one deviation per LOD, LOD0 first. Each LOD is shown
+    until the next one's error becomes invisible; the last LOD until the
+    whole object, measured by its bounding radius, is below the threshold.
+    Distances never decrease from one LOD to the next.
+    """
+    distances = []
+    current = MIN_LOD_DISTANCE
+    for error in list(errors[1:]) + [radius]:
+        current = max(current, switch_distance(error, screen_error, fov, viewport_height))
+        distances.append(round(current, 2))
+    return distances
+
+def calibrate_lod_distances(lod_meshes, props, memo=None, scale=None):
+    """Set maxDistance of LOD mesh objects from their measured error
+    
+    lod_meshes are the LOD objects of one rigidbody, LOD0 first. Errors are
+    stored on the LOD meshes as hyperfy_lod_error; memo (a dict) reuses
+    errors and radii for meshes shared between objects. scale defaults to
+    the world scale of LOD0. Returns the distances written.
+    """
+    if not lod_meshes:
+        return []
+    if memo is None:
+        memo = {}
+    
+    base = lod_meshes[0].data
+    if scale is None:
+        scale = max(lod_meshes[0].matrix_world.to_scale())
+    
+    radius_key = ('radius', base.as_pointer())
+    if radius_key not in memo:
+        points, _ = mesh_triangles(base)
+        memo[radius_key] = fit_sphere(points)[1] if len(points) else 0.0
+    
+    errors = [0.0]
+    for lod in lod_meshes[1:]:
+        error_key = ('error', lod.data.as_pointer(), base.as_pointer())
+        if error_key not in memo:
+            memo[error_key] = 0.0 if lod.data == base else lod_deviation(lod.data, base)
+        lod.data["hyperfy_lod_error"] = memo[error_key]
+        errors.append(memo[error_key] * scale)
+    
+    distances = error_distances(
+        errors,
+        memo[radius_key] * scale,
+        props.lod_screen_error,
+        props.lod_fov,
+        props.lod_viewport_height
+    )
+    for lod, distance in zip(lod_meshes, distances):
+        lod["maxDistance"] = distance
+    return distances
 
 def setup_lod_empty(context, parent_empty, base_name):
     """Create and setup a LOD empty object"""
@@ -78,10 +305,14 @@ def setup_lod_empty(context, parent_empty, base_name):
     lod_empty.parent = parent_empty
     return lod_empty
 
-def setup_lod_mesh(context, mesh_obj, lod_empty, base_name, index, props):
-    """Setup a LOD mesh object with proper properties"""
+def setup_lod_mesh(context, mesh_obj, lod_empty, base_name, index, props, share_data=False):
+    """Setup a LOD mesh object with proper properties
+    
+    With share_data the LOD mesh links the source mesh instead of a copy.
+    """
     lod_mesh = mesh_obj.copy()
-    lod_mesh.data = mesh_obj.data.copy()
+    if not share_data:
+        lod_mesh.data = mesh_obj.data.copy()
     lod_mesh.name = f"{base_name}MeshLOD{index}"
     context.scene.collection.objects.link(lod_mesh)
     
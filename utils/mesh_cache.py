@@ -0,0 +1,111 @@
+import hashlib
+import bpy
+import numpy as np
+from .export_utils import mesh_content_hash
+
+# Custom properties stored on cached mesh datablocks, saved with the .blend
+CACHE_KEY = "hyperfy_cache_key"
+CACHE_HASH = "hyperfy_cache_hash"
+CACHE_PART = "hyperfy_cache_part"
+
+
+def _update_buffer(digest, collection, attribute, dtype, width=1):
+    buffer = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attribute, buffer)
+    digest.update(buffer.tobytes())
+
+
+def mesh_hash(mesh, full=False, vertex_groups=()):
+    """Hash the vertex and index buffers of a mesh
+
+    With full, the same content hash the exporters dedupe meshes with is
+    used instead (every attribute, custom normals, shape keys, materials
+    and the deform weights of vertex_groups), for meshes that are rendered
+    rather than only used for collision. Raises ValueError for attribute
+    types that cannot be read.
+    """
+    if full:
+        return mesh_content_hash(mesh, vertex_groups)
+    digest = hashlib.blake2b(digest_size=16)
+    _update_buffer(digest, mesh.vertices, 'co', np.float32, 3)
+    _update_buffer(digest, mesh.loops, 'vertex_index', np.int32)
+    _update_buffer(digest, mesh.polygons, 'loop_total', np.int32)
+    return digest.hexdigest()
+
+
+class MeshCache:
+    """Content addressed cache of generated mesh datablocks
+
+    Keys combine a hash of the source mesh with the generation parameters.
+    Generated meshes are tagged with their key, so the cache lives in the
+    .blend and survives sessions; hashes are memoized per datablock for the
+    lifetime of the cache, so one instance should cover one operation. A
+    cached mesh that was edited after it was stored no longer matches its
+    recorded hash and is dropped instead of reused.
+    """
+
+    def __init__(self):
+        self._hashes = {}
+        self._index = None
+        # Values derived from meshes during the same operation, keyed by callers
+        self.memo = {}
+
+    def hash(self, mesh, full=False, vertex_groups=()):
+        memo = (mesh.as_pointer(), full, tuple(vertex_groups))
+        if memo not in self._hashes:
+            self._hashes[memo] = mesh_hash(mesh, full, vertex_groups)
+        return self._hashes[memo]
+
+    def key(self, mesh, kind, params=(), full=False, vertex_groups=()):
+        """Cache key for generating kind from mesh with params"""
+        params_hash = hashlib.blake2b(repr(tuple(params)).encode(), digest_size=8).hexdigest()
+        return f"{kind}:{self.hash(mesh, full, vertex_groups)}:{params_hash}"
+
+    def _build_index(self):
+        self._index = {}
+        for mesh in bpy.data.meshes:
+            key = mesh.get(CACHE_KEY)
+            if key:
+                self._index.setdefault(key, []).append(mesh)
+
+    def _unchanged(self, mesh, vertex_groups):
+        try:
+            return self.hash(mesh, True, vertex_groups) == mesh.get(CACHE_HASH)
+        except ValueError:
+            # Gained an attribute that cannot be hashed
+            return False
+
+    def get(self, key, vertex_groups=()):
+        """Get the cached meshes for key in part order, or None
+
+        vertex_groups must be the names the key was computed with, so
+        edited weights are detected too.
+        """
+        if self._index is None:
+            self._build_index()
+        meshes = self._index.get(key)
+        if not meshes:
+            return None
+
+        if not all(self._unchanged(mesh, vertex_groups) for mesh in meshes):
+            for mesh in meshes:
+                del mesh[CACHE_KEY]
+            del self._index[key]
+            return None
+        return sorted(meshes, key=lambda mesh: mesh.get(CACHE_PART, 0))
+
+    def put(self, key, meshes, vertex_groups=()):
+        """Tag freshly generated meshes as the cached result for key"""
+        if self._index is None:
+            self._build_index()
+        for part, mesh in enumerate(meshes):
+            mesh[CACHE_KEY] = key
+            mesh[CACHE_PART] = part
+            mesh[CACHE_HASH] = self.hash(mesh, True, vertex_groups)
+        self._index[key] = list(meshes)
+
+
+__all__ = [
+    'mesh_hash',
+    'MeshCache'
+]
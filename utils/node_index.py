@@ -0,0 +1,229 @@
+import bpy
+import itertools
+from bpy.app.handlers import persistent
+
+NODE_TYPES = ('rigidbody', 'lod', 'Mesh', 'collider', 'snap')
+
+# Shared by all indices so generations stay unique across rebuilds and undo
+_generations = itertools.count(1)
+
+
+class NodeIndex:
+    """Index of the Hyperfy nodes of one scene
+
+    Maps node types to objects, parents to their node children and objects
+    to their owning rigidbody. Entries are object names, resolved through
+    bpy.data on every query, so no stale Python references survive undo.
+    Object updates refresh single entries; new or renamed objects (noticed
+    through their session_uid) and a changed object count mark the index
+    dirty and it is rebuilt on the next query. generation changes whenever
+    the node structure does, so caches derived from the index know when to
+    recompute.
+    """
+
+    def __init__(self):
+        self.dirty = True
+        self.generation = next(_generations)
+        self.types = {}
+        self.nodes = {}
+        self.parents = {}
+        self.children = {}
+        self.owners = {}
+        # Parents of all objects, node or not, to notice any reparenting
+        self.object_parents = {}
+        # session_uid -> name of all objects, to notice renames and additions
+        self.object_names = {}
+        self.object_count = 0
+
+    def rebuild(self, scene):
+        self.types = {node_type: set() for node_type in NODE_TYPES}
+        self.nodes = {}
+        self.parents = {}
+        self.children = {}
+        self.owners = {}
+        self.object_parents = {}
+        self.object_names = {}
+        for obj in scene.objects:
+            self.object_parents[obj.name] = obj.parent.name if obj.parent else None
+            self.object_names[obj.session_uid] = obj.name
+            self._add(obj)
+        self.object_count = len(self.object_names)
+        self.dirty = False
+        self.generation = next(_generations)
+
+    def _add(self, obj):
+        node_type = obj.get("node")
+        if node_type is None:
+            return
+        name = obj.name
+        parent = obj.parent.name if obj.parent else None
+        self.types.setdefault(node_type, set()).add(name)
+        self.nodes[name] = node_type
+        self.parents[name] = parent
+        self.children.setdefault(parent, {}).setdefault(node_type, set()).add(name)
+
+    def _remove(self, name):
+        node_type = self.nodes.pop(name, None)
+        if node_type is None:
+            return
+        parent = self.parents.pop(name, None)
+        self.types.get(node_type, set()).discard(name)
+        self.children.get(parent, {}).get(node_type, set()).discard(name)
+
+    def refresh(self, obj):
+        """Update the entry of one object after it changed"""
+        name = obj.name
+        if self.object_names.get(obj.session_uid) != name:
+            # Added, or renamed: children and owners are keyed by the old name
+            self.dirty = True
+            return
+        node_type = obj.get("node")
+        parent = obj.parent.name if obj.parent else None
+        reparented = self.object_parents.get(name) != parent
+        if reparented:
+            self.object_parents[name] = parent
+            # Reparenting any object, node or not, can change its owner
+            self.owners.clear()
+        if node_type is None:
+            parent = None
+        if (self.nodes.get(name), self.parents.get(name)) == (node_type, parent):
+            # Transforms and other edits leave the node structure untouched
+            return
+        self._remove(name)
+        self._add(obj)
+        if not reparented:
+            # Node changes can move whole subtrees to another owner
+            self.owners.clear()
+        self.generation = next(_generations)
+
+    def resolve(self, names, node_type):
+        """Turn names into objects, or None if any entry went stale"""
+        objects = []
+        for name in names:
+            obj = bpy.data.objects.get(name)
+            if obj is None or obj.get("node") != node_type:
+                return None
+            objects.append(obj)
+        return objects
+
+
+_indices = {}
+
+
+def get_node_index(scene):
+    """Get the up to date node index of a scene"""
+    index = _indices.get(scene.name)
+    if index is None:
+        index = _indices[scene.name] = NodeIndex()
+    if index.dirty:
+        index.rebuild(scene)
+    return index
+
+
+def invalidate_node_index(scene=None):
+    """Force a rebuild, for code that sets node properties without an update"""
+    if scene is None:
+        _indices.clear()
+    elif scene.name in _indices:
+        _indices[scene.name].dirty = True
+
+
+def _query(scene, lookup, node_type):
+    """Run a lookup, rebuilding once if the index turned out to be stale"""
+    index = get_node_index(scene)
+    objects = index.resolve(lookup(index), node_type)
+    if objects is None:
+        index.rebuild(scene)
+        objects = index.resolve(lookup(index), node_type) or []
+    return objects
+
+
+def nodes_of_type(scene, node_type):
+    """Get every object of a node type in the scene, sorted by name"""
+    return _query(scene, lambda index: sorted(index.types.get(node_type, ())), node_type)
+
+
+def child_nodes(obj, node_type, scene=None):
+    """Get the direct children of obj with a node type, sorted by name"""
+    scene = scene or bpy.context.scene
+    return _query(scene, lambda index: sorted(index.children.get(obj.name, {}).get(node_type, ())), node_type)
+
+
+def child_node(obj, node_type, scene=None):
+    """Get the first direct child of obj with a node type, or None"""
+    children = child_nodes(obj, node_type, scene)
+    return children[0] if children else None
+
+
+def rigidbody_of(obj, scene=None):
+    """Get the rigidbody an object belongs to (itself or an ancestor), or None"""
+    if obj is None:
+        return None
+    index = get_node_index(scene or bpy.context.scene)
+    name = index.owners.get(obj.name)
+    if name is not None:
+        owner = bpy.data.objects.get(name)
+        if owner is not None and owner.get("node") == "rigidbody":
+            return owner
+
+    current = obj
+    while current:
+        if current.get("node") == "rigidbody":
+            index.owners[obj.name] = current.name
+            return current
+        current = current.parent
+    return None
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    index = _indices.get(scene.name)
+    if index is None or index.dirty:
+        return
+    for update in depsgraph.updates:
+        data = update.id
+        if isinstance(data, bpy.types.Object):
+            index.refresh(data.original)
+        elif isinstance(data, (bpy.types.Scene, bpy.types.Collection)):
+            # Selection changes tag the scene too; only a changed object
+            # count means objects were removed or (un)linked. Added objects
+            # are caught by their unknown session_uid.
+            if len(scene.objects) != index.object_count:
+                index.dirty = True
+        if index.dirty:
+            return
+
+
+@persistent
+def _on_reset(*args):
+    # Undo and file loads replace every datablock
+    _indices.clear()
+
+
+def register_handlers():
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(_on_reset)
+
+
+def unregister_handlers():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _on_reset in handlers:
+            handlers.remove(_on_reset)
+    _indices.clear()
+
+
+__all__ = [
+    'NODE_TYPES',
+    'NodeIndex',
+    'get_node_index',
+    'invalidate_node_index',
+    'nodes_of_type',
+    'child_nodes',
+    'child_node',
+    'rigidbody_of',
+    'register_handlers',
+    'unregister_handlers'
+]
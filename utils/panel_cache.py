@@ -0,0 +1,112 @@
+import bpy
+from bpy.app.handlers import persistent
+from .lod_utils import lod_sort_key
+from .node_index import child_node, child_nodes, get_node_index
+
+# Bone name fragments that mark a VRM style rig
+VRM_BONE_KEYS = ("hips", "spine", "chest", "neck", "head")
+
+# rigidbody name -> (index generation, collider name, LOD empty name, LOD mesh names)
+_rigidbody_summaries = {}
+# (armature data name, bone count) -> 'MIXAMO', 'VRM' or None
+_rig_types = {}
+
+
+def classify_rig(armature):
+    """Detect the rig type of armature data from its first telling bone"""
+    for bone in armature.bones:
+        name = bone.name.lower()
+        if "mixamo" in name:
+            return 'MIXAMO'
+        if any(key in name for key in VRM_BONE_KEYS):
+            return 'VRM'
+    return None
+
+
+def rig_type(obj):
+    """Cached classify_rig for an armature object, for drawing"""
+    armature = obj.data
+    key = (armature.name, len(armature.bones))
+    if key not in _rig_types:
+        _rig_types[key] = classify_rig(armature)
+    return _rig_types[key]
+
+
+def _resolve(name):
+    return bpy.data.objects.get(name) if name else None
+
+
+def rigidbody_summary(rigidbody, scene=None):
+    """Get (collider, lod_empty, lod_meshes) of a rigidbody for drawing
+
+    The child lookups and LOD sort only run again after the node index
+    generation changed, so redraws without edits cost a few name lookups.
+    """
+    scene = scene or bpy.context.scene
+    generation = get_node_index(scene).generation
+    summary = _rigidbody_summaries.get(rigidbody.name)
+    if summary is not None and summary[0] == generation:
+        collider = _resolve(summary[1])
+        lod_empty = _resolve(summary[2])
+        lod_meshes = [bpy.data.objects.get(name) for name in summary[3]]
+        if all(obj is not None for obj in lod_meshes) and \
+                (collider is not None) == (summary[1] is not None) and \
+                (lod_empty is not None) == (summary[2] is not None):
+            return collider, lod_empty, lod_meshes
+
+    collider = child_node(rigidbody, "collider", scene)
+    lod_empty = child_node(rigidbody, "lod", scene)
+    lod_meshes = sorted(child_nodes(lod_empty, "Mesh", scene), key=lod_sort_key) if lod_empty else []
+    _rigidbody_summaries[rigidbody.name] = (
+        get_node_index(scene).generation,
+        collider.name if collider else None,
+        lod_empty.name if lod_empty else None,
+        [mesh.name for mesh in lod_meshes],
+    )
+    return collider, lod_empty, lod_meshes
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Armature):
+            # Bone renames keep the bone count, so drop every entry of this armature
+            name = update.id.original.name
+            for key in [key for key in _rig_types if key[0] == name]:
+                del _rig_types[key]
+
+
+@persistent
+def _on_reset(*args):
+    clear_panel_cache()
+
+
+def clear_panel_cache():
+    _rigidbody_summaries.clear()
+    _rig_types.clear()
+
+
+def register_handlers():
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(_on_reset)
+
+
+def unregister_handlers():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _on_reset in handlers:
+            handlers.remove(_on_reset)
+    clear_panel_cache()
+
+
+__all__ = [
+    'VRM_BONE_KEYS',
+    'classify_rig',
+    'rig_type',
+    'rigidbody_summary',
+    'clear_panel_cache',
+    'register_handlers',
+    'unregister_handlers'
+]
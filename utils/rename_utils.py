@@ -0,0 +1,258 @@
+import re
+import string
+from .lod_utils import classify_name
+from .node_index import invalidate_node_index
+
+# Trailing digits removed before numbering
+NUMBER_SUFFIX = re.compile(r'[0-9]+$')
+
+# Clean Names: special characters become underscores, runs of them collapse
+CLEAN_SPECIAL = re.compile(r'[^\w\s]')
+CLEAN_UNDERSCORES = re.compile(r'_+')
+
+# Prefix of the temporary names used while applying a plan
+TEMP_PREFIX = "__hyperfy_rename__"
+
+# Longest datablock name in bytes; longer names get truncated by Blender
+MAX_NAME_BYTES = 63
+
+CONFLICT_LABELS = {
+    'EMPTY': "Empty name",
+    'TOO_LONG': "Name too long",
+    'DUPLICATE': "Duplicate name",
+    'EXISTS': "Name already used",
+    'LINKED': "Linked from a library",
+}
+
+
+def _collection_token(obj, name, index):
+    collections = obj.users_collection
+    return collections[0].name if collections else ""
+
+
+def _lod_token(obj, name, index):
+    _, kind, lod = classify_name(obj.name)
+    if kind == 'lod':
+        return str(lod or 0)
+    # Untagged meshes are their own LOD0
+    return "0" if kind is None and obj.type == 'MESH' else ""
+
+
+def _tag_token(obj, name, index):
+    kind = classify_name(obj.name)[1]
+    if kind == 'col':
+        return "COL"
+    lod = _lod_token(obj, name, index)
+    return f"LOD{lod}" if lod else ""
+
+
+# Template tokens -> function(obj, current name, plan position)
+TEMPLATE_TOKENS = {
+    'name': lambda obj, name, index: name,
+    'base': lambda obj, name, index: classify_name(obj.name)[0].strip(),
+    'collection': _collection_token,
+    'node': lambda obj, name, index: str(obj.get("node", "")),
+    'lod': _lod_token,
+    'tag': _tag_token,
+    'index': lambda obj, name, index: index,
+}
+
+
+def clean_name(name):
+    """Replace special characters with single underscores and trim them"""
+    return CLEAN_UNDERSCORES.sub('_', CLEAN_SPECIAL.sub('_', name)).strip('_')
+
+
+def _regex_step(pattern, replacement):
+    try:
+        compiled = re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid pattern: {e}") from e
+
+    def step(name, index, obj):
+        try:
+            return compiled.sub(replacement, name)
+        except re.error as e:
+            raise ValueError(f"Invalid replacement: {e}") from e
+
+    return step
+
+
+def _template_step(template):
+    try:
+        fields = {field for _, field, _, _ in string.Formatter().parse(template) if field is not None}
+    except ValueError as e:
+        raise ValueError(f"Invalid template: {e}") from e
+    unknown = fields - set(TEMPLATE_TOKENS)
+    if unknown:
+        raise ValueError(f"Unknown template tokens: {', '.join(sorted(unknown))}")
+    # Catch bad format specs once instead of on every object
+    try:
+        template.format_map({field: 0 if field == 'index' else "" for field in fields})
+    except (ValueError, TypeError, IndexError) as e:
+        raise ValueError(f"Invalid template: {e}") from e
+
+    tokens = [(field, TEMPLATE_TOKENS[field]) for field in fields]
+
+    def step(name, index, obj):
+        return template.format_map({field: token(obj, name, index) for field, token in tokens})
+
+    return step
+
+
+class RenamePlan:
+    """The enabled renamer steps of a scene compiled into one function list
+
+    Steps run in panel order (find & replace, prefix, suffix, case,
+    numbering), each as a function of the name, the object's position in
+    the plan and the object, so the whole plan can be evaluated without
+    renaming anything. Find & replace works on literal text, a regular
+    expression with capture groups, or a template of TEMPLATE_TOKENS.
+    Patterns are compiled once here; invalid ones raise ValueError.
+    """
+
+    def __init__(self, scene):
+        self.steps = []
+
+        if scene.use_find_replace:
+            find, replace = scene.find_text, scene.replace_text
+            if scene.find_mode == 'TEMPLATE':
+                if scene.rename_template:
+                    self.steps.append(_template_step(scene.rename_template))
+            elif find and scene.find_mode == 'REGEX':
+                self.steps.append(_regex_step(find, replace))
+            elif find:
+                self.steps.append(lambda name, index, obj: name.replace(find, replace))
+
+        if scene.use_prefix and scene.prefix_text:
+            prefix = scene.prefix_text
+            if scene.prefix_operation == 'ADD':
+                self.steps.append(lambda name, index, obj: prefix + name)
+            else:
+                self.steps.append(lambda name, index, obj: name[len(prefix):] if name.startswith(prefix) else name)
+
+        if scene.use_suffix and scene.suffix_text:
+            suffix = scene.suffix_text
+            if scene.suffix_operation == 'ADD':
+                self.steps.append(lambda name, index, obj: name + suffix)
+            else:
+                self.steps.append(lambda name, index, obj: name[:-len(suffix)] if name.endswith(suffix) else name)
+
+        if scene.use_case_conversion:
+            convert = {'UPPER': str.upper, 'LOWER': str.lower, 'TITLE': str.title}[scene.case_conversion]
+            self.steps.append(lambda name, index, obj: convert(name))
+
+        if scene.use_numbering:
+            base, step = scene.numbering_base, scene.numbering_increment
+            padding, separator = scene.numbering_padding, scene.numbering_separator
+            before = scene.numbering_position == 'PREFIX'
+
+            def number(name, index, obj):
+                stem = NUMBER_SUFFIX.sub('', name).rstrip('._- ')
+                digits = f"{base + step * index:0{padding}d}"
+                return f"{digits}{separator}{stem}" if before else f"{stem}{separator}{digits}"
+
+            self.steps.append(number)
+
+    def rename(self, objects):
+        """Get the new name of every object, numbered in list order"""
+        results = []
+        for index, obj in enumerate(objects):
+            name = obj.name
+            for step in self.steps:
+                name = step(name, index, obj)
+            results.append(name)
+        return results
+
+
+def plan_renames(objects, plan):
+    """Compute [(object, old_name, new_name)] for objects in name order
+
+    Sorting by name makes numbering independent of selection order.
+    """
+    objects = sorted(objects, key=lambda obj: obj.name)
+    return [(obj, obj.name, new) for obj, new in zip(objects, plan.rename(objects))]
+
+
+def find_conflicts(renames, existing_names):
+    """Map the indices of entries that cannot be applied to a reason key
+
+    existing_names are all names in the datablock collection. Names freed
+    by other entries of the plan count as available.
+    """
+    changed = [i for i, (_, old, new) in enumerate(renames) if old != new]
+    freed = {renames[i][1] for i in changed}
+    taken = set(existing_names) - freed
+    counts = {}
+    for i in changed:
+        counts[renames[i][2]] = counts.get(renames[i][2], 0) + 1
+
+    conflicts = {}
+    for i in changed:
+        obj, _, new = renames[i]
+        if obj.library is not None:
+            conflicts[i] = 'LINKED'
+        elif not new:
+            conflicts[i] = 'EMPTY'
+        elif len(new.encode('utf-8')) > MAX_NAME_BYTES:
+            conflicts[i] = 'TOO_LONG'
+        elif counts[new] > 1:
+            conflicts[i] = 'DUPLICATE'
+        elif new in taken:
+            conflicts[i] = 'EXISTS'
+    return conflicts
+
+
+def drop_conflicts(renames, existing_names):
+    """Keep the old name of every conflicting entry, returning (renames, skipped)
+
+    Entries that stay put can block names other entries relied on being
+    freed, so conflicts are recomputed until none are left.
+    """
+    renames = list(renames)
+    skipped = 0
+    conflicts = find_conflicts(renames, existing_names)
+    while conflicts:
+        for i in conflicts:
+            obj, old, _ = renames[i]
+            renames[i] = (obj, old, old)
+        skipped += len(conflicts)
+        conflicts = find_conflicts(renames, existing_names)
+    return renames, skipped
+
+
+def apply_renames(renames):
+    """Rename objects to their planned names without automatic suffixes
+
+    The plan must be free of conflicts. Objects whose current name is the
+    target of another entry first move to a temporary name, then every
+    object takes its final name, so swaps and chains resolve the same way
+    regardless of order. Returns the number of renamed objects.
+    """
+    changed = [(obj, old, new) for obj, old, new in renames if old != new]
+    wanted = {new for _, _, new in changed}
+
+    # Phase 1: free the names other entries want
+    for i, (obj, _, _) in enumerate(entry for entry in changed if entry[1] in wanted):
+        obj.name = f"{TEMP_PREFIX}{i}"
+
+    # Phase 2: final names
+    for obj, _, new in changed:
+        obj.name = new
+    if changed:
+        # The node index is keyed by object names
+        invalidate_node_index()
+    return len(changed)
+
+
+__all__ = [
+    'MAX_NAME_BYTES',
+    'CONFLICT_LABELS',
+    'TEMPLATE_TOKENS',
+    'clean_name',
+    'RenamePlan',
+    'plan_renames',
+    'find_conflicts',
+    'drop_conflicts',
+    'apply_renames'
+]
@@ -1,123 +1,290 @@
 import bpy
 from .collider_utils import (
     create_box_collider,
+    create_convex_colliders,
+    create_fitted_collider,
     create_sphere_collider,
     create_simple_collider,
-    setup_collider
+    create_simple_colliders,
+    setup_collider,
+    simple_voxel_size
 )
-from .lod_utils import find_col_object
+from .lod_utils import (
+    calibrate_lod_distances,
+    classify_name,
+    group_main_object,
+    is_col_name,
+    lod_sort_key
+)
+from .mesh_cache import MeshCache
+from .node_index import rigidbody_of
 
 def get_rigidbody_parent(obj):
     """Get the rigidbody parent of an object in the hierarchy"""
-    current = obj
-    while current:
-        if current.get("node") == "rigidbody":
-            return current
-        current = current.parent
-    return None
+    return rigidbody_of(obj)
 
-def process_rigidbody_hierarchy(context, main_obj, lod_variants=None):
-    """Process an object and its variants into a rigidbody hierarchy"""
-    props = context.scene.hyperfy_props
+def plan_rigidbodies(groups):
+    """Plan rigidbody hierarchies for LOD groups
+
+    Pure Python, nothing is created. Each entry holds the rigidbody name,
+    the main object, the non-COL variants in LOD order and the COL object
+    (or None).
+    """
+    plan = []
+    for variants in groups:
+        main_obj = group_main_object(variants)
+        plan.append({
+            'name': classify_name(main_obj.name)[0],
+            'main': main_obj,
+            'lods': sorted([v for v in variants if not is_col_name(v.name)], key=lod_sort_key),
+            'col': next((v for v in variants if is_col_name(v.name)), None),
+        })
+    return plan
+
+def _copy_collider(obj, context):
+    collider = obj.copy()
+    collider.data = obj.data.copy()
+    setup_collider(collider, context)
+    return collider
+
+def _link_collider(obj, context):
+    collider = bpy.data.objects.new("Collider", obj.data)
+    setup_collider(collider, context)
+    return collider
+
+def collider_recipe(context, entry, props):
+    """Describe how the collider of a plan entry is generated
+
+    Returns (kind, source, params, build). The result depends only on the
+    mesh of source and on params; source is None for colliders that are
+    not worth caching. build creates the collider object or objects.
+    """
+    main_obj = entry['main']
+    col_obj = entry['col']
+    if col_obj and props.share_mesh_data:
+        return 'col', None, (), lambda: _link_collider(col_obj, context)
+    if col_obj:
+        return 'col', col_obj, (), lambda: _copy_collider(col_obj, context)
+    if props.collider_type == 'auto':
+        return 'fit', main_obj, ('auto',), lambda: create_fitted_collider(main_obj, context)
+    if props.collider_type in {'box', 'sphere'} and props.fit_collider:
+        shape = props.collider_type
+        return 'fit', main_obj, (shape,), lambda: create_fitted_collider(main_obj, context, shape)
+    if props.collider_type == 'box':
+        return 'box', None, (), lambda: create_box_collider(context)
+    if props.collider_type == 'sphere':
+        return 'sphere', None, (), lambda: create_sphere_collider(context)
+    if props.collider_type == 'simple':
+        # The voxel size follows the unscaled mesh extents
+        voxel_size = (round(simple_voxel_size(main_obj), 6),)
+        return 'simple', main_obj, voxel_size, lambda: create_simple_collider(main_obj, context)
+    if props.collider_type == 'convex':
+        params = (props.decomposition_max_hulls, props.decomposition_max_vertices,
+                  props.decomposition_resolution)
+        return 'convex', main_obj, params, lambda: create_convex_colliders(main_obj, context)
+    if props.share_mesh_data:
+        return 'geometry', None, (), lambda: _link_collider(main_obj, context)
+    return 'geometry', main_obj, (), lambda: _copy_collider(main_obj, context)
+
+def _colliders_from_meshes(context, meshes, kind):
+    """Create collider objects that link cached meshes"""
+    colliders = []
+    for mesh in meshes:
+        collider = bpy.data.objects.new("Collider", mesh)
+        setup_collider(collider, context)
+        if kind == 'convex':
+            collider["convex"] = True
+        colliders.append(collider)
+    return colliders
+
+def build_colliders(context, entry, props, cache):
+    """Create the colliders of a plan entry, reusing cached meshes"""
+    kind, source, params, build = collider_recipe(context, entry, props)
+    if source is None or source.type != 'MESH':
+        colliders = build()
+        return colliders if isinstance(colliders, list) else [colliders]
+
+    key = cache.key(source.data, kind, params)
+    meshes = cache.get(key)
+    if meshes is not None:
+        return _colliders_from_meshes(context, meshes, kind)
+
+    colliders = build()
+    colliders = colliders if isinstance(colliders, list) else [colliders]
+    cache.put(key, [collider.data for collider in colliders])
+    return colliders
+
+def build_rigidbody(context, entry, props, pending_links, cache=None):
+    """Create the hierarchy for one plan entry through bpy.data
+
+    New objects that are not yet in a collection are appended to
+    pending_links for the caller to link in one pass. LOD and collider
+    meshes are shared through cache for identical sources. Returns the
+    created nodes and the original objects that were consumed.
+    """
+    if cache is None:
+        cache = MeshCache()
     processed_objects = []
-    
-    # If main_obj is a COL object, find a non-COL object to use as main
-    if main_obj.name.lower().endswith('col'):
-        base_name = main_obj.name.lower().replace('col', '').strip()
-        for obj in context.selected_objects:
-            if not obj.name.lower().endswith('col') and obj.name.lower().startswith(base_name):
-                main_obj = obj
-                break
-    
+
     # Create empty parent
-    empty = bpy.data.objects.new(f"{main_obj.name.split('LOD')[0].replace('COL', '')}", None)
+    empty = bpy.data.objects.new(entry['name'], None)
     empty.empty_display_type = 'PLAIN_AXES'
     empty.empty_display_size = 1
-    context.scene.collection.objects.link(empty)
-    
+    pending_links.append(empty)
+
     # Add rigidbody properties
     empty["node"] = "rigidbody"
     empty["mass"] = props.mass
     empty["type"] = props.physics_type
-    
+
     # Create LOD empty
     lod_empty = bpy.data.objects.new("LOD", None)
     lod_empty.empty_display_type = 'PLAIN_AXES'
     lod_empty.empty_display_size = 0.75
     lod_empty["node"] = "lod"
-    context.scene.collection.objects.link(lod_empty)
     lod_empty.parent = empty
-    
-    # Process LOD variants
-    if lod_variants:
-        # Sort variants by LOD number or name if no LOD number
-        def get_lod_number(obj):
-            if 'LOD' in obj.name:
-                try:
-                    return int(obj.name.split('LOD')[-1])
-                except ValueError:
-                    return float('inf')
-            return float('inf')
-        
-        sorted_variants = sorted([v for v in lod_variants if not v.name.lower().endswith('col')], 
-                               key=get_lod_number)
-        
-        for i, variant in enumerate(sorted_variants):
-            # Create LOD mesh
-            lod_mesh = variant.copy()
-            lod_mesh.data = variant.data.copy()
-            lod_mesh.name = f"{empty.name}MeshLOD{i}"  # Will start at LOD0
-            context.scene.collection.objects.link(lod_mesh)
-            
-            # Reset transforms
-            lod_mesh.location = (0, 0, 0)
-            lod_mesh.rotation_euler = (0, 0, 0)
-            lod_mesh.scale = (1, 1, 1)
-            
-            # Add mesh properties
-            lod_mesh["castShadow"] = props.cast_shadow
-            lod_mesh["receiveShadow"] = props.receive_shadow
-            lod_mesh["node"] = "Mesh"
-            
-            # Set LOD distance
-            if i == 0:
-                lod_mesh["maxDistance"] = 25  # LOD0 is closest
+    pending_links.append(lod_empty)
+
+    # Process LOD variants, already sorted by LOD number
+    lod_meshes = []
+    for i, variant in enumerate(entry['lods']):
+        # Create LOD mesh, either sharing the source mesh or linking the
+        # cached copy of identical meshes
+        lod_mesh = variant.copy()
+        if not props.share_mesh_data:
+            groups = [group.name for group in variant.vertex_groups]
+            try:
+                key = cache.key(variant.data, 'lod', full=True, vertex_groups=groups)
+            except ValueError:
+                # Attributes that cannot be hashed, never share this one
+                key = None
+            cached = cache.get(key, groups) if key else None
+            if cached:
+                lod_mesh.data = cached[0]
             else:
-                lod_mesh["maxDistance"] = 25 + (i * 25)  # Increase with each LOD
-            
-            # Parent to LOD empty
-            lod_mesh.parent = lod_empty
-            processed_objects.append(variant)
-    
-    # Create collider
-    collider = None
-    col_obj = next((obj for obj in lod_variants if obj.name.lower().endswith('col')), None) if lod_variants else None
-    
-    if col_obj:
-        # Use existing COL object
-        collider = col_obj.copy()
-        collider.data = col_obj.data.copy()
-        context.scene.collection.objects.link(collider)
-        setup_collider(collider, context)
-        processed_objects.append(col_obj)
-    else:
-        # Create new collider based on type
-        if props.collider_type == 'box':
-            collider = create_box_collider(context)
-        elif props.collider_type == 'sphere':
-            collider = create_sphere_collider(context)
-        elif props.collider_type == 'simple':
-            collider = create_simple_collider(main_obj, context)
-        else:  # geometry
-            collider = main_obj.copy()
-            collider.data = main_obj.data.copy()
-            context.scene.collection.objects.link(collider)
-            setup_collider(collider, context)
-    
-    # Parent collider
-    if collider:
+                lod_mesh.data = variant.data.copy()
+                if key:
+                    cache.put(key, [lod_mesh.data], groups)
+        lod_mesh.name = f"{empty.name}MeshLOD{i}"  # Will start at LOD0
+
+        # Reset transforms
+        lod_mesh.location = (0, 0, 0)
+        lod_mesh.rotation_euler = (0, 0, 0)
+        lod_mesh.scale = (1, 1, 1)
+
+        # Add mesh properties
+        lod_mesh["castShadow"] = props.cast_shadow
+        lod_mesh["receiveShadow"] = props.receive_shadow
+        lod_mesh["node"] = "Mesh"
+
+        # Set LOD distance
+        if i == 0:
+            lod_mesh["maxDistance"] = 25  # LOD0 is closest
+        else:
+            lod_mesh["maxDistance"] = 25 + (i * 25)  # Increase with each LOD
+
+        # Parent to LOD empty
+        lod_mesh.parent = lod_empty
+        pending_links.append(lod_mesh)
+        lod_meshes.append(lod_mesh)
+        processed_objects.append(variant)
+
+    # Replace the 25m steps with distances from the measured LOD error
+    if props.lod_error_distances:
+        calibrate_lod_distances(lod_meshes, props, cache.memo, scale=1.0)
+
+    # Create colliders, convex decomposition creates several
+    colliders = build_colliders(context, entry, props, cache)
+    if entry['col']:
+        processed_objects.append(entry['col'])
+
+    # Parent colliders
+    for collider in colliders:
         collider.parent = empty
-    
-    return processed_objects
+        if not collider.users_collection:
+            pending_links.append(collider)
+
+    nodes = {
+        'rigidbody': empty,
+        'lod': lod_empty,
+        'meshes': lod_meshes,
+        'collider': colliders[0] if colliders else None,
+        'colliders': colliders,
+    }
+    return nodes, processed_objects
+
+def apply_rigidbody_plan(context, plan):
+    """Create every planned rigidbody and remove the consumed originals
+
+    Uses bpy.data only, no operators, so the cost is linear in the number
+    of planned objects and the caller's operator records a single undo
+    step. Returns the created nodes of each entry.
+    """
+    props = context.scene.hyperfy_props
+    pending_links = []
+    created = []
+    processed_objects = []
+
+    cache = MeshCache()
+
+    # Simple colliders missing from the cache are evaluated together in one
+    # depsgraph update, once per unique mesh
+    if props.collider_type == 'simple':
+        missing = {}
+        for entry in plan:
+            kind, source, params, _ = collider_recipe(context, entry, props)
+            if kind == 'simple' and source.type == 'MESH':
+                key = cache.key(source.data, kind, params)
+                if key not in missing and cache.get(key) is None:
+                    missing[key] = source
+        colliders = create_simple_colliders(list(missing.values()), context)
+        for key, collider in zip(missing, colliders):
+            cache.put(key, [collider.data])
+            bpy.data.objects.remove(collider)
+
+    for entry in plan:
+        nodes, processed = build_rigidbody(context, entry, props, pending_links, cache)
+        created.append(nodes)
+        processed_objects.extend(processed)
+
+    # Link everything in one pass
+    collection = context.scene.collection
+    for obj in pending_links:
+        collection.objects.link(obj)
+
+    # Remove the consumed originals
+    removed = set()
+    for obj in processed_objects:
+        if obj.as_pointer() not in removed:
+            removed.add(obj.as_pointer())
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+    return created
+
+def process_rigidbody_hierarchy(context, main_obj, lod_variants=None):
+    """Process an object and its variants into a rigidbody hierarchy
+
+    Returns the consumed original objects and the created nodes. The
+    originals are left in place for the caller to remove.
+    """
+    props = context.scene.hyperfy_props
+
+    if lod_variants:
+        entry = plan_rigidbodies([lod_variants])[0]
+    else:
+        entry = {'name': classify_name(main_obj.name)[0], 'main': main_obj, 'lods': [], 'col': None}
+
+    pending_links = []
+    nodes, processed_objects = build_rigidbody(context, entry, props, pending_links)
+    for obj in pending_links:
+        context.scene.collection.objects.link(obj)
+
+    return processed_objects, nodes
 
-__all__ = ['get_rigidbody_parent', 'process_rigidbody_hierarchy'] 
\ No newline at end of file
+__all__ = [
+    'get_rigidbody_parent',
+    'plan_rigidbodies',
+    'build_rigidbody',
+    'apply_rigidbody_plan',
+    'process_rigidbody_hierarchy'
+]